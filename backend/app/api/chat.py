@@ -1,14 +1,15 @@
 import os
 from datetime import datetime
-from fastapi import APIRouter, UploadFile, File, HTTPException, Form
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, UploadFile, File, HTTPException, Form, Depends
+from fastapi.responses import JSONResponse, StreamingResponse
 from typing import Optional, Union
 import shutil
 from app.utils.logger import get_logger
+from app.utils.sse import SSE_HEADERS, SSE_MEDIA_TYPE, format_sse
 from app.schemas.chat import ChatResponse, ErrorResponse
 from app.services.chat_processing_service import ChatProcessingService
+from app.services.container import ServiceContainer, get_services, get_chat_service
 from app.services.tools.vlm_tool import VLMTool
-from app.services.agents.dharti_main_agent import MainAgent
 
 logger = get_logger(__name__)
 
@@ -54,7 +55,8 @@ async def upload_recording(audio_file: UploadFile = File(...)):
 @router.post("/process-audio", response_model=Union[ChatResponse, ErrorResponse])
 async def process_audio(
     audio_file: UploadFile = File(...),
-    image_file: Optional[UploadFile] = File(None)
+    image_file: Optional[UploadFile] = File(None),
+    chat_service: ChatProcessingService = Depends(get_chat_service)
 ):
     logger.info(f"Processing audio request - Audio: {audio_file.filename}, Image: {image_file.filename if image_file else None}")
     
@@ -71,10 +73,10 @@ async def process_audio(
                 raise HTTPException(status_code=400, detail="Only JPG/PNG images are supported")
             image_filename = await ChatProcessingService.save_file(image_file, "image")
             logger.info(f"Processing audio+image workflow")
-            result = await ChatProcessingService.handle_audio_with_image(audio_filename, image_filename)
+            result = await chat_service.handle_audio_with_image(audio_filename, image_filename)
         else:
             logger.info(f"Processing audio-only workflow")
-            result = await ChatProcessingService.handle_audio_only(audio_filename)
+            result = await chat_service.handle_audio_only(audio_filename)
         
         logger.info(f"Audio processing completed successfully")
         
@@ -93,7 +95,8 @@ async def process_audio(
 @router.post("/process-text", response_model=Union[ChatResponse, ErrorResponse])
 async def process_text(
     text: str = Form(...),
-    image_file: Optional[UploadFile] = File(None)
+    image_file: Optional[UploadFile] = File(None),
+    chat_service: ChatProcessingService = Depends(get_chat_service)
 ):
     logger.info(f"Processing text request - Text: '{text[:50]}...', Image: {image_file.filename if image_file else None}")
     
@@ -104,10 +107,10 @@ async def process_text(
                 raise HTTPException(status_code=400, detail="Only JPG/PNG images are supported")
             image_filename = await ChatProcessingService.save_file(image_file, "image")
             logger.info(f"Processing text+image workflow")
-            result = await ChatProcessingService.handle_text_with_image(text, image_filename)
+            result = await chat_service.handle_text_with_image(text, image_filename)
         else:
             logger.info(f"Processing text-only workflow")
-            result = await ChatProcessingService.handle_text_only(text)
+            result = await chat_service.handle_text_only(text)
         
         logger.info(f"Text processing completed successfully")
         
@@ -123,13 +126,81 @@ async def process_text(
         raise HTTPException(status_code=500, detail=f"Error processing text: {str(e)}")
 
 
+@router.post("/process-audio/stream")
+async def process_audio_stream(
+    audio_file: UploadFile = File(...),
+    image_file: Optional[UploadFile] = File(None),
+    chat_service: ChatProcessingService = Depends(get_chat_service)
+):
+    """
+    Server-sent events version of /process-audio.
+
+    Emits "transcript" once speech is transcribed, "translation" with the
+    English query, "intent" with the routing decision, "tool" as each tool
+    answers, "token" chunks of the Hindi answer as it is translated, then
+    "done" with the same response payload /process-audio returns (or "error").
+    """
+    logger.info(f"Streaming audio request - Audio: {audio_file.filename}, Image: {image_file.filename if image_file else None}")
+    
+    if not audio_file.filename.lower().endswith('.wav'):
+        logger.warning(f"Invalid audio file type: {audio_file.filename}")
+        raise HTTPException(status_code=400, detail="Only WAV files are supported")
+    if image_file and not image_file.filename.lower().endswith(('.jpg', '.jpeg', '.png')):
+        logger.warning(f"Invalid image file type: {image_file.filename}")
+        raise HTTPException(status_code=400, detail="Only JPG/PNG images are supported")
+    
+    audio_filename = await ChatProcessingService.save_file(audio_file, "audio")
+    image_filename = await ChatProcessingService.save_file(image_file, "image") if image_file else None
+    
+    async def event_stream():
+        try:
+            async for event, data in chat_service.stream_audio(audio_filename, image_filename):
+                yield format_sse(event, data)
+        except Exception as e:
+            logger.error(f"Error streaming audio request: {str(e)}")
+            yield format_sse("error", {"error": f"Error processing audio: {str(e)}"})
+    
+    return StreamingResponse(event_stream(), media_type=SSE_MEDIA_TYPE, headers=SSE_HEADERS)
+
+
+@router.post("/process-text/stream")
+async def process_text_stream(
+    text: str = Form(...),
+    image_file: Optional[UploadFile] = File(None),
+    chat_service: ChatProcessingService = Depends(get_chat_service)
+):
+    """
+    Server-sent events version of /process-text.
+
+    Emits progress events, "intent" with the routing decision and "tool" as
+    each tool answers, then "done" with the same response payload
+    /process-text returns (or "error"). The answer text arrives in "done".
+    """
+    logger.info(f"Streaming text request - Text: '{text[:50]}...', Image: {image_file.filename if image_file else None}")
+    
+    if image_file and not image_file.filename.lower().endswith(('.jpg', '.jpeg', '.png')):
+        logger.warning(f"Invalid image file type: {image_file.filename}")
+        raise HTTPException(status_code=400, detail="Only JPG/PNG images are supported")
+    
+    image_filename = await ChatProcessingService.save_file(image_file, "image") if image_file else None
+    
+    async def event_stream():
+        try:
+            async for event, data in chat_service.stream_text(text, image_filename):
+                yield format_sse(event, data)
+        except Exception as e:
+            logger.error(f"Error streaming text request: {str(e)}")
+            yield format_sse("error", {"error": f"Error processing text: {str(e)}"})
+    
+    return StreamingResponse(event_stream(), media_type=SSE_MEDIA_TYPE, headers=SSE_HEADERS)
+
+
 @router.get("/test/vlm/health")
-async def test_vlm_health():
+async def test_vlm_health(services: ServiceContainer = Depends(get_services)):
     logger.info("Testing VLM health endpoint")
     
     try:
-        vlm_tool = VLMTool()
-        health_result = await vlm_tool.check_health()
+        health_result = await services.vlm_tool.check_health()
         
         logger.info(f"VLM health check result: {health_result}")
         return JSONResponse(content=health_result)
@@ -148,7 +219,8 @@ async def test_vlm_health():
 @router.post("/test/vlm/analyze")
 async def test_vlm_analyze(
     image_file: UploadFile = File(...),
-    question: str = Form(default="What do you see in this agricultural image?")
+    question: str = Form(default="What do you see in this agricultural image?"),
+    services: ServiceContainer = Depends(get_services)
 ):
     logger.info(f"Testing VLM analysis - Image: {image_file.filename}, Question: {question}")
     
@@ -161,8 +233,7 @@ async def test_vlm_analyze(
         image_path = os.path.join("output", image_filename)
         
         # Analyze with VLM tool
-        vlm_tool = VLMTool()
-        analysis_result = await vlm_tool.analyze_image(image_path, question)
+        analysis_result = await services.vlm_tool.analyze_image(image_path, question)
         
         logger.info(f"VLM analysis result: {analysis_result}")
         
@@ -182,12 +253,11 @@ async def test_vlm_analyze(
 
 
 @router.get("/test/vlm/connection")
-async def test_vlm_connection():
+async def test_vlm_connection(services: ServiceContainer = Depends(get_services)):
     logger.info("Testing VLM connection")
     
     try:
-        vlm_tool = VLMTool()
-        connection_result = await vlm_tool.test_connection()
+        connection_result = await services.vlm_tool.test_connection()
         
         logger.info(f"VLM connection test result: {connection_result}")
         return JSONResponse(content=connection_result)
@@ -218,6 +288,7 @@ async def test_vlm_fallback(
         image_filename = await ChatProcessingService.save_file(image, "test_fallback")
         image_path = os.path.join("output", image_filename)
         
+        # Private instance: the shared tool must not see the broken URL
         vlm_tool = VLMTool()
         
         original_url = vlm_tool.base_url
@@ -250,7 +321,8 @@ async def test_vlm_fallback(
 @router.post("/test/agent")
 async def test_main_agent(
     text: str = Form(...),
-    image: Optional[UploadFile] = File(None)
+    image: Optional[UploadFile] = File(None),
+    services: ServiceContainer = Depends(get_services)
 ):
     logger.info(f"Testing Main Agent - Text: '{text[:50]}...', Image: {image.filename if image else 'None'}")
     
@@ -278,8 +350,7 @@ async def test_main_agent(
         }
         
         # Test Main Agent
-        main_agent = MainAgent()
-        agent_response = await main_agent.process_query(translation_result, image_path)
+        agent_response = await services.main_agent.process_query(translation_result, image_path)
         
         # Format response for testing
         result = {
@@ -306,15 +377,14 @@ async def test_main_agent(
 
 @router.post("/test/cultural-practices")
 async def test_cultural_practices_tool(
-    query: str = Form(..., description="Cultural practices query to test")
+    query: str = Form(..., description="Cultural practices query to test"),
+    services: ServiceContainer = Depends(get_services)
 ):
     logger.info(f"Testing KCC Cultural Practices tool - Query: '{query[:50]}...'")
     
     try:
-        from app.services.tools.kcc_cultural_tool import KCCCulturalTool
-        
         # Test KCC Cultural tool directly
-        cultural_tool = KCCCulturalTool()
+        cultural_tool = services.kcc_cultural_tool
         cultural_result = await cultural_tool.get_practices(query)
         
         logger.info(f"Cultural practices test result: {cultural_result.get('success', False)}")
@@ -336,4 +406,13 @@ async def test_cultural_practices_tool(
                 "success": False,
                 "error": f"Cultural Practices test failed: {str(e)}"
             }
-        )
\ No newline at end of file
+        )
+
+@router.get("/metrics")
+async def chat_metrics(services: ServiceContainer = Depends(get_services)):
+    """Routing and response-cache counters for the chat pipeline."""
+    response_cache = services.response_cache
+    return {
+        "intent_classifier": services.main_agent.intent_classifier.stats(),
+        "response_cache": response_cache.stats() if response_cache is not None else {"enabled": False}
+    }
@@ -2,7 +2,7 @@ from fastapi import APIRouter, HTTPException
 from typing import Dict, Any, Optional
 import time
 
-from app.services.tools.lstm_price_tool import LSTMPriceTool
+from app.services.tools.lstm_price_tool import LSTMPriceTool, MAX_FORECAST_HORIZON
 from app.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -14,11 +14,14 @@ lstm_tool = LSTMPriceTool()
 
 @router.get("/health")
 async def health_check():
+    readiness = lstm_tool.get_readiness()
     return {
         "status": "healthy",
         "service": "Mandi Price Prediction API",
         "timestamp": time.time(),
-        "lstm_available": lstm_tool.pytorch_available,
+        "lstm_available": lstm_tool.lstm_available,
+        "models_ready": readiness["ready"],
+        "warmup": readiness,
         "supported_crops": lstm_tool.supported_crops
     }
 
@@ -51,6 +54,42 @@ async def predict_weekly_prices(request: Dict[str, Any]):
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
 
+@router.post("/predict/batch")
+async def predict_batch_prices(request: Dict[str, Any]):
+    logger.info("======== Batch Price Prediction API ========")
+    
+    try:
+        crops = request.get("crops") or lstm_tool.supported_crops
+        if not isinstance(crops, list):
+            raise HTTPException(status_code=400, detail="Crops must be a list")
+        crops = list(dict.fromkeys(str(crop).strip().lower() for crop in crops if str(crop).strip()))
+        if not crops:
+            raise HTTPException(status_code=400, detail="At least one crop is required")
+        
+        horizons = request.get("horizons", [7])
+        if not isinstance(horizons, list) or not horizons:
+            raise HTTPException(status_code=400, detail="Horizons must be a non-empty list")
+        try:
+            horizons = sorted(set(int(h) for h in horizons))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Horizons must be integers")
+        if horizons[0] < 1 or horizons[-1] > MAX_FORECAST_HORIZON:
+            raise HTTPException(status_code=400, detail=f"Horizons must be between 1 and {MAX_FORECAST_HORIZON} days")
+        
+        logger.info(f"Crops: {crops}")
+        logger.info(f"Horizons: {horizons}")
+        
+        result = await lstm_tool.predict_batch(crops=crops, horizons=horizons)
+        
+        return result
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Batch price prediction failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Batch prediction failed: {str(e)}")
+
+
 @router.post("/analyze")
 async def analyze_market_trends(request: Dict[str, Any]):
     logger.info("======== Market Analysis API ========")
@@ -84,6 +123,14 @@ async def get_example_requests():
             },
             "description": "Get 7-day price predictions for a specific crop"
         },
+        "predict_batch_example": {
+            "url": "POST /api/mandi-price/predict/batch",
+            "request_body": {
+                "crops": ["rice", "ajwan", "sugarcane"],
+                "horizons": [1, 3, 7]
+            },
+            "description": "Get forecasts for several crops and horizons in one call (crops defaults to all supported crops)"
+        },
         "analyze_example": {
             "url": "POST /api/mandi-price/analyze",
             "request_body": {
@@ -1,9 +1,14 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from typing import Dict, Any, Optional, List
+import json
 import time
 
-from app.services.tools.govt_scheme_rag_tool import GovtSchemeRAGTool
+from app.core.config import settings
+from app.services.tools.govt_scheme_rag_tool import GovtSchemeRAGTool, get_cache_stats
+from app.services.tools.scheme_detail_store import get_detail_store, etag_matches
 from app.utils.logger import get_logger
+from app.utils.sse import SSE_HEADERS, SSE_MEDIA_TYPE, format_sse
 
 logger = get_logger(__name__)
 
@@ -18,7 +23,10 @@ async def health_check():
         "status": "healthy",
         "service": "Government Schemes RAG API",
         "timestamp": time.time(),
-        "rag_available": rag_tool.pinecone_available
+        "rag_available": rag_tool.pinecone_available,
+        "vector_backend": settings.scheme_vector_backend,
+        "detail_store_available": get_detail_store() is not None,
+        "cache": get_cache_stats()
     }
 
 
@@ -31,7 +39,7 @@ async def search_schemes(request: Dict[str, Any]):
         if not query:
             raise HTTPException(status_code=400, detail="Query parameter is required")
         
-        top_k = request.get("top_k", 30)
+        top_k = request.get("top_k")
         top_n_schemes = request.get("top_n_schemes", 3)
         
         logger.info(f"Query: {query}")
@@ -52,6 +60,31 @@ async def search_schemes(request: Dict[str, Any]):
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
 
 
+@router.post("/search/stream")
+async def search_schemes_stream(request: Dict[str, Any]):
+    """
+    Server-sent events version of /search.
+
+    Emits a "schemes" event with the scheme cards as soon as retrieval
+    finishes, "token" events as the answer is generated, then "done" with the
+    full rag_response (or "error").
+    """
+    logger.info("======== Schemes Search Stream API ========")
+    
+    query = request.get("query", "").strip()
+    if not query:
+        raise HTTPException(status_code=400, detail="Query parameter is required")
+    
+    top_k = request.get("top_k")
+    top_n_schemes = request.get("top_n_schemes", 3)
+    
+    async def event_stream():
+        async for event, data in rag_tool.search_schemes_stream(query, top_k=top_k, top_n_schemes=top_n_schemes):
+            yield format_sse(event, data)
+    
+    return StreamingResponse(event_stream(), media_type=SSE_MEDIA_TYPE, headers=SSE_HEADERS)
+
+
 @router.post("/recommend")
 async def recommend_schemes(request: Dict[str, Any]):
     logger.info("======== Schemes Recommendation API ========")
@@ -83,13 +116,33 @@ async def recommend_schemes(request: Dict[str, Any]):
 
 
 @router.get("/scheme/{scheme_id}")
-async def get_scheme_details(scheme_id: str):
+async def get_scheme_details(scheme_id: str, request: Request):
+    """
+    Scheme details from the local detail store (primary-key lookup).
+
+    Responses carry a strong ETag; clients sending it back in If-None-Match
+    get 304 Not Modified until the store is rebuilt with changed content.
+    """
     logger.info(f"======== Get Scheme Details: {scheme_id} ========")
     
     try:
-        result = await rag_tool.get_scheme_details(scheme_id)
-        return result
+        store = get_detail_store()
+        if store is None:
+            raise HTTPException(status_code=503, detail="Scheme detail store not available")
+        
+        found = store.get_payload(scheme_id)
+        if found is None:
+            raise HTTPException(status_code=404, detail=f"Scheme not found: {scheme_id}")
+        
+        payload, etag = found
+        headers = {"ETag": etag, "Cache-Control": "public, max-age=3600"}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        
+        return Response(content=payload, media_type="application/json", headers=headers)
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Failed to get scheme details: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to get details: {str(e)}")
@@ -126,6 +179,15 @@ async def test_rag():
 
 @router.post("/bulk-search")
 async def bulk_search_schemes(request: Dict[str, Any]):
+    """
+    Search many queries in one request.
+
+    Queries are embedded in a single batched call and retrieved concurrently.
+    The response is a single JSON body with results in query order; send
+    "stream": true to receive NDJSON instead (one JSON object per line, in
+    completion order, tagged with "query_index", ending with an {"error": ...}
+    line if the batch fails part-way). "generate": false skips the Gemini answer.
+    """
     logger.info("======== Bulk Schemes Search API ========")
     
     try:
@@ -133,30 +195,39 @@ async def bulk_search_schemes(request: Dict[str, Any]):
         if not queries or not isinstance(queries, list):
             raise HTTPException(status_code=400, detail="Queries list is required")
         
+        top_k = request.get("top_k")
         top_n_schemes = request.get("top_n_schemes", 3)
+        generate = bool(request.get("generate", True))
+        stream = bool(request.get("stream", False))
         
-        results = []
-        for i, query in enumerate(queries):
-            if not query or not str(query).strip():
-                results.append({
-                    "query_index": i,
-                    "query": query,
-                    "success": False,
-                    "error": "Empty query"
-                })
-                continue
+        logger.info(f"Queries: {len(queries)}, generate={generate}, stream={stream}")
+        
+        results = rag_tool.bulk_search(
+            queries,
+            top_k=top_k,
+            top_n_schemes=top_n_schemes,
+            generate=generate
+        )
+        
+        if stream:
+            async def ndjson_lines():
+                # Headers are already sent, so a failure can only be reported in-band
+                try:
+                    async for result in results:
+                        yield json.dumps(result, ensure_ascii=False) + "\n"
+                except Exception as e:
+                    logger.error(f"Bulk search stream failed: {str(e)}")
+                    yield json.dumps({"success": False, "error": f"Bulk search failed: {str(e)}"}) + "\n"
             
-            result = await rag_tool.search_schemes(
-                query=str(query).strip(),
-                top_n_schemes=top_n_schemes
-            )
-            result["query_index"] = i
-            results.append(result)
+            return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+        
+        collected = [result async for result in results]
+        collected.sort(key=lambda result: result["query_index"])
         
         return {
             "success": True,
             "total_queries": len(queries),
-            "results": results
+            "results": collected
         }
     
     except HTTPException:
@@ -189,7 +260,9 @@ async def get_example_queries():
         },
         "api_usage": {
             "search": "POST /api/schemes/search",
+            "search_stream": "POST /api/schemes/search/stream (SSE)",
             "recommend": "POST /api/schemes/recommend",
+            "bulk_search": "POST /api/schemes/bulk-search (\"stream\": true for NDJSON)",
             "details": "GET /api/schemes/scheme/{scheme_id}",
             "test": "GET /api/schemes/test"
         }
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Form, Request, BackgroundTasks
+from fastapi import APIRouter, Depends, Form, Request, BackgroundTasks
 from fastapi.responses import Response
 from twilio.twiml.voice_response import VoiceResponse
 from typing import Optional
@@ -6,6 +6,7 @@ from datetime import datetime
 import os
 import requests
 from app.services.twilio_service import TwilioService
+from app.services.container import get_twilio_service
 from app.core.config import settings
 from app.utils.logger import get_logger
 
@@ -16,13 +17,11 @@ router = APIRouter(
     tags=["twilio"]
 )
 
-twilio_service = TwilioService()
-
 # Ensure output directory exists (matching your existing structure)
 os.makedirs('output', exist_ok=True)
 
 
-async def process_audio_in_background(filepath: str, caller_number: str):
+async def process_audio_in_background(twilio_service: TwilioService, filepath: str, caller_number: str):
     """Process audio in background to avoid webhook timeouts"""
     try:
         logger.info(f"🔄 Starting background processing for {caller_number}")
@@ -75,7 +74,8 @@ async def recording_complete(
     RecordingUrl: Optional[str] = Form(None),
     RecordingSid: Optional[str] = Form(None),
     RecordingDuration: Optional[str] = Form(None),
-    From: Optional[str] = Form(None)
+    From: Optional[str] = Form(None),
+    twilio_service: TwilioService = Depends(get_twilio_service)
 ):
     """Handle the recording completion webhook and save recording to output folder."""
     
@@ -123,7 +123,7 @@ async def recording_complete(
             
             if caller_number != 'unknown':
                 logger.info(f"📋 Scheduling background processing for {caller_number}")
-                background_tasks.add_task(process_audio_in_background, filepath, caller_number)
+                background_tasks.add_task(process_audio_in_background, twilio_service, filepath, caller_number)
             else:
                 logger.warning("❌ Cannot process audio - caller number unknown")
             
@@ -8,6 +8,12 @@ class Settings(BaseSettings):
     port: int = 8000
     openai_api_key: str = ""
     
+    # OpenAI client configuration (shared async client)
+    openai_timeout_seconds: float = 30.0
+    openai_max_retries: int = 2
+    openai_max_connections: int = 100
+    openai_max_concurrency: int = 200
+    
     # GPU Server Configuration
     gpu_server_base_url: str = "http://your-server:8000"
     gpu_health_endpoint: str = "/api/health/detailed"
@@ -15,6 +21,50 @@ class Settings(BaseSettings):
     kcc_api_endpoint: str = "/api/kcc/varieties/query"
     kcc_cultural_endpoint: str = "/api/kcc/cultural/query"
     gpu_timeout_seconds: int = 90
+    gpu_max_connections: int = 50
+    gpu_max_keepalive_connections: int = 20
+    gpu_keepalive_expiry_seconds: float = 30.0
+    gpu_http2: bool = True
+    gpu_max_retries: int = 2
+    gpu_retry_backoff_seconds: float = 0.5
+    
+    # VLM hedging: launch the GPT-4o vision fallback if vLLM exceeds its latency budget
+    vlm_hedge_enabled: bool = True
+    vlm_hedge_delay_seconds: float = 20.0
+    vlm_hedge_percentile: float = 0.95
+    vlm_hedge_min_samples: int = 20
+
+    # LSTM price inference: numpy (torch-free) | auto (TorchScript export if present, else numpy)
+    # | torchscript | eager. torch engines need the optional torch dependency.
+    lstm_inference_backend: str = "numpy"
+    lstm_torch_threads: int = 1  # 0 leaves torch's default thread pool
+
+    # DHARTI intent routing: confident keyword matches skip the GPT-4o-mini classifier
+    intent_fast_path_enabled: bool = True
+    intent_fast_path_min_score: float = 2.0  # phrase words matched for the winning intent
+    intent_fast_path_min_confidence: float = 0.75  # top / (top + runner-up)
+    intent_keywords_path: str = ""  # default: app/services/agents/data/intent_keywords.json
+    crop_aliases_path: str = ""  # default: app/services/agents/data/crop_aliases.json
+    # Multi-intent tool execution: selected tools run concurrently, each under its own timeout
+    agent_max_parallel_intents: int = 3
+    agent_secondary_intent_min_confidence: float = 0.5  # local classifier: 0.5 = secondary scored intent_fast_path_min_score
+    agent_tool_timeout_seconds: float = 60.0
+    agent_vlm_timeout_seconds: float = 95.0  # above gpu_timeout_seconds so vLLM/hedge can finish
+    agent_tools_deadline_seconds: float = 100.0  # results still pending by then are dropped
+
+    # Text-chat response cache (key: normalized text; TTL by routed intent, 0 = never cache)
+    chat_response_cache_enabled: bool = True
+    chat_response_cache_size: int = 4096
+    chat_response_cache_db_path: str = ""  # SQLite file shared by all workers; empty = in-process only
+    chat_response_cache_ttls: Dict[str, float] = {
+        "MARKET_INFO": 900.0,
+        "CROP_VARIETIES": 86400.0,
+        "CULTURAL_PRACTICES": 86400.0,
+        "GOVT_SCHEME": 21600.0,
+        "FARMING_ADVICE": 21600.0,
+        "VISUAL_ANALYSIS": 3600.0,
+        "SUPPORT": 0.0
+    }
 
     # Twilio configs
     TWILIO_ACCOUNT_SID: str = ""
@@ -35,6 +85,34 @@ class Settings(BaseSettings):
     # Government Schemes RAG Configuration
     pinecone_api_key: str = ""
     GOOGLE_API_KEY: str = ""
+    # Vector store for the schemes corpus: pinecone | local (memory-mapped snapshot)
+    scheme_vector_backend: str = "pinecone"
+    scheme_local_index_dir: str = ""  # default: models/scheme_index
+    scheme_detail_db_path: str = ""  # default: models/scheme_details.sqlite3
+    # Retrieval: dense | hybrid (dense + BM25 over the local chunk corpus, reciprocal-rank fused)
+    scheme_retrieval_mode: str = "hybrid"
+    scheme_rrf_k: int = 60
+    # Chunk candidates per retriever when a request sets no top_k; RRF over BM25 + dense
+    # recovers recall at a smaller depth, so hybrid retrieval uses the lower default
+    scheme_top_k: int = 30
+    scheme_hybrid_top_k: int = 15
+    # Push farmer context (state, farmer type, landholding band, crop category) into metadata filters;
+    # only applies to fields the index carries, which the default scheme index does not
+    scheme_context_filters_enabled: bool = True
+    # Filterable fields present in the remote index (comma-separated); empty = read the local index manifest
+    scheme_context_filter_fields: str = ""
+    # Two-tier response cache: exact LRU on normalized query text + query-embedding similarity
+    scheme_cache_enabled: bool = True
+    scheme_cache_ttl_seconds: float = 21600.0
+    scheme_exact_cache_size: int = 2048
+    scheme_semantic_cache_size: int = 1024
+    scheme_semantic_cache_threshold: float = 0.92
+    # Coalesce concurrent query embeddings into batched calls (window in ms)
+    scheme_embed_batching_enabled: bool = True
+    scheme_embed_batch_window_ms: float = 5.0
+    scheme_embed_max_batch: int = 32
+    scheme_rag_max_workers: int = 16  # threads for blocking embedding / vector-store calls
+    scheme_bulk_max_concurrency: int = 8  # concurrent retrieval/generation per bulk-search request
     
     # YouTube search configuration
     YOUTUBE_MAX_RESULTS: int = 10  # Maximum videos to return (enforced)
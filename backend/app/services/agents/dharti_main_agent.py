@@ -1,8 +1,11 @@
+import asyncio
 import time
-from typing import Dict, List, Optional, Any
-from openai import OpenAI
+from typing import AsyncIterator, Awaitable, Dict, List, Optional, Tuple, Any
 from app.core.config import settings
 from app.utils.logger import get_logger
+from app.services.agents.intent_classifier import LocalIntentClassifier
+from app.services.agents.keyword_matcher import load_query_analyzer
+from app.services.openai_client import chat_completion
 from app.services.tools.vlm_tool import VLMTool
 from app.services.tools.kcc_tool import KCCTool
 from app.services.tools.kcc_cultural_tool import KCCCulturalTool
@@ -12,6 +15,9 @@ from app.schemas.chat import ResponseContent
 
 logger = get_logger(__name__)
 
+# Tool result sources that mean a step fell back instead of answering
+DEGRADED_SOURCE_MARKERS = ("fallback", "error", "timeout")
+
 
 class MainAgent:
     """
@@ -23,60 +29,40 @@ class MainAgent:
     DHARTI (धरती = Earth/Land) nurtures farmer queries like earth nurtures crops.
     """
     
-    def __init__(self):
-        self.openai_client = OpenAI(api_key=settings.openai_api_key)
-        self.vlm_tool = VLMTool()
-        self.kcc_tool = KCCTool()
-        self.kcc_cultural_tool = KCCCulturalTool()
-        self.lstm_tool = LSTMPriceTool()
-        self.govt_scheme_tool = GovtSchemeRAGTool()
-        
-        # Intent keywords for classification (fallback mechanism)
-        self.intent_keywords = {
-            "VISUAL_ANALYSIS": [
-                "disease", "pest", "spots", "leaves", "color", "damage", "infection", 
-                "brown", "yellow", "black", "white", "holes", "wilting", "rotten",
-                "what is this", "identify", "diagnose", "problem with", "issue with"
-            ],
-            "CROP_VARIETIES": [
-                "variety", "varieties", "seed", "seeds", "cultivar", "hybrid", "strain",
-                "soybean", "soyabean", "js-335", "js-95", "nrc-37", "maus-71", "js-2210", "js-2211",
-                "which variety", "best variety", "variety for", "varieties for", "recommend variety",
-                "high yield", "drought resistant", "disease resistant", "pest resistant",
-                "early maturing", "late maturing", "kharif", "rabi", "crop variety",
-                "seed selection", "which seed", "best seed", "varieties available"
-            ],
-            "FARMING_ADVICE": [
-                "how to", "when to", "best practice", "should I", "technique",
-                "planting", "sowing", "harvesting", "cultivation", "growing"
-            ],
-            "CULTURAL_PRACTICES": [
-                "seed rate", "seeds per acre", "kg per hectare", "seeding rate",
-                "spacing", "distance between", "row spacing", "plant spacing",
-                "sowing depth", "planting depth", "how deep", "depth of sowing",
-                "fertilizer dose", "NPK", "manure", "urea dose", "fertilizer application",
-                "irrigation schedule", "watering schedule", "water requirement", "irrigation frequency",
-                "sowing method", "planting method", "broadcasting", "transplanting",
-                "plant population", "plants per acre", "plant density", "stand establishment",
-                "tillage", "land preparation", "field preparation", "bed preparation"
-            ],
-            "MARKET_INFO": [
-                "price", "mandi", "sell", "market", "rate", "cost", "value",
-                "when to sell", "market price", "selling time", "profit",
-                "today price", "tomorrow price", "weekly price", "price prediction",
-                "rice price", "sugarcane price", "ajwan price", "crop price",
-                "price forecast", "price trend", "best day to sell", "current price"
-            ],
-            "GOVT_SCHEME": [
-                "subsidy", "loan", "scheme", "government", "help", "assistance",
-                "support", "pm kisan", "insurance", "benefit", "yojana"
-            ],
-            "SUPPORT": [
-                "hopeless", "worthless", "failed", "can't go on", "everything failing",
-                "stressed", "depressed", "worried", "anxious", "scared", "upset",
-                "lost everything", "no hope", "burden", "ashamed", "feel bad",
-                "struggling", "difficult", "hard time", "overwhelmed", "desperate"
-            ]
+    def __init__(self,
+                 vlm_tool: Optional[VLMTool] = None,
+                 kcc_tool: Optional[KCCTool] = None,
+                 kcc_cultural_tool: Optional[KCCCulturalTool] = None,
+                 lstm_tool: Optional[LSTMPriceTool] = None,
+                 govt_scheme_tool: Optional[GovtSchemeRAGTool] = None):
+        # Tools are injected by the application service container; standalone
+        # construction (scripts, tests) still builds its own instances
+        self.vlm_tool = vlm_tool or VLMTool()
+        self.kcc_tool = kcc_tool or KCCTool()
+        self.kcc_cultural_tool = kcc_cultural_tool or KCCCulturalTool()
+        self.lstm_tool = lstm_tool or LSTMPriceTool()
+        self.govt_scheme_tool = govt_scheme_tool or GovtSchemeRAGTool()
+        
+        # Intent keyword and crop alias tables compiled into one matcher (see data/)
+        self.query_analyzer = load_query_analyzer(
+            settings.intent_keywords_path or None,
+            settings.crop_aliases_path or None
+        )
+        self.intent_keywords = self.query_analyzer.intent_keywords
+        
+        self.intent_classifier = LocalIntentClassifier(
+            min_score=settings.intent_fast_path_min_score,
+            min_confidence=settings.intent_fast_path_min_confidence
+        )
+        
+        # Tool branch per intent; selected branches run concurrently
+        self._intent_runners = {
+            "CROP_VARIETIES": self._run_crop_varieties,
+            "CULTURAL_PRACTICES": self._run_cultural_practices,
+            "FARMING_ADVICE": self._run_farming_advice,
+            "MARKET_INFO": self._run_market_info,
+            "GOVT_SCHEME": self._run_govt_scheme,
+            "SUPPORT": self._run_support
         }
     
     async def process_query(self, 
@@ -85,6 +71,17 @@ class MainAgent:
         """
         Main entry point for processing farmer queries through DHARTI
         """
+        response, _ = await self.process_query_with_trace(translation_result, image_path)
+        return response
+    
+    async def process_query_with_trace(self, 
+                                       translation_result: Dict[str, Any], 
+                                       image_path: Optional[str] = None) -> Tuple[ResponseContent, Dict[str, Any]]:
+        """
+        Process a query and also return a routing trace: the intents served,
+        the source of each tool result, and whether any step fell back
+        (callers use it to decide whether the response may be cached)
+        """
         start_time = time.time()
         logger.info("======== DHARTI (Main Agent) Processing ========")
         
@@ -122,24 +119,124 @@ class MainAgent:
             logger.info(f"DHARTI (Main Agent): Processing completed in {total_time:.2f}s")
             logger.info("======== DHARTI (Main Agent) Processing Complete ========")
             
-            return final_response
+            trace = self._build_trace(intent_analysis, response)
+            return final_response, trace
             
         except Exception as e:
             logger.error(f"DHARTI (Main Agent): Processing failed - {str(e)}")
             # Fallback to basic response
             return ResponseContent(
                 text=f"I encountered an issue processing your query, but I can see you're asking about: {translated_text[:100]}. Please try rephrasing your question or contact support."
+            ), {"intents": [], "tools": {}, "degraded": True, "error": str(e)}
+    
+    async def process_query_stream(self, 
+                                   translation_result: Dict[str, Any], 
+                                   image_path: Optional[str] = None) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Streaming variant of process_query_with_trace yielding (event, data):
+        
+            ("intent", {...})    routing decision, before any tool runs
+            ("tool", {...})      each tool's answer as soon as it returns
+            ("response", {...})  final ResponseContent and routing trace
+        """
+        translated_text = translation_result.get("translation", "")
+        logger.info("======== DHARTI (Main Agent) Streaming ========")
+        logger.info(f"DHARTI (Main Agent): Processing query: '{translated_text[:60]}...'")
+        
+        tasks: List[asyncio.Task] = []
+        try:
+            intent_analysis = await self._analyze_intent(
+                translated_text,
+                translation_result.get("agricultural_terms", []),
+                image_path is not None
+            )
+            yield "intent", {
+                "primary_intent": intent_analysis.get("primary_intent"),
+                "intents": self._select_intents(intent_analysis),
+                "confidence": intent_analysis.get("confidence"),
+                "source": intent_analysis.get("source")
+            }
+            
+            tasks = [asyncio.ensure_future(run) for run in self._plan_tool_runs(intent_analysis, translated_text, image_path)]
+            for next_output in asyncio.as_completed(tasks):
+                output = await next_output
+                for name, result in output.items():
+                    yield "tool", {
+                        "tool": name,
+                        "success": bool(result.get("success")),
+                        "source": result.get("source"),
+                        "response": result.get("response", "")
+                    }
+            
+            # Merge in routing order (primary intent first), not completion order
+            results = {}
+            for task in tasks:
+                results.update(task.result())
+            
+            final_response = self._format_response(results, intent_analysis)
+            yield "response", {"response": final_response, "trace": self._build_trace(intent_analysis, results)}
+        
+        except Exception as e:
+            logger.error(f"DHARTI (Main Agent): Streaming failed - {str(e)}")
+            yield "response", {
+                "response": ResponseContent(
+                    text=f"I encountered an issue processing your query, but I can see you're asking about: {translated_text[:100]}. Please try rephrasing your question or contact support."
+                ),
+                "trace": {"intents": [], "tools": {}, "degraded": True, "error": str(e)}
+            }
+        
+        finally:
+            # The client may stop listening mid-stream; don't leave tool calls running
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    def _build_trace(self, intent_analysis: Dict[str, Any], results: Dict[str, Any]) -> Dict[str, Any]:
+        tools = {
+            name: {"success": bool(result.get("success")), "source": result.get("source")}
+            for name, result in results.items()
+        }
+        degraded = (
+            not tools
+            or intent_analysis.get("source") == "fallback"
+            or any(
+                not tool["success"] or any(marker in (tool["source"] or "") for marker in DEGRADED_SOURCE_MARKERS)
+                for tool in tools.values()
             )
+        )
+        return {
+            "primary_intent": intent_analysis.get("primary_intent"),
+            "intents": self._select_intents(intent_analysis),
+            "intent_source": intent_analysis.get("source"),
+            "tools": tools,
+            "degraded": degraded
+        }
     
     async def _analyze_intent(self, 
                             text: str, 
                             agricultural_terms: List[str],
                             has_image: bool) -> Dict[str, Any]:
         """
-        Analyze the intent of the farmer's query using GPT-4o-mini
+        Analyze the intent of the farmer's query: the local keyword classifier
+        answers confident cases, everything else goes to GPT-4o-mini
         """
         logger.info("DHARTI (Main Agent): Analyzing query intent...")
         
+        # One keyword pass gives both the local intent scores and the crop entities
+        query_analysis = self.query_analyzer.analyze(text)
+        entities = {"crops": query_analysis["crops"]}
+        
+        if settings.intent_fast_path_enabled:
+            local_result = self.intent_classifier.classify(query_analysis, has_image)
+            if local_result is not None:
+                local_result["entities"] = entities
+                logger.info(
+                    f"DHARTI (Main Agent): Local intent {local_result['primary_intent']} "
+                    f"(confidence {local_result['confidence']}) - skipping LLM classifier"
+                )
+                return local_result
+            logger.info("DHARTI (Main Agent): Local classifier not confident - escalating to GPT-4o-mini")
+        
         try:
             start_time = time.time()
             
@@ -155,6 +252,7 @@ class MainAgent:
                 "primary_intent": "VISUAL_ANALYSIS|CROP_VARIETIES|CULTURAL_PRACTICES|FARMING_ADVICE|MARKET_INFO|GOVT_SCHEME|SUPPORT",
                 "needs_visual_analysis": true/false,
                 "confidence": 0.0-1.0,
+                "secondary_intents": [{{"intent": "...", "confidence": 0.0-1.0}}],
                 "reasoning": "Brief explanation",
                 "keywords_found": ["list", "of", "relevant", "keywords"]
             }}
@@ -170,9 +268,11 @@ class MainAgent:
 
             IMPORTANT: If query mentions "variety", "varieties", "seed selection", specific variety names (JS-335, NRC-37, etc.), or asks "which variety" or "best variety", use CROP_VARIETIES.
 
-            If image is provided AND visual keywords detected, prioritize VISUAL_ANALYSIS."""
+            If image is provided AND visual keywords detected, prioritize VISUAL_ANALYSIS.
+
+            Use secondary_intents only when the query clearly asks for more than one thing (e.g. a disease question AND a price question); otherwise leave it empty."""
 
-            response = self.openai_client.chat.completions.create(
+            response = await chat_completion(
                 model="gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": "You are an expert agricultural intent classifier. Always respond with valid JSON."},
@@ -187,9 +287,17 @@ class MainAgent:
             # Parse JSON response
             content = response.choices[0].message.content.strip()
             intent_result = self._parse_intent_json(content)
+            intent_result.setdefault("source", "llm")
+            intent_result["entities"] = entities
             
             # Override: If image is provided, always prioritize VISUAL_ANALYSIS
             if has_image:
+                # Keep what the LLM picked as a secondary intent so both tools can run
+                original_intent = intent_result.get("primary_intent")
+                if original_intent and original_intent != "VISUAL_ANALYSIS":
+                    intent_result["secondary_intents"] = [
+                        {"intent": original_intent, "confidence": intent_result.get("confidence", 0.0)}
+                    ] + list(intent_result.get("secondary_intents") or [])
                 intent_result["primary_intent"] = "VISUAL_ANALYSIS"
                 intent_result["needs_visual_analysis"] = True
                 intent_result["reasoning"] = f"Image provided - overriding to VISUAL_ANALYSIS. Original: {intent_result.get('reasoning', 'N/A')}"
@@ -206,7 +314,9 @@ class MainAgent:
         except Exception as e:
             logger.error(f"DHARTI (Main Agent): Intent analysis failed - {str(e)}")
             # Fallback intent analysis
-            return self._fallback_intent_analysis(text, has_image)
+            fallback_result = self._fallback_intent_analysis(text, has_image, query_analysis)
+            fallback_result["entities"] = entities
+            return fallback_result
     
     def _parse_intent_json(self, content: str) -> Dict[str, Any]:
         """Parse JSON response from intent analysis"""
@@ -229,21 +339,20 @@ class MainAgent:
                 "needs_visual_analysis": False,
                 "confidence": 0.3,
                 "reasoning": "JSON parsing failed, using fallback",
-                "keywords_found": []
+                "keywords_found": [],
+                "source": "fallback"
             }
     
-    def _fallback_intent_analysis(self, text: str, has_image: bool) -> Dict[str, Any]:
+    def _fallback_intent_analysis(self, text: str, has_image: bool,
+                                  query_analysis: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Simple keyword-based fallback intent analysis"""
         logger.info("DHARTI (Main Agent): Using fallback intent analysis...")
         
-        text_lower = text.lower()
-        intent_scores = {}
+        if query_analysis is None:
+            query_analysis = self.query_analyzer.analyze(text)
         
-        # Score each intent category
-        for intent, keywords in self.intent_keywords.items():
-            score = sum(1 for keyword in keywords if keyword in text_lower)
-            if score > 0:
-                intent_scores[intent] = score
+        # Score each intent category by its number of keyword matches
+        intent_scores = query_analysis["counts"]
         
         # Determine primary intent - ALWAYS prioritize VISUAL_ANALYSIS if image provided
         if has_image:
@@ -256,182 +365,259 @@ class MainAgent:
             primary_intent = "FARMING_ADVICE"
             needs_visual = False
         
+        intent_phrases = {phrase.casefold() for phrase in self.intent_keywords.get(primary_intent, [])}
         return {
             "primary_intent": primary_intent,
             "needs_visual_analysis": needs_visual,
             "confidence": 0.6 if intent_scores else 0.3,
             "reasoning": "Keyword-based fallback analysis",
-            "keywords_found": [k for k in self.intent_keywords[primary_intent] if k in text_lower]
+            "keywords_found": [k for k in query_analysis["keywords_found"] if k in intent_phrases],
+            "source": "fallback"
         }
     
+    def _select_intents(self, intent_analysis: Dict[str, Any]) -> List[str]:
+        """
+        Intents to serve concurrently: the primary intent plus any secondary
+        intents the router reported with enough confidence
+        """
+        primary_intent = intent_analysis.get("primary_intent", "FARMING_ADVICE")
+        selected = [primary_intent]
+        
+        for candidate in intent_analysis.get("secondary_intents") or []:
+            if isinstance(candidate, dict):
+                intent, confidence = candidate.get("intent"), candidate.get("confidence", 0.0)
+            else:
+                intent, confidence = candidate, 1.0
+            try:
+                confidence = float(confidence)
+            except (TypeError, ValueError):
+                continue
+            # The generic farming-advice reply adds nothing next to a specific tool answer
+            if (intent in self._intent_runners and intent != "FARMING_ADVICE"
+                    and intent not in selected
+                    and confidence >= settings.agent_secondary_intent_min_confidence):
+                selected.append(intent)
+        
+        return selected[:settings.agent_max_parallel_intents]
+    
+    def _plan_tool_runs(self, 
+                        intent_analysis: Dict[str, Any], 
+                        query: str, 
+                        image_path: Optional[str]) -> List[Awaitable[Dict[str, Any]]]:
+        """
+        One awaitable per tool branch to run: the VLM when visual analysis is
+        needed plus every selected intent, each already wrapped in its timeout
+        (capped at the overall deadline)
+        """
+        needs_visual = intent_analysis.get("needs_visual_analysis", False)
+        intents = self._select_intents(intent_analysis)
+        
+        logger.info(f"DHARTI (Main Agent): Executing tools for intents: {intents}")
+        
+        deadline = settings.agent_tools_deadline_seconds
+        runs = []
+        
+        # Execute VLM tool if visual analysis is needed (alongside the intent tools)
+        if needs_visual and image_path:
+            logger.info("Intent Classifier Decision: VLM (Vision-Language Model) tool - Image analysis required")
+            runs.append(self._run_with_timeout(
+                "vlm", self._run_visual_analysis(query, image_path),
+                min(settings.agent_vlm_timeout_seconds, deadline)
+            ))
+        
+        # Crop entities come from the intent keyword pass when available
+        crops = intent_analysis.get("entities", {}).get("crops")
+        
+        for intent in intents:
+            runner = self._intent_runners.get(intent)
+            if runner is None:
+                continue
+            run = runner(query, crops[0]) if intent == "MARKET_INFO" and crops else runner(query)
+            runs.append(self._run_with_timeout(
+                intent, run,
+                min(settings.agent_tool_timeout_seconds, deadline)
+            ))
+        
+        return runs
+    
     async def _execute_tools(self, 
                            intent_analysis: Dict[str, Any], 
                            query: str, 
                            image_path: Optional[str]) -> Dict[str, Any]:
         """
-        Execute appropriate tools based on intent analysis
+        Execute the tools for every selected intent concurrently, each under
+        its own timeout, and merge whatever returned by the overall deadline
         """
-        primary_intent = intent_analysis.get("primary_intent", "FARMING_ADVICE")
-        needs_visual = intent_analysis.get("needs_visual_analysis", False)
+        runs = self._plan_tool_runs(intent_analysis, query, image_path)
         
-        logger.info(f"DHARTI (Main Agent): Executing tools for intent: {primary_intent}")
+        start_time = time.time()
+        # Every run is capped at the overall deadline, so gather returns by then
+        outputs = await asyncio.gather(*runs)
         
         results = {}
+        for output in outputs:
+            results.update(output)
         
+        logger.info(f"DHARTI (Main Agent): {len(runs)} tool run(s) finished in {time.time() - start_time:.2f}s")
+        return results
+    
+    async def _run_with_timeout(self, name: str, run: Awaitable[Dict[str, Any]],
+                                timeout: float) -> Dict[str, Any]:
+        """Run one tool branch; a timeout or crash yields an unsuccessful result instead of raising"""
         try:
-            # Execute VLM tool if visual analysis is needed
-            if needs_visual and image_path:
-                logger.info("Intent Classifier Decision: VLM (Vision-Language Model) tool - Image analysis required")
-                logger.info("DHARTI (Main Agent): Executing VLM tool...")
-                vlm_result = await self.vlm_tool.analyze_image(image_path, query)
-                results["vlm"] = vlm_result
-                logger.info(f"DHARTI (Main Agent): VLM tool completed: {vlm_result.get('success', False)}")
-            
-            # Execute KCC tool for crop varieties
-            if primary_intent == "CROP_VARIETIES":
-                logger.info("Intent Classifier Decision: KCC (Kisan Call Center) tool - Crop variety query detected")
-                logger.info("DHARTI (Main Agent): Executing KCC tool for variety query...")
-                kcc_result = await self.kcc_tool.get_advice(query)
-                results["kcc"] = kcc_result
-                logger.info(f"DHARTI (Main Agent): KCC tool completed: {kcc_result.get('success', False)}")
-            
-            # Execute KCC Cultural tool for farming practices
-            elif primary_intent == "CULTURAL_PRACTICES":
-                logger.info("Intent Classifier Decision: KCC Cultural Practices tool - Farming practices query detected")
-                logger.info("DHARTI (Main Agent): Executing KCC Cultural tool for practices query...")
-                cultural_result = await self.kcc_cultural_tool.get_practices(query)
-                results["cultural"] = cultural_result
-                logger.info(f"DHARTI (Main Agent): KCC Cultural tool completed: {cultural_result.get('success', False)}")
-            
-            elif primary_intent == "FARMING_ADVICE":
-                logger.info("Intent Classifier Decision: General Farming Advice (Mock) - Basic farming guidance")
-                results["kcc"] = {
-                    "success": True,
-                    "response": f"Based on your query about farming, here's some general advice: Consider proper irrigation, soil testing, and following seasonal planting guidelines for your region.",
-                    "source": "kcc_mock"
-                }
-            
-            elif primary_intent == "MARKET_INFO":
-                logger.info("Intent Classifier Decision: LSTM Price Prediction - Market price queries")
-                
-                # Extract crop from query
-                crop = self._extract_crop_from_query(query)
-                
-                if crop and crop in self.lstm_tool.supported_crops:
-                    logger.info(f"DHARTI (Main Agent): Executing LSTM tool for {crop} price prediction...")
-                    
-                    try:
-                        # Get LSTM price prediction
-                        prediction_result = await self.lstm_tool.predict_weekly_prices(crop=crop)
-                        
-                        if prediction_result.get("success"):
-                            # Format with GPT-4o-mini
-                            formatted_response = await self._format_price_prediction(crop, prediction_result, query)
-                            results["lstm"] = {
-                                "success": True,
-                                "response": formatted_response,
-                                "source": "lstm_price_prediction",
-                                "crop": crop
-                            }
-                            logger.info(f"DHARTI (Main Agent): LSTM price prediction completed for {crop}")
-                        else:
-                            results["market"] = {
-                                "success": True,
-                                "response": f"Unable to predict {crop} prices currently. Check your local mandi for current rates and trends.",
-                                "source": "lstm_fallback"
-                            }
-                    except Exception as e:
-                        logger.error(f"LSTM prediction failed for {crop}: {str(e)}")
-                        results["market"] = {
-                            "success": True,
-                            "response": f"Price prediction service temporarily unavailable. Please check current {crop} rates at your local mandi.",
-                            "source": "lstm_error"
-                        }
-                else:
-                    # Fallback for unsupported crops or general market queries
-                    logger.info("Intent Classifier Decision: General Market Intelligence (Mock) - Unsupported crop or general query")
-                    results["market"] = {
-                        "success": True,
-                        "response": "Current market prices are favorable. Consider checking local mandi rates before selling. Timing your sales during peak demand periods can maximize profits.",
-                        "source": "market_mock"
-                    }
-            
-            elif primary_intent == "GOVT_SCHEME":
-                logger.info("Intent Classifier Decision: Government Schemes RAG - Subsidy and scheme queries")
-                logger.info("DHARTI (Main Agent): Executing Government Schemes RAG tool...")
-                
-                try:
-                    # Call the RAG tool
-                    rag_result = await self.govt_scheme_tool.search_schemes(
-                        query=query,
-                        top_n_schemes=3
-                    )
-                    
-                    if rag_result.get("success"):
-                        results["govt_scheme"] = {
-                            "success": True,
-                            "response": rag_result.get("rag_response", "Found relevant schemes for you."),
-                            "source": "govt_scheme_rag",
-                            "schemes": rag_result.get("schemes", []),
-                            "total_schemes": rag_result.get("total_schemes", 0),
-                            "using_rag": rag_result.get("using_rag", False)
-                        }
-                        logger.info(f"DHARTI (Main Agent): Found {rag_result.get('total_schemes', 0)} schemes using RAG: {rag_result.get('using_rag', False)}")
-                    else:
-                        # Fallback response if RAG fails
-                        results["govt_scheme"] = {
-                            "success": True,
-                            "response": "You may be eligible for PM-KISAN scheme and crop insurance. Visit your nearest CSC or agriculture office with Aadhaar and land documents for enrollment.",
-                            "source": "govt_scheme_fallback",
-                            "error": rag_result.get("error", "RAG search failed")
-                        }
-                        logger.warning(f"DHARTI (Main Agent): RAG tool failed, using fallback response")
-                
-                except Exception as e:
-                    logger.error(f"DHARTI (Main Agent): Government Schemes RAG tool error: {str(e)}")
-                    # Ultimate fallback
-                    results["govt_scheme"] = {
-                        "success": True,
-                        "response": "You may be eligible for PM-KISAN scheme and crop insurance. Visit your nearest CSC or agriculture office with Aadhaar and land documents for enrollment.",
-                        "source": "govt_scheme_error_fallback",
-                        "error": str(e)
-                    }
-            
-            # Execute support response for emotional distress
-            elif primary_intent == "SUPPORT":
-                logger.info("Intent Classifier Decision: Support needed - Farmer expressing distress")
-                logger.info("DHARTI (Main Agent): Generating supportive response...")
-                
-                try:
-                    support_response = await self._generate_support_response(query)
-                    results["support"] = {
-                        "success": True,
-                        "response": support_response,
-                        "source": "support_response",
-                        "intent": "emotional_support"
-                    }
-                    logger.info("DHARTI (Main Agent): Support response generated successfully")
-                
-                except Exception as e:
-                    logger.error(f"DHARTI (Main Agent): Support response failed: {str(e)}")
-                    results["support"] = {
-                        "success": True,
-                        "response": "I understand you're going through a difficult time. Please reach out to Kisan Call Centre at 1800-180-1551 for support and guidance. You're not alone in this.",
-                        "source": "support_fallback",
-                        "error": str(e)
-                    }
+            return await asyncio.wait_for(run, timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"DHARTI (Main Agent): {name} tool timed out after {timeout:g}s")
+            return {f"{name.lower()}_timeout": {
+                "success": False,
+                "response": "",
+                "source": "timeout",
+                "error": f"{name} timed out after {timeout:g}s"
+            }}
+        except Exception as e:
+            logger.error(f"DHARTI (Main Agent): {name} tool execution failed - {str(e)}")
+            return {f"{name.lower()}_error": {
+                "success": False,
+                "response": f"I encountered an issue analyzing your query: {str(e)}",
+                "source": "error_fallback"
+            }}
+    
+    async def _run_visual_analysis(self, query: str, image_path: str) -> Dict[str, Any]:
+        logger.info("DHARTI (Main Agent): Executing VLM tool...")
+        vlm_result = await self.vlm_tool.analyze_image(image_path, query)
+        logger.info(f"DHARTI (Main Agent): VLM tool completed: {vlm_result.get('success', False)}")
+        return {"vlm": vlm_result}
+    
+    async def _run_crop_varieties(self, query: str) -> Dict[str, Any]:
+        logger.info("Intent Classifier Decision: KCC (Kisan Call Center) tool - Crop variety query detected")
+        logger.info("DHARTI (Main Agent): Executing KCC tool for variety query...")
+        kcc_result = await self.kcc_tool.get_advice(query)
+        logger.info(f"DHARTI (Main Agent): KCC tool completed: {kcc_result.get('success', False)}")
+        return {"kcc": kcc_result}
+    
+    async def _run_cultural_practices(self, query: str) -> Dict[str, Any]:
+        logger.info("Intent Classifier Decision: KCC Cultural Practices tool - Farming practices query detected")
+        logger.info("DHARTI (Main Agent): Executing KCC Cultural tool for practices query...")
+        cultural_result = await self.kcc_cultural_tool.get_practices(query)
+        logger.info(f"DHARTI (Main Agent): KCC Cultural tool completed: {cultural_result.get('success', False)}")
+        return {"cultural": cultural_result}
+    
+    async def _run_farming_advice(self, query: str) -> Dict[str, Any]:
+        logger.info("Intent Classifier Decision: General Farming Advice (Mock) - Basic farming guidance")
+        return {"farming_advice": {
+            "success": True,
+            "response": f"Based on your query about farming, here's some general advice: Consider proper irrigation, soil testing, and following seasonal planting guidelines for your region.",
+            "source": "kcc_mock"
+        }}
+    
+    async def _run_market_info(self, query: str, crop: Optional[str] = None) -> Dict[str, Any]:
+        logger.info("Intent Classifier Decision: LSTM Price Prediction - Market price queries")
+        
+        # Extract crop from query unless the intent pass already found one
+        crop = crop or self._extract_crop_from_query(query)
+        
+        if not (crop and crop in self.lstm_tool.supported_crops):
+            # Fallback for unsupported crops or general market queries
+            logger.info("Intent Classifier Decision: General Market Intelligence (Mock) - Unsupported crop or general query")
+            return {"market": {
+                "success": True,
+                "response": "Current market prices are favorable. Consider checking local mandi rates before selling. Timing your sales during peak demand periods can maximize profits.",
+                "source": "market_mock"
+            }}
+        
+        logger.info(f"DHARTI (Main Agent): Executing LSTM tool for {crop} price prediction...")
+        
+        try:
+            # Get LSTM price prediction
+            prediction_result = await self.lstm_tool.predict_weekly_prices(crop=crop)
             
-            return results
+            if not prediction_result.get("success"):
+                return {"market": {
+                    "success": True,
+                    "response": f"Unable to predict {crop} prices currently. Check your local mandi for current rates and trends.",
+                    "source": "lstm_fallback"
+                }}
+            
+            # Format with GPT-4o-mini
+            formatted_response = await self._format_price_prediction(crop, prediction_result, query)
+            logger.info(f"DHARTI (Main Agent): LSTM price prediction completed for {crop}")
+            return {"lstm": {
+                "success": True,
+                "response": formatted_response,
+                "source": "lstm_price_prediction",
+                "crop": crop
+            }}
+        except Exception as e:
+            logger.error(f"LSTM prediction failed for {crop}: {str(e)}")
+            return {"market": {
+                "success": True,
+                "response": f"Price prediction service temporarily unavailable. Please check current {crop} rates at your local mandi.",
+                "source": "lstm_error"
+            }}
+    
+    async def _run_govt_scheme(self, query: str) -> Dict[str, Any]:
+        logger.info("Intent Classifier Decision: Government Schemes RAG - Subsidy and scheme queries")
+        logger.info("DHARTI (Main Agent): Executing Government Schemes RAG tool...")
+        
+        try:
+            # Call the RAG tool
+            rag_result = await self.govt_scheme_tool.search_schemes(
+                query=query,
+                top_n_schemes=3
+            )
             
+            if rag_result.get("success"):
+                logger.info(f"DHARTI (Main Agent): Found {rag_result.get('total_schemes', 0)} schemes using RAG: {rag_result.get('using_rag', False)}")
+                return {"govt_scheme": {
+                    "success": True,
+                    "response": rag_result.get("rag_response", "Found relevant schemes for you."),
+                    "source": "govt_scheme_rag",
+                    "schemes": rag_result.get("schemes", []),
+                    "total_schemes": rag_result.get("total_schemes", 0),
+                    "using_rag": rag_result.get("using_rag", False)
+                }}
+            
+            # Fallback response if RAG fails
+            logger.warning(f"DHARTI (Main Agent): RAG tool failed, using fallback response")
+            return {"govt_scheme": {
+                "success": True,
+                "response": "You may be eligible for PM-KISAN scheme and crop insurance. Visit your nearest CSC or agriculture office with Aadhaar and land documents for enrollment.",
+                "source": "govt_scheme_fallback",
+                "error": rag_result.get("error", "RAG search failed")
+            }}
+        
         except Exception as e:
-            logger.error(f"DHARTI (Main Agent): Tool execution failed - {str(e)}")
-            return {
-                "error": {
-                    "success": False,
-                    "response": f"I encountered an issue analyzing your query: {str(e)}",
-                    "source": "error_fallback"
-                }
-            }
+            logger.error(f"DHARTI (Main Agent): Government Schemes RAG tool error: {str(e)}")
+            # Ultimate fallback
+            return {"govt_scheme": {
+                "success": True,
+                "response": "You may be eligible for PM-KISAN scheme and crop insurance. Visit your nearest CSC or agriculture office with Aadhaar and land documents for enrollment.",
+                "source": "govt_scheme_error_fallback",
+                "error": str(e)
+            }}
+    
+    async def _run_support(self, query: str) -> Dict[str, Any]:
+        logger.info("Intent Classifier Decision: Support needed - Farmer expressing distress")
+        logger.info("DHARTI (Main Agent): Generating supportive response...")
+        
+        try:
+            support_response = await self._generate_support_response(query)
+            logger.info("DHARTI (Main Agent): Support response generated successfully")
+            return {"support": {
+                "success": True,
+                "response": support_response,
+                "source": "support_response",
+                "intent": "emotional_support"
+            }}
+        
+        except Exception as e:
+            logger.error(f"DHARTI (Main Agent): Support response failed: {str(e)}")
+            return {"support": {
+                "success": True,
+                "response": "I understand you're going through a difficult time. Please reach out to Kisan Call Centre at 1800-180-1551 for support and guidance. You're not alone in this.",
+                "source": "support_fallback",
+                "error": str(e)
+            }}
     
     def _format_response(self, 
                         tool_results: Dict[str, Any], 
@@ -457,9 +643,9 @@ class MainAgent:
                     response_parts.append(result["response"])
                     logger.info(f"DHARTI (Main Agent): Added {tool_name} response")
             
-            # Create final combined response
+            # Create final combined response (one paragraph per tool answer)
             if response_parts:
-                final_text = " ".join(response_parts)
+                final_text = "\n\n".join(response_parts)
             else:
                 final_text = "I understand your agricultural query. For the best assistance, please provide more specific details about your farming concern."
             
@@ -526,7 +712,7 @@ Provide:
 
 Keep response under 50 words, practical and actionable."""
 
-            response = self.openai_client.chat.completions.create(
+            response = await chat_completion(
                 model="gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": "You are a concise agricultural price advisor. Provide brief, actionable price advice."},
@@ -558,7 +744,7 @@ Provide a brief, compassionate response (2-3 sentences) that:
 
 Keep tone supportive but practical. Don't be overly dramatic."""
 
-            response = self.openai_client.chat.completions.create(
+            response = await chat_completion(
                 model="gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": "You are a compassionate agricultural advisor who provides supportive, practical guidance to farmers in distress."},
@@ -579,17 +765,5 @@ Keep tone supportive but practical. Don't be overly dramatic."""
         """
         Extract crop name from query for LSTM price prediction
         """
-        query_lower = query.lower()
-        
-        # Supported LSTM crops
-        crop_mappings = {
-            "rice": ["rice", "paddy", "chawal"],
-            "sugarcane": ["sugarcane", "sugar cane", "ganne"],
-            "ajwan": ["ajwan", "ajwain", "carom"]
-        }
-        
-        for crop, aliases in crop_mappings.items():
-            if any(alias in query_lower for alias in aliases):
-                return crop
-        
-        return None
\ No newline at end of file
+        crops = self.query_analyzer.analyze(query)["crops"]
+        return crops[0] if crops else None
@@ -0,0 +1,111 @@
+"""
+Local fast-path intent classifier for DHARTI.
+
+Scores come from the keyword matcher (see keyword_matcher), where each
+matched phrase adds its word count to its intent, so specific phrases
+("rice price", "which variety") outweigh generic single words. An intent is
+"strong" once its score reaches `min_score`.
+
+A query is answered locally when the top intent is strong and either has a
+clear lead over the runner-up or the runner-up is strong too (the query asks
+for several things, so both are served). Image queries are VISUAL_ANALYSIS
+with any strong non-visual intents as secondaries; without an image there
+is nothing to analyze, so VISUAL_ANALYSIS is never chosen locally. Anything
+else, including an image query with only weak non-visual evidence or a
+text query that mostly describes symptoms, is escalated to the GPT-4o-mini
+classifier.
+
+Secondary confidences are absolute evidence, score / (score + min_score), so
+a secondary reaches 0.5 exactly when it is strong on its own, independent of
+how far the primary intent is ahead.
+"""
+
+from typing import Any, Dict, List, Optional
+
+VISUAL_INTENT = "VISUAL_ANALYSIS"
+GENERIC_INTENT = "FARMING_ADVICE"
+
+
+class LocalIntentClassifier:
+    """Confidence gate over keyword-matcher intent scores."""
+
+    def __init__(self, min_score: float = 2.0, min_confidence: float = 0.75):
+        self.min_score = min_score
+        self.min_confidence = min_confidence
+
+        self.classified = 0
+        self.fast_path = 0
+
+    def _evidence(self, score: float) -> float:
+        return round(score / (score + self.min_score), 2)
+
+    def _secondaries(self, scores: Dict[str, float], exclude: str) -> List[Dict[str, Any]]:
+        return [
+            {"intent": intent, "confidence": self._evidence(score)}
+            for intent, score in sorted(scores.items(), key=lambda item: item[1], reverse=True)
+            if intent != exclude and score >= self.min_score
+        ]
+
+    def classify(self, analysis: Dict[str, Any], has_image: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Intent analysis in the same shape as the LLM classifier for a
+        QueryAnalyzer.analyze() result, or None when the query is ambiguous
+        and should be escalated.
+        """
+        self.classified += 1
+        scores = analysis["scores"]
+
+        # An image always routes to VISUAL_ANALYSIS, so the LLM is only needed
+        # to decide whether weak non-visual keywords are a second question
+        if has_image:
+            others = {intent: score for intent, score in scores.items() if intent != VISUAL_INTENT}
+            if any(score < self.min_score for score in others.values()):
+                return None
+
+            self.fast_path += 1
+            return {
+                "primary_intent": VISUAL_INTENT,
+                "needs_visual_analysis": True,
+                "confidence": 1.0,
+                "secondary_intents": self._secondaries(others, VISUAL_INTENT),
+                "reasoning": "Image provided - VISUAL_ANALYSIS",
+                "keywords_found": analysis["keywords_found"],
+                "source": "local"
+            }
+
+        if not scores:
+            return None
+
+        # Ties go to a specific intent over the generic farming-advice reply
+        ranked = sorted(scores.items(), key=lambda item: (item[1], item[0] != GENERIC_INTENT), reverse=True)
+        # Symptoms described without a photo have no local tool to answer them
+        if ranked[0][0] == VISUAL_INTENT:
+            return None
+        scores = {intent: score for intent, score in scores.items() if intent != VISUAL_INTENT}
+        ranked = [item for item in ranked if item[0] != VISUAL_INTENT]
+        primary_intent, top_score = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+        confidence = top_score / (top_score + runner_up)
+        if top_score < self.min_score:
+            return None
+        if confidence < self.min_confidence and runner_up < self.min_score:
+            return None
+
+        self.fast_path += 1
+        return {
+            "primary_intent": primary_intent,
+            "needs_visual_analysis": False,
+            "confidence": round(confidence, 2),
+            "secondary_intents": self._secondaries(scores, primary_intent),
+            "reasoning": f"Local keyword classifier (score {top_score:g}, runner-up {runner_up:g})",
+            "keywords_found": analysis["keywords_found"],
+            "source": "local"
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "classified": self.classified,
+            "fast_path": self.fast_path,
+            "escalated": self.classified - self.fast_path,
+            "fast_path_rate": round(self.fast_path / self.classified, 3) if self.classified else None
+        }
@@ -0,0 +1,183 @@
+"""
+Aho-Corasick multi-pattern matcher for DHARTI keyword tables.
+
+Several named tables (intent keywords, crop aliases, ...) are compiled into
+one automaton, so a single scan of the query finds every phrase of every
+table. Matches must sit on word boundaries ("rate" does not fire inside
+"irrigate"); within each table overlapping matches are resolved
+leftmost-longest, so "seed rate" is reported instead of "seed" and "rate".
+Tables are resolved independently, so "rice" is still found as a crop inside
+the intent phrase "rice price".
+
+Keyword tables live in JSON data files next to this module:
+    intent_keywords.json   {"INTENT": ["phrase", ...], ...}
+    crop_aliases.json      {"crop": ["alias", ...], ...}
+"""
+
+import json
+import unicodedata
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+DATA_DIR = Path(__file__).parent / "data"
+INTENT_KEYWORDS_FILE = DATA_DIR / "intent_keywords.json"
+CROP_ALIASES_FILE = DATA_DIR / "crop_aliases.json"
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+def _is_word_char(ch: str) -> bool:
+    # Combining marks (Devanagari matras, virama) continue the current word
+    return ch.isalnum() or ch == "_" or unicodedata.category(ch).startswith("M")
+
+
+def load_keyword_table(path: Path) -> Dict[str, List[str]]:
+    """Read a {label: [phrase, ...]} JSON table."""
+    with open(path, "r", encoding="utf-8") as f:
+        table = json.load(f)
+    if not isinstance(table, dict) or not all(isinstance(v, list) for v in table.values()):
+        raise ValueError(f"Keyword table {path} must map labels to lists of phrases")
+    return table
+
+
+class KeywordMatcher:
+    """
+    Word-boundary-aware Aho-Corasick automaton over named keyword tables.
+
+    `tables` maps a table name to {label: [phrase, ...]}. A phrase listed under
+    several labels of the same table belongs to the first one.
+    """
+
+    def __init__(self, tables: Dict[str, Dict[str, List[str]]]):
+        # Per pattern: (table, label, phrase, length); the same phrase may appear once per table
+        self._patterns: List[Tuple[str, str, str, int]] = []
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for table, labels in tables.items():
+            seen = set()
+            for label, phrases in labels.items():
+                for phrase in phrases:
+                    phrase = normalize_text(phrase)
+                    if phrase and phrase not in seen:
+                        seen.add(phrase)
+                        self._add(len(self._patterns), phrase)
+                        self._patterns.append((table, label, phrase, len(phrase)))
+
+        self._build_failure_links()
+        self.tables = list(tables)
+
+    def _add(self, pattern_id: int, phrase: str) -> None:
+        state = 0
+        for ch in phrase:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(pattern_id)
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(ch, 0)
+                # Fold suffix outputs in so each state lists every pattern ending there
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    @property
+    def pattern_count(self) -> int:
+        return len(self._patterns)
+
+    def find_all(self, text: str) -> List[Tuple[int, int, int]]:
+        """Every word-bounded (start, end, pattern_id) occurrence in normalized text."""
+        goto, fail, output, patterns = self._goto, self._fail, self._output, self._patterns
+        matches = []
+        state = 0
+        for end, ch in enumerate(text, start=1):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not output[state]:
+                continue
+            if end < len(text) and _is_word_char(text[end]):
+                continue
+            for pattern_id in output[state]:
+                start = end - patterns[pattern_id][3]
+                if start == 0 or not _is_word_char(text[start - 1]):
+                    matches.append((start, end, pattern_id))
+        return matches
+
+    def match(self, text: str) -> Dict[str, List[Tuple[str, str]]]:
+        """
+        Leftmost-longest, non-overlapping (label, phrase) matches per table,
+        in text order, from one scan of the text.
+        """
+        by_table: Dict[str, List[Tuple[int, int, int]]] = {table: [] for table in self.tables}
+        for start, end, pattern_id in self.find_all(normalize_text(text)):
+            by_table[self._patterns[pattern_id][0]].append((start, end, pattern_id))
+
+        result: Dict[str, List[Tuple[str, str]]] = {}
+        for table, matches in by_table.items():
+            selected = []
+            covered_until = 0
+            for start, end, pattern_id in sorted(matches, key=lambda m: (m[0], -m[1])):
+                if start >= covered_until:
+                    _, label, phrase, _ = self._patterns[pattern_id]
+                    selected.append((label, phrase))
+                    covered_until = end
+            result[table] = selected
+        return result
+
+
+class QueryAnalyzer:
+    """Intent keyword scores and crop entities for a query in one pass."""
+
+    def __init__(self, intent_keywords: Dict[str, List[str]],
+                 crop_aliases: Optional[Dict[str, List[str]]] = None):
+        self.intent_keywords = intent_keywords
+        self.crop_aliases = crop_aliases or {}
+        self.matcher = KeywordMatcher({"intent": intent_keywords, "crop": self.crop_aliases})
+
+    def analyze(self, text: str) -> Dict[str, Any]:
+        """
+        {"scores": {intent: weight}, "counts": {intent: matches},
+         "keywords_found": [...], "crops": [...]}
+
+        Each intent match weighs its phrase's word count, so specific phrases
+        outweigh generic single words.
+        """
+        matched = self.matcher.match(text)
+
+        scores: Dict[str, float] = {}
+        counts: Dict[str, int] = {}
+        keywords_found = []
+        for intent, phrase in matched["intent"]:
+            scores[intent] = scores.get(intent, 0.0) + float(len(phrase.split()))
+            counts[intent] = counts.get(intent, 0) + 1
+            keywords_found.append(phrase)
+
+        crops = list(dict.fromkeys(crop for crop, _ in matched["crop"]))
+
+        return {"scores": scores, "counts": counts, "keywords_found": keywords_found, "crops": crops}
+
+
+def load_query_analyzer(intent_keywords_path: Optional[Path] = None,
+                        crop_aliases_path: Optional[Path] = None) -> QueryAnalyzer:
+    """Build the analyzer from the keyword data files (packaged defaults when paths are None)."""
+    return QueryAnalyzer(
+        load_keyword_table(Path(intent_keywords_path) if intent_keywords_path else INTENT_KEYWORDS_FILE),
+        load_keyword_table(Path(crop_aliases_path) if crop_aliases_path else CROP_ALIASES_FILE)
+    )
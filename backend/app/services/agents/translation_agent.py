@@ -1,17 +1,14 @@
 import os
 import time
 import json
-from openai import OpenAI
+from typing import AsyncIterator, Tuple
 from app.utils.logger import get_logger
-from app.core.config import settings
+from app.services.openai_client import get_async_openai_client, chat_completion
 
 logger = get_logger(__name__)
 
 
 class TranslationAgent:
-    def __init__(self):
-        self.client = OpenAI(api_key=settings.openai_api_key)
-    
     async def process_audio(self, audio_path: str) -> dict:
         logger.info("======== Starting Translation Pipeline ========")
         logger.info(f"Processing audio file: {audio_path}")
@@ -30,14 +27,7 @@ class TranslationAgent:
                 return self._create_fallback_response(transcription)
             
             # Combine results
-            result = {
-                "success": True,
-                "original_transcription": transcription,
-                "translation": enhancement.get("translation", transcription),
-                "agricultural_terms": enhancement.get("agricultural_terms", []),
-                "confidence": enhancement.get("confidence", "Low"),
-                "reasoning": enhancement.get("reasoning", "")
-            }
+            result = self._combine_results(transcription, enhancement)
             
             logger.info("======== Translation Complete ========")
             logger.info(f"Translation: {result['translation']}")
@@ -50,6 +40,35 @@ class TranslationAgent:
             logger.error(f"Error: Translation pipeline failed - {str(e)}")
             return self._create_error_response(str(e))
     
+    async def process_audio_stream(self, audio_path: str) -> AsyncIterator[Tuple[str, dict]]:
+        """
+        Staged process_audio yielding ("transcript", {"transcription"}) as soon
+        as transcription finishes, then ("translation", result) with the same
+        result dict process_audio returns
+        """
+        logger.info("======== Starting Translation Pipeline (streaming) ========")
+        
+        try:
+            transcription = await self.transcribe_audio(audio_path)
+            if not transcription:
+                logger.error("Error: Transcription failed")
+                yield "translation", self._create_error_response("Transcription failed")
+                return
+            
+            yield "transcript", {"transcription": transcription}
+            
+            enhancement = await self.enhance_transcription(transcription)
+            if not enhancement:
+                logger.error("Error: Enhancement failed")
+                yield "translation", self._create_fallback_response(transcription)
+                return
+            
+            yield "translation", self._combine_results(transcription, enhancement)
+            
+        except Exception as e:
+            logger.error(f"Error: Translation pipeline failed - {str(e)}")
+            yield "translation", self._create_error_response(str(e))
+    
     async def transcribe_audio(self, audio_path: str) -> str:
         logger.info("======== Stage 1: Transcription ========")
         
@@ -57,7 +76,7 @@ class TranslationAgent:
             start_time = time.time()
             
             with open(audio_path, "rb") as audio_file:
-                response = self.client.audio.transcriptions.create(
+                response = await get_async_openai_client().audio.transcriptions.create(
                     model="gpt-4o-transcribe",
                     file=audio_file,
                     response_format="json",
@@ -109,7 +128,7 @@ Context: Indian farmers often mix Hindi and English when discussing:
 - Government schemes and subsidies
 - Soil and weather conditions"""
 
-            response = self.client.chat.completions.create(
+            response = await chat_completion(
                 model="gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": "You are an expert agricultural translator and advisor for Indian farmers. Always respond with valid JSON."},
@@ -170,6 +189,16 @@ Context: Indian farmers often mix Hindi and English when discussing:
                 "reasoning": f"JSON parsing failed: {str(e)}"
             }
     
+    def _combine_results(self, transcription: str, enhancement: dict) -> dict:
+        return {
+            "success": True,
+            "original_transcription": transcription,
+            "translation": enhancement.get("translation", transcription),
+            "agricultural_terms": enhancement.get("agricultural_terms", []),
+            "confidence": enhancement.get("confidence", "Low"),
+            "reasoning": enhancement.get("reasoning", "")
+        }
+    
     def _create_error_response(self, error_msg: str) -> dict:
         return {
             "success": False,
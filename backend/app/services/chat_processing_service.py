@@ -1,23 +1,26 @@
 import os
 import shutil
 from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
 from fastapi import UploadFile
-from openai import OpenAI
-from app.core.config import settings
 from app.utils.logger import get_logger
-from app.schemas.chat import ChatResponse, WorkflowType
+from app.schemas.chat import ChatResponse, ResponseContent, WorkflowType
 from app.services.demo_content_service import DemoContentService
+from app.services.openai_client import chat_completion, chat_completion_stream
 from app.services.agents.translation_agent import TranslationAgent, AgenticServiceProcessor
 from app.services.agents.dharti_main_agent import MainAgent
+from app.services.response_cache import ResponseCache
 
 logger = get_logger(__name__)
 
 
 class ChatProcessingService:
     
-    def __init__(self):
-        self.translation_agent = TranslationAgent()
-        self.openai_client = OpenAI(api_key=settings.openai_api_key)
+    def __init__(self, translation_agent: TranslationAgent, main_agent: MainAgent,
+                 response_cache: Optional[ResponseCache] = None):
+        self.translation_agent = translation_agent
+        self.main_agent = main_agent
+        self.response_cache = response_cache
     
     @staticmethod
     async def save_file(file: UploadFile, file_type: str) -> str:
@@ -37,21 +40,36 @@ class ChatProcessingService:
         logger.info(f"Successfully saved {file_type} as: {new_filename}")
         return new_filename
     
-    async def translate_to_hindi(self, english_text: str) -> str:
-        """Translate English response back to Hindi using GPT-4o-mini"""
-        try:
-            hindi_prompt = f"""Translate this agricultural advice from English to Hindi. Keep it natural and farmer-friendly. Use simple Hindi words that farmers understand.
+    @staticmethod
+    def _hindi_translation_messages(english_text: str) -> list:
+        hindi_prompt = f"""Translate this agricultural advice from English to Hindi. Keep it natural and farmer-friendly. Use simple Hindi words that farmers understand.
 
 English text: "{english_text}"
 
 Hindi translation:"""
-
-            response = self.openai_client.chat.completions.create(
+        return [
+            {"role": "system", "content": "Translate agricultural advice to Hindi. Use simple, farmer-friendly language. Be precise, no prefixes."},
+            {"role": "user", "content": hindi_prompt}
+        ]
+    
+    @staticmethod
+    def _text_translation_result(text: str) -> Dict[str, Any]:
+        """Translation-agent shaped input for a typed query (no transcription step)"""
+        return {
+            "success": True,
+            "original_transcription": text,
+            "translation": text,  # Assume text is already in English
+            "agricultural_terms": [],
+            "confidence": "High",
+            "reasoning": "Direct text input"
+        }
+    
+    async def translate_to_hindi(self, english_text: str) -> str:
+        """Translate English response back to Hindi using GPT-4o-mini"""
+        try:
+            response = await chat_completion(
                 model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "Translate agricultural advice to Hindi. Use simple, farmer-friendly language. Be precise, no prefixes."},
-                    {"role": "user", "content": hindi_prompt}
-                ],
+                messages=self._hindi_translation_messages(english_text),
                 max_tokens=300,
                 temperature=0.1
             )
@@ -65,30 +83,42 @@ Hindi translation:"""
             # Fallback to original English text
             return english_text
     
-    @classmethod
-    async def handle_audio_only(cls, audio_filename: str) -> ChatResponse:
+    async def translate_to_hindi_stream(self, english_text: str) -> AsyncIterator[str]:
+        """Streaming translate_to_hindi: yields Hindi text chunks as GPT-4o-mini produces them"""
+        emitted = False
+        try:
+            async for chunk in chat_completion_stream(
+                model="gpt-4o-mini",
+                messages=self._hindi_translation_messages(english_text),
+                max_tokens=300,
+                temperature=0.1
+            ):
+                emitted = True
+                yield chunk
+        except Exception as e:
+            logger.error(f"Hindi translation stream failed: {str(e)}")
+            # Fallback to original English text unless part of the Hindi text already went out
+            if not emitted:
+                yield english_text
+    
+    async def handle_audio_only(self, audio_filename: str) -> ChatResponse:
         logger.info(f"Executing audio-only workflow for file: {audio_filename}")
         
         try:
-            # Initialize services
-            chat_service = cls()
-            translation_agent = TranslationAgent()
-            
             # Process audio through translation pipeline
             audio_path = os.path.join("output", audio_filename)
-            translation_result = await translation_agent.process_audio(audio_path)
+            translation_result = await self.translation_agent.process_audio(audio_path)
             
             if translation_result.get("success", False):
                 logger.info(f"🔄 Translation successful, processing with Main Agent...")
                 
                 # Process with Main Agent
-                main_agent = MainAgent()
-                agent_response = await main_agent.process_query(translation_result, image_path=None)
+                agent_response = await self.main_agent.process_query(translation_result, image_path=None)
                 
                 logger.info(f"📝 Main Agent processing complete for audio-only workflow")
                 
                 # Translate response back to Hindi since translation agent was used
-                hindi_text = await chat_service.translate_to_hindi(agent_response.text)
+                hindi_text = await self.translate_to_hindi(agent_response.text)
                 
                 # Create new response with Hindi translation
                 from app.schemas.chat import ResponseContent
@@ -115,32 +145,26 @@ Hindi translation:"""
         logger.debug(f"Audio-only workflow result: {result}")
         return result
     
-    @classmethod
-    async def handle_audio_with_image(cls, audio_filename: str, image_filename: str) -> ChatResponse:
+    async def handle_audio_with_image(self, audio_filename: str, image_filename: str) -> ChatResponse:
         logger.info(f"Executing audio+image workflow - Audio: {audio_filename}, Image: {image_filename}")
         
         try:
-            # Initialize services
-            chat_service = cls()
-            translation_agent = TranslationAgent()
-            
             # Process audio through translation pipeline
             audio_path = os.path.join("output", audio_filename)
-            translation_result = await translation_agent.process_audio(audio_path)
+            translation_result = await self.translation_agent.process_audio(audio_path)
             
             if translation_result.get("success", False):
                 logger.info(f"🔄 Translation successful for audio+image workflow")
                 logger.info(f"🤖 Processing with Main Agent...")
                 
                 # Process with Main Agent
-                main_agent = MainAgent()
                 image_path = os.path.join("output", image_filename)
-                agent_response = await main_agent.process_query(translation_result, image_path)
+                agent_response = await self.main_agent.process_query(translation_result, image_path)
                 
                 logger.info(f"📝 Main Agent processing complete")
                 
                 # Translate response back to Hindi since translation agent was used
-                hindi_text = await chat_service.translate_to_hindi(agent_response.text)
+                hindi_text = await self.translate_to_hindi(agent_response.text)
                 
                 # Create new response with Hindi translation
                 from app.schemas.chat import ResponseContent
@@ -167,28 +191,20 @@ Hindi translation:"""
         logger.debug(f"Audio+image workflow result: {result}")
         return result
     
-    @classmethod
-    async def handle_text_only(cls, text: str) -> ChatResponse:
+    async def handle_text_only(self, text: str) -> ChatResponse:
         logger.info(f"Executing text-only workflow for query: '{text[:50]}...'")
         
         try:
-            # Create translation result for text input
-            translation_result = {
-                "success": True,
-                "original_transcription": text,
-                "translation": text,  # Assume text is already in English
-                "agricultural_terms": [],
-                "confidence": "High",
-                "reasoning": "Direct text input"
-            }
-            
-            # Process with Main Agent
-            logger.info(f"🤖 Processing text-only with Main Agent...")
-            main_agent = MainAgent()
-            agent_response = await main_agent.process_query(translation_result, image_path=None)
-            
-            logger.info(f"📝 Main Agent processing complete for text-only workflow")
-            response_content = agent_response
+            if self.response_cache is not None:
+                cache_key = ResponseCache.make_key(text)
+                cached, cache_status = await self.response_cache.get_or_compute(
+                    cache_key,
+                    lambda: self._compute_text_only(text)
+                )
+                logger.info(f"📦 Text-only response cache: {cache_status}")
+                response_content = ResponseContent(**cached)
+            else:
+                response_content, _ = await self._run_text_only(text)
         
         except Exception as e:
             logger.error(f"❌ Error in text-only workflow: {str(e)}")
@@ -203,26 +219,32 @@ Hindi translation:"""
         logger.debug(f"Text-only workflow result: {result}")
         return result
     
-    @classmethod
-    async def handle_text_with_image(cls, text: str, image_filename: str) -> ChatResponse:
+    async def _run_text_only(self, text: str):
+        translation_result = self._text_translation_result(text)
+        
+        # Process with Main Agent
+        logger.info(f"🤖 Processing text-only with Main Agent...")
+        agent_response, trace = await self.main_agent.process_query_with_trace(translation_result, image_path=None)
+        
+        logger.info(f"📝 Main Agent processing complete for text-only workflow")
+        return agent_response, trace
+    
+    async def _compute_text_only(self, text: str):
+        """Agent response as a cacheable payload plus its TTL (0 when any step fell back)"""
+        agent_response, trace = await self._run_text_only(text)
+        ttl_seconds = 0.0 if trace.get("degraded") else self.response_cache.ttl_for(trace.get("intents", []))
+        return agent_response.dict(), ttl_seconds
+    
+    async def handle_text_with_image(self, text: str, image_filename: str) -> ChatResponse:
         logger.info(f"Executing text+image workflow - Text: '{text[:50]}...', Image: {image_filename}")
         
         try:
-            # Create translation result for text input
-            translation_result = {
-                "success": True,
-                "original_transcription": text,
-                "translation": text,  # Assume text is already in English
-                "agricultural_terms": [],
-                "confidence": "High",
-                "reasoning": "Direct text input"
-            }
+            translation_result = self._text_translation_result(text)
             
             # Process with Main Agent
             logger.info(f"🤖 Processing text+image with Main Agent...")
-            main_agent = MainAgent()
             image_path = os.path.join("output", image_filename)
-            agent_response = await main_agent.process_query(translation_result, image_path)
+            agent_response = await self.main_agent.process_query(translation_result, image_path)
             
             logger.info(f"📝 Main Agent processing complete")
             response_content = agent_response
@@ -239,4 +261,117 @@ Hindi translation:"""
         )
         
         logger.debug(f"Text+image workflow result: {result}")
-        return result
\ No newline at end of file
+        return result
+    
+    async def stream_text(self, text: str,
+                          image_filename: Optional[str] = None) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Progress events for process-text: ("intent"), ("tool") per tool answer,
+        then ("done") carrying the same response payload the non-streaming
+        endpoint returns. The English answer is assembled from the tool
+        results rather than generated, so there are no "token" events; a
+        cache hit emits only "done". Text-only queries are served from, and
+        stored in, the response cache.
+        """
+        workflow_type = WorkflowType.TEXT_WITH_IMAGE if image_filename else WorkflowType.TEXT_ONLY
+        logger.info(f"Streaming {workflow_type.value} workflow for query: '{text[:50]}...'")
+        
+        cache_key = None
+        if self.response_cache is not None and not image_filename:
+            cache_key = ResponseCache.make_key(text)
+            cached = await self.response_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"📦 Text-only response cache: hit")
+                yield "done", {"success": True, "workflow_type": workflow_type.value, "response": cached, "cache": "hit"}
+                return
+        
+        translation_result = self._text_translation_result(text)
+        image_path = os.path.join("output", image_filename) if image_filename else None
+        
+        response_content = None
+        async for event, data in self._stream_agent(translation_result, image_path):
+            if event == "response":
+                response_content = data["response"]
+                trace = data["trace"]
+            else:
+                yield event, data
+        
+        if response_content is None:
+            response_content = DemoContentService.select_demo_response(workflow_type)
+        elif cache_key is not None:
+            ttl_seconds = 0.0 if trace.get("degraded") else self.response_cache.ttl_for(trace.get("intents", []))
+            await self.response_cache.set(cache_key, response_content.dict(), ttl_seconds)
+        
+        yield "done", {
+            "success": True,
+            "workflow_type": workflow_type.value,
+            "response": response_content.dict(),
+            "cache": "miss" if cache_key is not None else None
+        }
+    
+    async def stream_audio(self, audio_filename: str,
+                           image_filename: Optional[str] = None) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Event stream for process-audio: ("transcript") once speech is transcribed,
+        ("translation") with the enhanced English query, ("intent"), ("tool")
+        per tool answer, ("token") chunks of the Hindi answer as it is
+        translated, then ("done") with the full response payload. Fallback
+        demo answers have nothing to translate and arrive only in "done".
+        """
+        workflow_type = WorkflowType.AUDIO_WITH_IMAGE if image_filename else WorkflowType.AUDIO_ONLY
+        logger.info(f"Streaming {workflow_type.value} workflow - Audio: {audio_filename}, Image: {image_filename}")
+        
+        audio_path = os.path.join("output", audio_filename)
+        translation_result = None
+        async for event, data in self.translation_agent.process_audio_stream(audio_path):
+            if event == "translation":
+                translation_result = data
+            else:
+                yield event, data
+        
+        if not translation_result or not translation_result.get("success", False):
+            logger.warning(f"⚠️  Translation failed, using fallback demo content")
+            response_content = DemoContentService.select_demo_response(workflow_type)
+            yield "done", {"success": True, "workflow_type": workflow_type.value, "response": response_content.dict()}
+            return
+        
+        yield "translation", {
+            "translation": translation_result.get("translation", ""),
+            "agricultural_terms": translation_result.get("agricultural_terms", []),
+            "confidence": translation_result.get("confidence")
+        }
+        
+        image_path = os.path.join("output", image_filename) if image_filename else None
+        agent_response = None
+        async for event, data in self._stream_agent(translation_result, image_path):
+            if event == "response":
+                agent_response = data["response"]
+            else:
+                yield event, data
+        
+        if agent_response is None:
+            response_content = DemoContentService.select_demo_response(workflow_type)
+        else:
+            # Translate response back to Hindi since translation agent was used
+            hindi_parts = []
+            async for chunk in self.translate_to_hindi_stream(agent_response.text):
+                hindi_parts.append(chunk)
+                yield "token", {"text": chunk}
+            
+            response_content = ResponseContent(
+                text="".join(hindi_parts).strip(),
+                website_url=agent_response.website_url,
+                website_title=agent_response.website_title
+            )
+        
+        yield "done", {"success": True, "workflow_type": workflow_type.value, "response": response_content.dict()}
+    
+    async def _stream_agent(self, translation_result: Dict[str, Any],
+                            image_path: Optional[str]) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Main Agent events; a crash surfaces as an "error" event and no "response" """
+        try:
+            async for event, data in self.main_agent.process_query_stream(translation_result, image_path):
+                yield event, data
+        except Exception as e:
+            logger.error(f"❌ Error in streaming workflow: {str(e)}")
+            yield "error", {"error": str(e)}
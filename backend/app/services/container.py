@@ -0,0 +1,119 @@
+import asyncio
+from typing import List, Optional
+
+from fastapi import Request
+
+from app.core.config import settings
+from app.utils.logger import get_logger
+from app.services.openai_client import close_async_openai_client
+from app.services.gpu_client import close_gpu_client
+from app.services.tools.vlm_tool import VLMTool
+from app.services.tools.kcc_tool import KCCTool
+from app.services.tools.kcc_cultural_tool import KCCCulturalTool
+from app.services.tools.lstm_price_tool import LSTMPriceTool
+from app.services.tools.govt_scheme_rag_tool import (
+    GovtSchemeRAGTool,
+    get_lexical_index,
+    run_blocking,
+    shutdown_rag_executor
+)
+from app.services.agents.translation_agent import TranslationAgent
+from app.services.agents.dharti_main_agent import MainAgent
+from app.services.chat_processing_service import ChatProcessingService
+from app.services.twilio_service import TwilioService
+from app.services.response_cache import ResponseCache, SQLiteResponseStore
+
+logger = get_logger(__name__)
+
+
+class ServiceContainer:
+    """
+    Application-scoped agent/tool graph.
+
+    Built once in the FastAPI lifespan hook and shared by every request, so
+    clients, connection pools and model caches stay warm between requests.
+    """
+
+    def __init__(self):
+        self.vlm_tool = VLMTool()
+        self.kcc_tool = KCCTool()
+        self.kcc_cultural_tool = KCCCulturalTool()
+        self.lstm_tool = LSTMPriceTool()
+        self.govt_scheme_tool = GovtSchemeRAGTool()
+
+        self.translation_agent = TranslationAgent()
+        self.main_agent = MainAgent(
+            vlm_tool=self.vlm_tool,
+            kcc_tool=self.kcc_tool,
+            kcc_cultural_tool=self.kcc_cultural_tool,
+            lstm_tool=self.lstm_tool,
+            govt_scheme_tool=self.govt_scheme_tool
+        )
+        self.response_cache = build_response_cache()
+        self.chat_service = ChatProcessingService(self.translation_agent, self.main_agent, self.response_cache)
+        self.twilio_service = TwilioService(self.translation_agent, self.main_agent)
+
+        self._background_tasks: List[asyncio.Task] = []
+
+        logger.info("✅ Service container initialized")
+
+    async def start(self) -> None:
+        """Warm caches and start background jobs (called from the lifespan hook)."""
+        try:
+            await self.lstm_tool.warm_up()
+            await self.lstm_tool.refresh_forecasts()
+        except Exception as e:
+            logger.error(f"Initial forecast precompute failed: {str(e)}")
+
+        # Build the BM25 side of hybrid scheme retrieval before the first search
+        await run_blocking(get_lexical_index)
+
+        self._background_tasks.append(asyncio.create_task(self.lstm_tool.run_daily_refresh()))
+
+    async def aclose(self) -> None:
+        """Stop background jobs and release shared network resources on shutdown."""
+        for task in self._background_tasks:
+            task.cancel()
+        await asyncio.gather(*self._background_tasks, return_exceptions=True)
+        self._background_tasks.clear()
+
+        await close_async_openai_client()
+        await close_gpu_client()
+        shutdown_rag_executor()
+        if self.response_cache is not None:
+            self.response_cache.close()
+        logger.info("Service container closed")
+
+
+def build_response_cache() -> Optional[ResponseCache]:
+    """Text-chat response cache from settings, or None when disabled."""
+    if not settings.chat_response_cache_enabled:
+        return None
+
+    store = None
+    if settings.chat_response_cache_db_path:
+        try:
+            store = SQLiteResponseStore(settings.chat_response_cache_db_path)
+        except Exception as e:
+            logger.error(f"Chat response store unavailable, using in-process cache only: {str(e)}")
+
+    return ResponseCache(
+        settings.chat_response_cache_ttls,
+        max_size=settings.chat_response_cache_size,
+        store=store
+    )
+
+
+def get_services(request: Request) -> ServiceContainer:
+    """Dependency returning the application-scoped service container."""
+    return request.app.state.services
+
+
+def get_chat_service(request: Request) -> ChatProcessingService:
+    """Dependency returning the shared chat processing service."""
+    return get_services(request).chat_service
+
+
+def get_twilio_service(request: Request) -> TwilioService:
+    """Dependency returning the Twilio service wired to the shared agents."""
+    return get_services(request).twilio_service
@@ -0,0 +1,82 @@
+import asyncio
+from typing import Any, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Gateway errors from the GPU server's reverse proxy are worth another attempt
+RETRYABLE_STATUS_CODES = {502, 503, 504}
+
+# Failures where the request never reached the model server
+RETRYABLE_EXCEPTIONS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError)
+
+# Global cached GPU server client (one keep-alive pool per worker process)
+_cached_gpu_client: Optional[httpx.AsyncClient] = None
+
+
+def _http2_available() -> bool:
+    if not settings.gpu_http2:
+        return False
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        logger.warning("h2 package not installed, GPU server client falling back to HTTP/1.1")
+        return False
+
+
+def get_gpu_client() -> httpx.AsyncClient:
+    """Get the shared, long-lived httpx client used for all GPU server calls."""
+    global _cached_gpu_client
+
+    if _cached_gpu_client is None:
+        _cached_gpu_client = httpx.AsyncClient(
+            timeout=settings.gpu_timeout_seconds,
+            http2=_http2_available(),
+            limits=httpx.Limits(
+                max_connections=settings.gpu_max_connections,
+                max_keepalive_connections=settings.gpu_max_keepalive_connections,
+                keepalive_expiry=settings.gpu_keepalive_expiry_seconds
+            )
+        )
+        logger.info("✅ GPU server HTTP client cached successfully")
+
+    return _cached_gpu_client
+
+
+async def gpu_request(method: str, url: str, **kwargs: Any) -> httpx.Response:
+    """
+    Send a request to the GPU server through the shared client.
+
+    Connection failures and gateway errors are retried with exponential
+    backoff; read timeouts are not, since the model may still be working.
+    """
+    client = get_gpu_client()
+    max_retries = settings.gpu_max_retries
+
+    for attempt in range(max_retries + 1):
+        try:
+            response = await client.request(method, url, **kwargs)
+            if response.status_code not in RETRYABLE_STATUS_CODES or attempt == max_retries:
+                return response
+            logger.warning(f"GPU server returned HTTP {response.status_code} for {url}, retrying...")
+        except RETRYABLE_EXCEPTIONS as e:
+            if attempt == max_retries:
+                raise
+            logger.warning(f"GPU server request failed ({type(e).__name__}) for {url}, retrying...")
+
+        await asyncio.sleep(settings.gpu_retry_backoff_seconds * (2 ** attempt))
+
+
+async def close_gpu_client() -> None:
+    """Close the shared GPU server client (called on application shutdown)."""
+    global _cached_gpu_client
+
+    if _cached_gpu_client is not None:
+        await _cached_gpu_client.aclose()
+        _cached_gpu_client = None
+        logger.info("GPU server HTTP client closed")
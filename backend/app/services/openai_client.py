@@ -0,0 +1,87 @@
+import asyncio
+from typing import Any, AsyncIterator, Optional
+
+import httpx
+from openai import AsyncOpenAI
+
+from app.core.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Global cached async client and concurrency limiter (one per worker process)
+_cached_async_client: Optional[AsyncOpenAI] = None
+_llm_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """Get the shared AsyncOpenAI client, reusing one keep-alive connection pool per process."""
+    global _cached_async_client
+
+    if _cached_async_client is None:
+        http_client = httpx.AsyncClient(
+            timeout=settings.openai_timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=settings.openai_max_connections,
+                max_keepalive_connections=settings.openai_max_connections
+            )
+        )
+        _cached_async_client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            timeout=settings.openai_timeout_seconds,
+            max_retries=settings.openai_max_retries,
+            http_client=http_client
+        )
+        logger.info("✅ Async OpenAI client cached successfully")
+
+    return _cached_async_client
+
+
+def _get_llm_semaphore() -> asyncio.Semaphore:
+    global _llm_semaphore
+
+    if _llm_semaphore is None:
+        _llm_semaphore = asyncio.Semaphore(settings.openai_max_concurrency)
+
+    return _llm_semaphore
+
+
+async def chat_completion(timeout: Optional[float] = None, **kwargs) -> Any:
+    """
+    Run a chat completion on the shared async client.
+
+    Calls are bounded by the process-wide semaphore so a traffic spike cannot
+    open more in-flight requests than `openai_max_concurrency`.
+    """
+    async with _get_llm_semaphore():
+        return await get_async_openai_client().chat.completions.create(
+            timeout=timeout or settings.openai_timeout_seconds,
+            **kwargs
+        )
+
+
+async def chat_completion_stream(timeout: Optional[float] = None, **kwargs) -> AsyncIterator[str]:
+    """
+    Streaming chat completion yielding content deltas as they arrive.
+
+    Holds a concurrency slot for the whole stream, like chat_completion.
+    """
+    async with _get_llm_semaphore():
+        stream = await get_async_openai_client().chat.completions.create(
+            timeout=timeout or settings.openai_timeout_seconds,
+            stream=True,
+            **kwargs
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+async def close_async_openai_client() -> None:
+    """Close the shared client's connection pool (called on application shutdown)."""
+    global _cached_async_client
+
+    if _cached_async_client is not None:
+        await _cached_async_client.close()
+        _cached_async_client = None
+        logger.info("Async OpenAI client closed")
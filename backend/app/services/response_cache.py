@@ -0,0 +1,214 @@
+"""
+End-to-end response cache for the text-only chat workflow.
+
+Keys are the normalized query text (text chat always answers in English);
+the TTL of each entry comes from the intent(s) DHARTI routed the query to,
+so price answers go stale quickly while variety and scheme answers are
+reused for hours. Lookups hit an in-process LRU first and, when configured, a SQLite
+file shared by every worker on the host. Identical concurrent misses are
+coalesced so only one of them runs the agent.
+"""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from app.utils.cache import TTLCache, normalize_query_text
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class SQLiteResponseStore:
+    """Shared key -> JSON value store with wall-clock expiry."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=5.0)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+        logger.info(f"✅ Chat response store opened at {self.db_path}")
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """Return (value, remaining_ttl_seconds) for a live entry, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        remaining = row[1] - time.time()
+        if remaining <= 0:
+            return None
+        return json.loads(row[0]), remaining
+
+    def set(self, key: str, value: Dict[str, Any], ttl_seconds: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), time.time() + ttl_seconds)
+            )
+            self._conn.commit()
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM responses WHERE expires_at < ?", (time.time(),))
+            self._conn.commit()
+        return cursor.rowcount
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class ResponseCache:
+    """
+    Two-level (process LRU, optional SQLite) cache of chat response payloads.
+
+    `intent_ttls` maps an intent to its TTL in seconds; a response routed to
+    several intents uses the shortest one, and a TTL of 0 (or an intent
+    missing from the table) means the response is not cached.
+    """
+
+    def __init__(self, intent_ttls: Dict[str, float], max_size: int = 4096,
+                 store: Optional[SQLiteResponseStore] = None):
+        self.intent_ttls = dict(intent_ttls)
+        self.memory = TTLCache(max_size=max_size, ttl_seconds=max(self.intent_ttls.values(), default=0.0))
+        self.store = store
+        self._in_flight: Dict[str, asyncio.Task] = {}
+
+        self.lookups = 0
+        self.memory_hits = 0
+        self.store_hits = 0
+        self.coalesced = 0
+        self.stored = 0
+        self.not_cacheable = 0
+
+    @staticmethod
+    def make_key(text: str) -> str:
+        digest = hashlib.sha256(normalize_query_text(text).encode("utf-8")).hexdigest()
+        return f"chat:{digest[:40]}"
+
+    def ttl_for(self, intents: Iterable[str]) -> float:
+        ttls = [self.intent_ttls.get(intent, 0.0) for intent in intents]
+        return min(ttls) if ttls else 0.0
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        self.lookups += 1
+        value = self.memory.get(key)
+        if value is not None:
+            self.memory_hits += 1
+            return value
+
+        if self.store is not None:
+            try:
+                found = await asyncio.to_thread(self.store.get, key)
+            except Exception as e:
+                logger.warning(f"Chat response store read failed: {str(e)}")
+                found = None
+            if found is not None:
+                value, remaining = found
+                # Promote into the process cache for the entry's remaining lifetime
+                self.memory.set(key, value, ttl_seconds=remaining)
+                self.store_hits += 1
+                return value
+
+        return None
+
+    async def set(self, key: str, value: Dict[str, Any], ttl_seconds: float) -> None:
+        if ttl_seconds <= 0:
+            self.not_cacheable += 1
+            return
+        self.stored += 1
+        self.memory.set(key, value, ttl_seconds=ttl_seconds)
+        if self.store is not None:
+            try:
+                await asyncio.to_thread(self.store.set, key, value, ttl_seconds)
+            except Exception as e:
+                logger.warning(f"Chat response store write failed: {str(e)}")
+
+    async def get_or_compute(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Tuple[Dict[str, Any], float]]]
+    ) -> Tuple[Dict[str, Any], str]:
+        """
+        Return (value, cache_status) where cache_status is "hit", "coalesced"
+        or "miss". `compute` returns (value, ttl_seconds); a TTL of 0 keeps the
+        value out of the cache.
+
+        The computation runs as its own task, so a client disconnecting does
+        not cancel it for the other waiters (or for the cache).
+        """
+        value = await self.get(key)
+        if value is not None:
+            return value, "hit"
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            status = "coalesced"
+        else:
+            status = "miss"
+            task = asyncio.get_running_loop().create_task(self._compute_and_store(key, compute))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+
+        return await asyncio.shield(task), status
+
+    async def _compute_and_store(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Tuple[Dict[str, Any], float]]]
+    ) -> Dict[str, Any]:
+        value, ttl_seconds = await compute()
+        await self.set(key, value, ttl_seconds)
+        return value
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark retrieved so a failure nobody awaited doesn't log "exception never retrieved"
+        if not task.cancelled():
+            task.exception()
+
+    async def clear(self) -> None:
+        self.memory.clear()
+        if self.store is not None:
+            await asyncio.to_thread(self.store.clear)
+
+    def close(self) -> None:
+        if self.store is not None:
+            self.store.close()
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.memory_hits + self.store_hits
+        return {
+            "lookups": self.lookups,
+            "hits": hits,
+            "memory_hits": self.memory_hits,
+            "store_hits": self.store_hits,
+            "coalesced": self.coalesced,
+            "hit_rate": round(hits / self.lookups, 4) if self.lookups else None,
+            "stored": self.stored,
+            "not_cacheable": self.not_cacheable,
+            "memory": self.memory.stats(),
+            "shared_store": str(self.store.db_path) if self.store is not None else None,
+            "intent_ttls": self.intent_ttls
+        }
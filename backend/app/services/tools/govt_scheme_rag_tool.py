@@ -1,58 +1,122 @@
 import os
+import json
 import time
-from typing import Dict, Any, List, Optional, Tuple
+import asyncio
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
+from typing import Dict, Any, List, Optional, Tuple, AsyncIterator
 from app.core.config import settings
 from app.utils.logger import get_logger
+from app.utils.cache import TTLCache, SemanticCache, normalize_query_text
+from app.utils.batching import MicroBatcher
+from app.services.tools.scheme_detail_store import get_detail_store
+from app.services.tools.scheme_bm25 import get_bm25_index, reciprocal_rank_fusion
+from app.services.tools.scheme_filters import FILTER_FIELDS, build_context_filter
+from app.services.tools.scheme_vector_store import get_local_index
 
 logger = get_logger(__name__)
 
 try:
-    from pinecone import Pinecone
     from langchain_google_genai import GoogleGenerativeAIEmbeddings, ChatGoogleGenerativeAI
-    PINECONE_AVAILABLE = True
+    GOOGLE_AI_AVAILABLE = True
+except ImportError:
+    logger.warning("Google AI dependencies not available. RAG functionality will be limited.")
+    GOOGLE_AI_AVAILABLE = False
+
+try:
+    from pinecone import Pinecone
+    PINECONE_CLIENT_AVAILABLE = True
 except ImportError:
-    logger.warning("Pinecone or Google AI dependencies not available. RAG functionality will be limited.")
-    PINECONE_AVAILABLE = False
+    PINECONE_CLIENT_AVAILABLE = False
+
+# RAG is usable when embeddings are available and the configured vector store can be reached
+PINECONE_AVAILABLE = GOOGLE_AI_AVAILABLE and (
+    PINECONE_CLIENT_AVAILABLE or settings.scheme_vector_backend == "local"
+)
+if GOOGLE_AI_AVAILABLE and not PINECONE_AVAILABLE:
+    logger.warning("Pinecone client not available. RAG functionality will be limited.")
 
 # Keep in sync with build_kb.py
 INDEX_NAME = "government-schemes-db"
 EMBED_MODEL = "models/embedding-001"
 
+# why_match snippets kept per scheme and their length
+MAX_WHY_MATCH = 3
+WHY_MATCH_CHARS = 240
+
+NO_SCHEMES_RESPONSE = "I couldn't find any matching government schemes for your query. Please try rephrasing your question or contact your local agriculture office for assistance."
+
 # Global cached clients
 _cached_index = None
 _cached_embeddings = None
 _cached_llm = None
+_embedding_batcher = None
+
+# Bounded pool for the blocking embedding / vector-store calls, so scheme
+# searches never run them on the event loop or starve the default executor
+_rag_executor = ThreadPoolExecutor(
+    max_workers=settings.scheme_rag_max_workers,
+    thread_name_prefix="scheme-rag"
+)
+
+# Response caches for recommend_with_rag, shared by every tool instance
+_exact_cache = TTLCache(
+    max_size=settings.scheme_exact_cache_size,
+    ttl_seconds=settings.scheme_cache_ttl_seconds
+)
+_semantic_cache = SemanticCache(
+    max_size=settings.scheme_semantic_cache_size,
+    ttl_seconds=settings.scheme_cache_ttl_seconds,
+    threshold=settings.scheme_semantic_cache_threshold
+)
+
+
+def get_pinecone_index():
+    """Open the hosted Pinecone index for the schemes corpus."""
+    api_key = settings.pinecone_api_key
+    if not api_key:
+        raise RuntimeError("PINECONE_API_KEY not set in settings")
+
+    pc = Pinecone(api_key=api_key)
+    return pc.Index(INDEX_NAME)
+
+
+def _load_vector_index():
+    """Vector store selected by settings.scheme_vector_backend (pinecone | local)."""
+    if settings.scheme_vector_backend == "local":
+        from app.services.tools.scheme_vector_store import require_local_index
+        # The same instance BM25 indexes; raises with build instructions when missing
+        return require_local_index()
+    return get_pinecone_index()
 
 
 def get_cached_clients() -> Tuple[Any, Any]:
-    """Get cached Pinecone index and Google embeddings clients."""
+    """Get cached vector index (Pinecone or local) and Google embeddings clients."""
     global _cached_index, _cached_embeddings
     
     if _cached_index is None or _cached_embeddings is None:
-        api_key = settings.pinecone_api_key
-        if not api_key:
-            raise RuntimeError("PINECONE_API_KEY not set in settings")
-
         google_api_key = settings.GOOGLE_API_KEY
         if not google_api_key:
             raise RuntimeError("GOOGLE_API_KEY not set in settings")
         
         os.environ["GOOGLE_API_KEY"] = google_api_key
 
-        pc = Pinecone(api_key=api_key)
-        _cached_index = pc.Index(INDEX_NAME)
+        _cached_index = _load_vector_index()
         
         _cached_embeddings = GoogleGenerativeAIEmbeddings(model=EMBED_MODEL)
-        logger.info("✅ Google embeddings and Pinecone clients cached successfully")
+        logger.info(f"✅ Google embeddings and {settings.scheme_vector_backend} vector index cached successfully")
     
     return _cached_index, _cached_embeddings
 
 
-def recommend(query: str, top_k: int = 30, top_n_schemes: int = 10) -> List[Dict[str, Any]]:
+def recommend(query: str, top_k: int = 30, top_n_schemes: int = 10,
+              query_embedding: Optional[List[float]] = None) -> List[Dict[str, Any]]:
     """
     Retrieve matching govt schemes for a free-text query using Google embeddings.
 
     Returns a list of unique schemes with minimal info and why-match snippets.
+    Pass `query_embedding` to reuse an embedding the caller already computed.
     """
     if not query or not str(query).strip():
         return []
@@ -61,75 +125,89 @@ def recommend(query: str, top_k: int = 30, top_n_schemes: int = 10) -> List[Dict
     index, embeddings = get_cached_clients()
     
     # Get query embedding using Google API
-    query_embedding = embeddings.embed_query(query)
+    if query_embedding is None:
+        query_embedding = embeddings.embed_query(query)
     
-    # Direct Pinecone query
-    response = index.query(
+    response = query_index(index, query_embedding, top_k)
+    return aggregate_matches(response.matches, top_n_schemes)
+
+
+def query_index(index, query_embedding: List[float], top_k: int,
+                metadata_filter: Optional[Dict[str, Any]] = None):
+    """Vector query (Pinecone or the local index, same interface)."""
+    return index.query(
         vector=query_embedding,
         top_k=top_k,
         include_metadata=True,
-        namespace="default"
+        namespace="default",
+        filter=metadata_filter
     )
-    
-    # Convert Pinecone results to our format
-    hits = []
-    for match in response.matches:
-        # Create a mock document object to match the original structure
-        class MockDoc:
-            def __init__(self, content, metadata):
-                self.page_content = content
-                self.metadata = metadata
-        
-        # Extract content from the 'text' field in metadata
-        content = match.metadata.get('text', '') or ''
-        
-        doc = MockDoc(content, match.metadata)
-        score = float(match.score)
-        hits.append((doc, score))
 
-    # Aggregate to unique schemes by first/highest-ranked hit
-    by_scheme: Dict[str, Dict[str, Any]] = {}
-    for doc, score in hits:
-        sid = doc.metadata.get("scheme_id") or ""
+
+class SchemeHit:
+    """Per-scheme accumulator for aggregate_matches()."""
+
+    __slots__ = ("id", "name", "url", "score", "sections", "section_content", "why_match")
+
+    def __init__(self, scheme_id: str, metadata: Dict[str, Any], score: float):
+        self.id = scheme_id
+        self.name = metadata.get("scheme_name") or ""
+        self.url = metadata.get("url") or ""
+        self.score = score
+        self.sections: set = set()
+        self.section_content: Dict[str, str] = {}
+        self.why_match: List[str] = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "url": self.url,
+            "score": self.score,
+            "sections": sorted(self.sections),
+            "section_content": self.section_content,
+            "why_match": self.why_match,
+        }
+
+
+def aggregate_matches(matches, top_n_schemes: int) -> List[Dict[str, Any]]:
+    """
+    Collapse chunk-level vector matches into unique schemes, best first.
+
+    One pass over the raw matches: each scheme keeps its best score, its
+    sections with their full text, and up to MAX_WHY_MATCH distinct snippets.
+    The top `top_n_schemes` are then picked with a bounded heap (ties keep
+    retrieval order).
+    """
+    by_scheme: Dict[str, SchemeHit] = {}
+    for match in matches:
+        metadata = match.metadata
+        sid = metadata.get("scheme_id")
         if not sid:
             continue
-        if sid not in by_scheme:
-            by_scheme[sid] = {
-                "id": sid,
-                "name": doc.metadata.get("scheme_name") or "",
-                "url": doc.metadata.get("url") or "",
-                "score": score,
-                "sections": set(),
-                "section_content": {},
-                "why_match": [],
-            }
-        entry = by_scheme[sid]
-        try:
-            entry["score"] = max(entry["score"], score)
-        except Exception:
-            entry["score"] = score
-        section = doc.metadata.get("section")
+
+        score = float(match.score)
+        entry = by_scheme.get(sid)
+        if entry is None:
+            entry = by_scheme[sid] = SchemeHit(sid, metadata, score)
+        elif score > entry.score:
+            entry.score = score
+
+        content = (metadata.get("text") or "").strip()
+        section = metadata.get("section")
         if section:
-            entry["sections"].add(section)
+            entry.sections.add(section)
             # Store the full content for each section
-            content = (doc.page_content or "").strip()
             if content:
-                entry["section_content"][section] = content
-        content = (doc.page_content or "").strip().replace("\n", " ")
-        if content:
-            entry["why_match"].append(content[:240])
+                entry.section_content[section] = content
 
-    results = []
-    for v in by_scheme.values():
-        v["sections"] = sorted(list(v["sections"]))
-        results.append(v)
+        if content and len(entry.why_match) < MAX_WHY_MATCH:
+            snippet = content[:WHY_MATCH_CHARS].replace("\n", " ")
+            if snippet not in entry.why_match:
+                entry.why_match.append(snippet)
 
-    try:
-        results.sort(key=lambda x: x.get("score", 0.0), reverse=True)
-    except Exception:
-        pass
-
-    return results[:top_n_schemes]
+    top = heapq.nlargest(top_n_schemes, by_scheme.values(), key=attrgetter("score"))
+    return [entry.to_dict() for entry in top]
 
 
 def search_schemes(query: str, top_k: int = 30) -> List[Dict[str, Any]]:
@@ -154,8 +232,8 @@ def get_cached_llm():
     return _cached_llm
 
 
-def generate_rag_response(query: str, retrieved_schemes: List[Dict], llm) -> str:
-    """Generate natural language response using retrieved schemes"""
+def build_rag_prompt(query: str, retrieved_schemes: List[Dict]) -> str:
+    """Gemini prompt grounding the answer in the top retrieved schemes"""
     
     # Build context from retrieved schemes
     context_parts = []
@@ -199,38 +277,350 @@ def generate_rag_response(query: str, retrieved_schemes: List[Dict], llm) -> str
 
                 Response:"""
 
+    return prompt
+
+
+async def generate_rag_response(query: str, retrieved_schemes: List[Dict], llm) -> str:
+    """Generate natural language response using retrieved schemes (raises on LLM failure)"""
+    prompt = build_rag_prompt(query, retrieved_schemes)
+
+    # Generate response using Gemini (native async client)
+    response = await llm.ainvoke(prompt)
+    return response.content if hasattr(response, 'content') else str(response)
+
+
+async def stream_rag_response(query: str, retrieved_schemes: List[Dict], llm) -> AsyncIterator[str]:
+    """Yield the generated response text chunk by chunk as Gemini produces it"""
+    prompt = build_rag_prompt(query, retrieved_schemes)
+
+    async for chunk in llm.astream(prompt):
+        text = chunk.content if hasattr(chunk, 'content') else str(chunk)
+        if text:
+            yield text
+
+
+def _generation_failed_response(retrieved_schemes: List[Dict], error: Exception) -> str:
+    return f"I found {len(retrieved_schemes)} relevant schemes, but I'm having trouble generating a detailed response. Please check the scheme details below. Error: {str(error)}"
+
+
+def _cache_keys(query: str, top_k: Optional[int], top_n_schemes: int,
+                metadata_filter: Optional[Dict[str, Any]]) -> Tuple[tuple, tuple]:
+    """(exact-tier key, semantic-tier scope) for a request."""
+    filter_key = json.dumps(metadata_filter, sort_keys=True) if metadata_filter else None
+    scope = (top_k, top_n_schemes, filter_key)
+    return (normalize_query_text(query),) + scope, scope
+
+
+def get_cached_result(query: str, top_k: Optional[int] = None, top_n_schemes: int = 3,
+                      metadata_filter: Optional[Dict[str, Any]] = None) -> Optional[Dict]:
+    """Exact-tier cache lookup only (no network calls)."""
+    if not settings.scheme_cache_enabled:
+        return None
+    exact_key, _ = _cache_keys(query, top_k, top_n_schemes, metadata_filter)
+    cached = _exact_cache.get(exact_key)
+    if cached is None:
+        return None
+    return {**cached, "query": query, "cache": "exact"}
+
+
+async def run_blocking(func, *args):
+    """Run a blocking RAG call on the bounded RAG thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_rag_executor, func, *args)
+
+
+def shutdown_rag_executor() -> None:
+    _rag_executor.shutdown(wait=False, cancel_futures=True)
+
+
+def embed_queries(queries: List[str]) -> List[List[float]]:
+    """Embed many queries in one batched call (same task type as embed_query)."""
+    _, embeddings = get_cached_clients()
+    return embeddings.embed_documents(queries, task_type="RETRIEVAL_QUERY")
+
+
+def get_lexical_index():
+    """BM25 index used for hybrid retrieval, or None (dense mode / no local chunk corpus)."""
+    if settings.scheme_retrieval_mode != "hybrid":
+        return None
     try:
-        # Generate response using Gemini
-        response = llm.invoke(prompt)
-        return response.content if hasattr(response, 'content') else str(response)
+        return get_bm25_index()
     except Exception as e:
-        return f"I found {len(retrieved_schemes)} relevant schemes for your query, but I'm having trouble generating a detailed response right now. Please check the scheme details directly or contact your local agriculture office. Error: {str(e)}"
+        logger.error(f"BM25 index unavailable: {str(e)}")
+        return None
+
+
+def context_filter_fields() -> frozenset:
+    """
+    Farmer-context metadata fields the scheme index carries: the configured
+    list for a remote index, else the local index manifest columns.
+    """
+    if settings.scheme_context_filter_fields:
+        configured = (field.strip() for field in settings.scheme_context_filter_fields.split(","))
+        return frozenset(field for field in configured if field in FILTER_FIELDS)
+    local_index = get_local_index()
+    if local_index is None:
+        return frozenset()
+    return frozenset(field for field in FILTER_FIELDS if field in local_index.columns)
+
+
+def _embed_query(query: str) -> List[float]:
+    _, embeddings = get_cached_clients()
+    return embeddings.embed_query(query)
+
+
+async def _embed_batch(queries: List[str]) -> List[List[float]]:
+    return await run_blocking(embed_queries, queries)
+
+
+def get_embedding_batcher() -> MicroBatcher:
+    """Process-wide coalescer for single-query embeddings."""
+    global _embedding_batcher
+
+    if _embedding_batcher is None:
+        _embedding_batcher = MicroBatcher(
+            _embed_batch,
+            max_batch_size=settings.scheme_embed_max_batch,
+            max_wait_seconds=settings.scheme_embed_batch_window_ms / 1000.0
+        )
+    return _embedding_batcher
+
+
+async def embed_query_coalesced(query: str) -> List[float]:
+    """
+    Embed one query, sharing a batched Google call with queries that arrive
+    within the batching window (identical in-flight queries are embedded once).
+    """
+    if not settings.scheme_embed_batching_enabled:
+        return await run_blocking(_embed_query, query)
+    return await get_embedding_batcher().submit(query)
+
+
+def _finish(query: str, result: Dict, cache_status: str, timings: Dict[str, float]) -> Dict:
+    return {
+        **result,
+        "query": query,
+        "cache": cache_status,
+        "timings": {stage: round(seconds, 4) for stage, seconds in timings.items()}
+    }
+
+
+async def _lookup_or_retrieve(query: str, top_k: Optional[int], top_n_schemes: int,
+                              query_embedding: Optional[List[float]],
+                              timings: Dict[str, float],
+                              metadata_filter: Optional[Dict[str, Any]] = None) -> Tuple[str, Optional[Dict], List[Dict], Optional[List[float]]]:
+    """
+    Cache lookups, then retrieval on a miss.
+
+    `top_k` is the chunk depth per retriever; None uses scheme_hybrid_top_k
+    when BM25 is fused in and scheme_top_k otherwise (the cache keys on the
+    requested value, so None is one "default depth" entry).
+
+    Returns (cache_status, cached_result, retrieved_schemes, query_embedding);
+    cached_result is set on an exact or semantic hit, otherwise the schemes
+    and the embedding used for retrieval are returned.
+    """
+    cache_enabled = settings.scheme_cache_enabled
+    exact_key, scope = _cache_keys(query, top_k, top_n_schemes, metadata_filter)
 
+    if cache_enabled:
+        cached = _exact_cache.get(exact_key)
+        if cached is not None:
+            return "exact", cached, cached["schemes"], None
 
-def recommend_with_rag(query: str, top_k: int = 30, top_n_schemes: int = 3) -> Dict:
-    """Complete RAG pipeline: Retrieve + Generate"""
+    if not query or not str(query).strip():
+        return "miss", None, [], None
+
+    lexical_index = await run_blocking(get_lexical_index)
+    depth = top_k or (settings.scheme_hybrid_top_k if lexical_index is not None else settings.scheme_top_k)
+
+    try:
+        index, _ = await run_blocking(get_cached_clients)
+
+        if query_embedding is None:
+            stage_start = time.perf_counter()
+            query_embedding = await embed_query_coalesced(query)
+            timings["embed"] = time.perf_counter() - stage_start
+
+        if cache_enabled:
+            match = _semantic_cache.get(query_embedding, scope=scope)
+            if match is not None:
+                cached, similarity = match
+                logger.info(f"Semantic cache hit (similarity {similarity:.3f})")
+                _exact_cache.set(exact_key, cached)
+                return "semantic", cached, cached["schemes"], query_embedding
+        
+        # Step 1: Retrieve (dense, fused with BM25 when the lexical index is available)
+        stage_start = time.perf_counter()
+        if lexical_index is not None:
+            dense_response, lexical_matches = await asyncio.gather(
+                run_blocking(query_index, index, query_embedding, depth, metadata_filter),
+                run_blocking(lexical_index.search, query, depth, metadata_filter)
+            )
+            matches = reciprocal_rank_fusion(
+                [dense_response.matches, lexical_matches],
+                depth,
+                k=settings.scheme_rrf_k
+            )
+        else:
+            matches = (await run_blocking(query_index, index, query_embedding, depth, metadata_filter)).matches
+        timings["retrieve"] = time.perf_counter() - stage_start
+    except Exception as e:
+        if lexical_index is None:
+            raise
+        # Degraded mode: embedding service or vector store down, BM25 only (not cached)
+        logger.warning(f"Dense retrieval unavailable, using lexical retrieval only: {str(e)}")
+        stage_start = time.perf_counter()
+        matches = await run_blocking(lexical_index.search, query, depth, metadata_filter)
+        timings["retrieve"] = time.perf_counter() - stage_start
+        query_embedding = None
+
+    stage_start = time.perf_counter()
+    retrieved_schemes = aggregate_matches(matches, top_n_schemes)
+    timings["aggregate"] = time.perf_counter() - stage_start
+
+    return "miss", None, retrieved_schemes, query_embedding
+
+
+def _store_answer(query: str, top_k: Optional[int], top_n_schemes: int,
+                  query_embedding: Optional[List[float]], result: Dict,
+                  metadata_filter: Optional[Dict[str, Any]] = None) -> None:
+    if not settings.scheme_cache_enabled or query_embedding is None:
+        return
+    exact_key, scope = _cache_keys(query, top_k, top_n_schemes, metadata_filter)
+    _exact_cache.set(exact_key, result)
+    _semantic_cache.set(query_embedding, result, scope=scope)
+
+
+async def recommend_with_rag(query: str, top_k: Optional[int] = None, top_n_schemes: int = 3,
+                             query_embedding: Optional[List[float]] = None,
+                             generate: bool = True,
+                             metadata_filter: Optional[Dict[str, Any]] = None) -> Dict:
+    """
+    Complete RAG pipeline: Retrieve + Generate
+
+    Answers are cached in two tiers: an exact LRU on the normalized query
+    text, then a similarity cache over query embeddings that catches
+    paraphrases. Either hit skips retrieval and generation; a semantic hit
+    costs one embedding call. The result's "cache" key says which tier served it.
+
+    Pass `query_embedding` when the caller has already embedded the query
+    (e.g. a batched bulk search). With `generate=False` only retrieval runs on
+    a cache miss and "rag_response" is None. `metadata_filter` (Pinecone
+    filter syntax) restricts retrieval to matching chunks before ranking.
+
+    Embedding and vector queries run on the bounded RAG thread pool and
+    generation uses the async Gemini client, so the event loop never blocks.
+    Wall time per stage (embed / retrieve / aggregate / generate, seconds) is
+    returned under "timings".
+    """
+    timings: Dict[str, float] = {}
+    cache_status, cached, retrieved_schemes, query_embedding = await _lookup_or_retrieve(
+        query, top_k, top_n_schemes, query_embedding, timings, metadata_filter
+    )
+    if cached is not None:
+        return _finish(query, cached, cache_status, timings)
     
-    # Step 1: Retrieve (existing function)
-    retrieved_schemes = recommend(query, top_k, top_n_schemes)
+    if not generate:
+        return _finish(query, {"schemes": retrieved_schemes, "rag_response": None}, "miss", timings)
     
     if not retrieved_schemes:
-        return {
+        result = {
             "schemes": [],
-            "rag_response": "I couldn't find any matching government schemes for your query. Please try rephrasing your question or contact your local agriculture office for assistance.",
+            "rag_response": NO_SCHEMES_RESPONSE,
+            "query": query
+        }
+    else:
+        # Step 2: Generate
+        stage_start = time.perf_counter()
+        try:
+            llm = get_cached_llm()
+            rag_response = await generate_rag_response(query, retrieved_schemes, llm)
+        except Exception as e:
+            timings["generate"] = time.perf_counter() - stage_start
+            # Don't cache degraded answers
+            return _finish(query, {
+                "schemes": retrieved_schemes,
+                "rag_response": _generation_failed_response(retrieved_schemes, e)
+            }, "miss", timings)
+        timings["generate"] = time.perf_counter() - stage_start
+        
+        result = {
+            "schemes": retrieved_schemes,
+            "rag_response": rag_response,
             "query": query
         }
     
-    # Step 2: Generate
-    try:
-        llm = get_cached_llm()
-        rag_response = generate_rag_response(query, retrieved_schemes, llm)
-    except Exception as e:
-        rag_response = f"I found {len(retrieved_schemes)} relevant schemes, but I'm having trouble generating a detailed response. Please check the scheme details below. Error: {str(e)}"
-    
-    return {
+    _store_answer(query, top_k, top_n_schemes, query_embedding, result, metadata_filter)
+    return _finish(query, result, "miss", timings)
+
+
+async def stream_recommend_with_rag(query: str, top_k: Optional[int] = None,
+                                    top_n_schemes: int = 3) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Streaming variant of recommend_with_rag yielding (event, data) pairs:
+
+        ("schemes", {...})  retrieved scheme cards, as soon as retrieval is done
+        ("token", {"text"}) answer chunks as Gemini generates them
+        ("done", {...})     the full rag_response plus cache status and timings
+
+    Cache hits replay the stored answer as a single token event.
+    """
+    timings: Dict[str, float] = {}
+    cache_status, cached, retrieved_schemes, query_embedding = await _lookup_or_retrieve(
+        query, top_k, top_n_schemes, None, timings
+    )
+
+    yield "schemes", {
+        "query": query,
         "schemes": retrieved_schemes,
+        "total_schemes": len(retrieved_schemes),
+        "cache": cache_status,
+        "timings": {stage: round(seconds, 4) for stage, seconds in timings.items()}
+    }
+
+    if cached is not None:
+        rag_response = cached["rag_response"]
+        yield "token", {"text": rag_response}
+    elif not retrieved_schemes:
+        rag_response = NO_SCHEMES_RESPONSE
+        yield "token", {"text": rag_response}
+        _store_answer(query, top_k, top_n_schemes, query_embedding,
+                      {"schemes": [], "rag_response": rag_response, "query": query})
+    else:
+        stage_start = time.perf_counter()
+        parts: List[str] = []
+        try:
+            llm = get_cached_llm()
+            async for text in stream_rag_response(query, retrieved_schemes, llm):
+                parts.append(text)
+                yield "token", {"text": text}
+            rag_response = "".join(parts)
+            _store_answer(query, top_k, top_n_schemes, query_embedding,
+                          {"schemes": retrieved_schemes, "rag_response": rag_response, "query": query})
+        except Exception as e:
+            logger.error(f"Streaming RAG generation failed: {str(e)}")
+            failure_text = _generation_failed_response(retrieved_schemes, e)
+            # Complete the answer with the fallback text (partial answers are not cached)
+            yield "token", {"text": ("\n\n" if parts else "") + failure_text}
+            rag_response = "".join(parts) + ("\n\n" if parts else "") + failure_text
+        timings["generate"] = time.perf_counter() - stage_start
+
+    yield "done", {
+        "query": query,
         "rag_response": rag_response,
-        "query": query
+        "cache": cache_status,
+        "timings": {stage: round(seconds, 4) for stage, seconds in timings.items()}
+    }
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters and occupancy of the RAG response caches."""
+    return {
+        "enabled": settings.scheme_cache_enabled,
+        "exact": _exact_cache.stats(),
+        "semantic": _semantic_cache.stats(),
+        "embedding_batcher": _embedding_batcher.stats() if _embedding_batcher else None
     }
 
 
@@ -242,7 +632,8 @@ class GovtSchemeRAGTool:
         if not self.pinecone_available:
             logger.warning("Google AI or Pinecone not available, using fallback mock responses")
     
-    async def search_schemes(self, query: str, top_k: int = 30, top_n_schemes: int = 3) -> Dict[str, Any]:
+    async def search_schemes(self, query: str, top_k: Optional[int] = None, top_n_schemes: int = 3,
+                             metadata_filter: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         logger.info("======== Government Schemes RAG Search ========")
         logger.info(f"Query: {query}")
         logger.info(f"Google AI available: {self.pinecone_available}")
@@ -260,12 +651,18 @@ class GovtSchemeRAGTool:
             
             if self.pinecone_available:
                 # Use the updated RAG pipeline function
-                rag_result = recommend_with_rag(query, top_k, top_n_schemes)
+                rag_result = await recommend_with_rag(
+                    query, top_k, top_n_schemes, metadata_filter=metadata_filter
+                )
                 schemes = rag_result["schemes"]
                 rag_response = rag_result["rag_response"]
+                cache_status = rag_result.get("cache", "miss")
+                timings = rag_result.get("timings", {})
             else:
-                schemes = self._fallback_search(query, top_n_schemes)
+                schemes = self._fallback_search(query, top_n_schemes, metadata_filter)
                 rag_response = "RAG response generation is not available. Using fallback search results."
+                cache_status = None
+                timings = {}
             
             end_time = time.time()
             response_time = end_time - start_time
@@ -280,14 +677,16 @@ class GovtSchemeRAGTool:
                 "total_schemes": len(schemes),
                 "query": query,
                 "response_time": response_time,
-                "using_rag": self.pinecone_available
+                "using_rag": self.pinecone_available,
+                "cache": cache_status,
+                "timings": timings
             }
         
         except Exception as e:
             logger.error(f"Government Schemes RAG search failed: {str(e)}")
             
             # Fallback to mock results
-            fallback_schemes = self._fallback_search(query, top_n_schemes)
+            fallback_schemes = self._fallback_search(query, top_n_schemes, metadata_filter)
             return {
                 "success": True,
                 "schemes": fallback_schemes,
@@ -298,7 +697,144 @@ class GovtSchemeRAGTool:
                 "using_rag": False
             }
     
-    def _fallback_search(self, query: str, top_n: int) -> List[Dict[str, Any]]:
+    async def search_schemes_stream(self, query: str, top_k: Optional[int] = None,
+                                    top_n_schemes: int = 3) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Event stream for search_schemes: scheme cards first, then answer tokens."""
+        logger.info("======== Government Schemes RAG Stream ========")
+        logger.info(f"Query: {query}")
+        start_time = time.time()
+        
+        if not self.pinecone_available:
+            schemes = self._fallback_search(query, top_n_schemes)
+            rag_response = "RAG response generation is not available. Using fallback search results."
+            yield "schemes", {"query": query, "schemes": schemes, "total_schemes": len(schemes), "using_rag": False}
+            yield "token", {"text": rag_response}
+            yield "done", {"query": query, "rag_response": rag_response, "response_time": time.time() - start_time}
+            return
+        
+        try:
+            async for event, data in stream_recommend_with_rag(query, top_k, top_n_schemes):
+                if event == "done":
+                    data["response_time"] = time.time() - start_time
+                yield event, data
+        except Exception as e:
+            logger.error(f"Government Schemes RAG stream failed: {str(e)}")
+            yield "error", {"query": query, "error": str(e)}
+    
+    async def bulk_search(self, queries: List[str], top_k: Optional[int] = None, top_n_schemes: int = 3,
+                          generate: bool = True,
+                          max_concurrency: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Search many queries at once, yielding each result as soon as it is ready.
+
+        Exact cache hits are yielded first. The remaining queries are embedded
+        in one batched call, then retrieved (and optionally generated)
+        concurrently, at most `max_concurrency` at a time; if that call fails
+        they get keyword fallback results instead. Every result carries its
+        position in `queries` as "query_index".
+        """
+        max_concurrency = max_concurrency or settings.scheme_bulk_max_concurrency
+        pending: List[Tuple[int, str]] = []
+        
+        for i, query in enumerate(queries):
+            query_text = str(query).strip() if query else ""
+            if not query_text:
+                yield {"query_index": i, "query": query, "success": False, "error": "Empty query"}
+                continue
+            
+            if not self.pinecone_available:
+                schemes = self._fallback_search(query_text, top_n_schemes)
+                yield {
+                    "query_index": i,
+                    "success": True,
+                    "schemes": schemes,
+                    "rag_response": None,
+                    "total_schemes": len(schemes),
+                    "query": query_text,
+                    "using_rag": False
+                }
+                continue
+            
+            cached = get_cached_result(query_text, top_k, top_n_schemes)
+            if cached is not None:
+                yield self._bulk_result(i, cached, 0.0)
+                continue
+            
+            pending.append((i, query_text))
+        
+        if not pending:
+            return
+        
+        try:
+            query_embeddings = await run_blocking(embed_queries, [query for _, query in pending])
+        except Exception as e:
+            # Same degradation as search_schemes: keyword (BM25 or mock) results per query
+            logger.error(f"Batched query embedding failed, using fallback search: {str(e)}")
+            for i, query_text in pending:
+                schemes = await run_blocking(self._fallback_search, query_text, top_n_schemes)
+                yield {
+                    "query_index": i,
+                    "success": True,
+                    "schemes": schemes,
+                    "rag_response": None,
+                    "total_schemes": len(schemes),
+                    "query": query_text,
+                    "error": f"Embedding failed, using fallback: {str(e)}",
+                    "using_rag": False
+                }
+            return
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def run_one(i: int, query_text: str, query_embedding: List[float]) -> Dict[str, Any]:
+            async with semaphore:
+                start_time = time.time()
+                try:
+                    rag_result = await recommend_with_rag(
+                        query_text,
+                        top_k,
+                        top_n_schemes,
+                        query_embedding=query_embedding,
+                        generate=generate
+                    )
+                except Exception as e:
+                    logger.error(f"Bulk search failed for query {i}: {str(e)}")
+                    return {"query_index": i, "query": query_text, "success": False, "error": str(e)}
+                return self._bulk_result(i, rag_result, time.time() - start_time)
+        
+        tasks = [
+            asyncio.create_task(run_one(i, query_text, query_embedding))
+            for (i, query_text), query_embedding in zip(pending, query_embeddings)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    def _bulk_result(self, query_index: int, rag_result: Dict[str, Any], response_time: float) -> Dict[str, Any]:
+        schemes = rag_result["schemes"]
+        return {
+            "query_index": query_index,
+            "success": True,
+            "schemes": schemes,
+            "rag_response": rag_result["rag_response"],
+            "total_schemes": len(schemes),
+            "query": rag_result["query"],
+            "response_time": response_time,
+            "using_rag": True,
+            "cache": rag_result.get("cache", "miss"),
+            "timings": rag_result.get("timings", {})
+        }
+    
+    def _fallback_search(self, query: str, top_n: int,
+                         metadata_filter: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        lexical_index = get_lexical_index()
+        if lexical_index is not None:
+            logger.info("Using BM25 lexical scheme search")
+            return aggregate_matches(lexical_index.search(query, 30, metadata_filter), top_n)
+        
         logger.info("Using fallback mock scheme search")
         
         mock_schemes = [
@@ -361,7 +897,17 @@ class GovtSchemeRAGTool:
         logger.info(f"Query: {query}")
         logger.info(f"Farmer context: {farmer_context}")
         
-        # Enhanced query with farmer context
+        # Structured context (state, farmer type, landholding band, crop category)
+        # is pushed into the vector query as a metadata filter, but only on fields
+        # the index carries (none for the default index; see scheme_filters)
+        metadata_filter = None
+        if settings.scheme_context_filters_enabled:
+            filter_fields = await run_blocking(context_filter_fields)
+            if filter_fields:
+                metadata_filter = build_context_filter(farmer_context, filter_fields)
+        filtered = metadata_filter or {}
+        
+        # Enhanced query with the farmer context the filter does not already cover
         enhanced_query = query
         if farmer_context:
             crops = farmer_context.get("crops", [])
@@ -369,18 +915,22 @@ class GovtSchemeRAGTool:
             location = farmer_context.get("location", "")
             
             context_terms = []
-            if crops:
+            if crops and "crop_categories" not in filtered:
                 context_terms.extend(crops)
-            if farmer_type:
+            if farmer_type and "farmer_types" not in filtered:
                 context_terms.append(farmer_type)
-            if location:
+            if location and "state" not in filtered:
                 context_terms.append(location)
             
             if context_terms:
                 enhanced_query = f"{query} {' '.join(context_terms)}"
         
         # Search for schemes using RAG
-        search_result = await self.search_schemes(enhanced_query, top_n_schemes=top_n)
+        search_result = await self.search_schemes(
+            enhanced_query,
+            top_n_schemes=top_n,
+            metadata_filter=metadata_filter
+        )
         
         if not search_result.get("success"):
             return search_result
@@ -419,6 +969,7 @@ class GovtSchemeRAGTool:
             "query": query,
             "enhanced_query": enhanced_query,
             "farmer_context": farmer_context,
+            "metadata_filter": metadata_filter,
             "using_rag": search_result.get("using_rag", False)
         }
     
@@ -436,9 +987,20 @@ class GovtSchemeRAGTool:
     async def get_scheme_details(self, scheme_id: str) -> Dict[str, Any]:
         logger.info(f"Getting details for scheme: {scheme_id}")
         
-        return {
-            "success": True,
-            "scheme_id": scheme_id,
-            "message": "Detailed scheme information would be retrieved from Pinecone vector database",
-            "note": "This endpoint can be enhanced to fetch comprehensive scheme details"
-        }
\ No newline at end of file
+        store = get_detail_store()
+        if store is None:
+            return {
+                "success": False,
+                "scheme_id": scheme_id,
+                "error": "Scheme detail store not built"
+            }
+        
+        details = store.get(scheme_id)
+        if details is None:
+            return {
+                "success": False,
+                "scheme_id": scheme_id,
+                "error": "Scheme not found"
+            }
+        
+        return details
\ No newline at end of file
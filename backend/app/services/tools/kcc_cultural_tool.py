@@ -2,6 +2,7 @@ import httpx
 from typing import Dict, Any
 from app.core.config import settings
 from app.utils.logger import get_logger
+from app.services.gpu_client import gpu_request
 
 logger = get_logger(__name__)
 
@@ -28,37 +29,38 @@ class KCCCulturalTool:
             # Prepare form data payload
             form_data = {"query": query}
             
-            # Make API call to GPU server with form-urlencoded
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                logger.info(f"Calling KCC Cultural API: {self.full_api_url}")
-                response = await client.post(
-                    self.full_api_url,
-                    data=form_data,
-                    headers={"Content-Type": "application/x-www-form-urlencoded"}
-                )
-                response.raise_for_status()
-                
-                # Parse response
-                result = response.json()
-                logger.info(f"KCC Cultural API response received: {result.get('success', False)}")
-                
-                # Handle the exact response structure from your API
-                if result.get("success"):
-                    return {
-                        "success": True,
-                        "response": result.get("response", "No response from KCC cultural service"),
-                        "source": "kcc_cultural_gpu_server",
-                        "query": result.get("query", query),
-                        "error": result.get("error")
-                    }
-                else:
-                    return {
-                        "success": False,
-                        "response": result.get("response", ""),
-                        "error": result.get("error", "Unknown error from KCC cultural service"),
-                        "source": "kcc_cultural_gpu_server",
-                        "query": result.get("query", query)
-                    }
+            # Make API call to GPU server with form-urlencoded (shared keep-alive client)
+            logger.info(f"Calling KCC Cultural API: {self.full_api_url}")
+            response = await gpu_request(
+                "POST",
+                self.full_api_url,
+                data=form_data,
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            
+            # Parse response
+            result = response.json()
+            logger.info(f"KCC Cultural API response received: {result.get('success', False)}")
+            
+            # Handle the exact response structure from your API
+            if result.get("success"):
+                return {
+                    "success": True,
+                    "response": result.get("response", "No response from KCC cultural service"),
+                    "source": "kcc_cultural_gpu_server",
+                    "query": result.get("query", query),
+                    "error": result.get("error")
+                }
+            else:
+                return {
+                    "success": False,
+                    "response": result.get("response", ""),
+                    "error": result.get("error", "Unknown error from KCC cultural service"),
+                    "source": "kcc_cultural_gpu_server",
+                    "query": result.get("query", query)
+                }
         
         except httpx.RequestError as e:
             logger.error(f"KCC Cultural API request failed: {type(e).__name__}: {str(e)}")
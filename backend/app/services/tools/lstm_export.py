@@ -0,0 +1,111 @@
+"""
+TorchScript export pipeline for the PriceLSTM crop models.
+
+Usage (from the backend directory):
+    python -m app.services.tools.lstm_export [--crops rice ajwan] [--atol 1e-4]
+
+Each export is frozen for inference, verified against the eager model and
+written next to the .pth weights, tagged with the hash of the weights it was
+exported from so LSTMPriceTool ignores it once the weights change.
+"""
+
+import argparse
+import hashlib
+from typing import Any, Dict, List
+
+import numpy as np
+
+from app.utils.logger import get_logger
+from app.services.tools.lstm_price_tool import (
+    TORCH_AVAILABLE,
+    LSTMPriceTool,
+    get_model_paths
+)
+
+logger = get_logger(__name__)
+
+if TORCH_AVAILABLE:
+    import torch
+    from app.services.tools.lstm_torch_backend import load_eager_model
+
+WINDOW_SIZE = 30
+
+
+def build_torchscript_model(eager_model) -> "torch.jit.ScriptModule":
+    """Script and freeze an eager PriceLSTM for CPU inference."""
+    scripted = torch.jit.script(eager_model.eval())
+    return torch.jit.freeze(scripted)
+
+
+def verify_against_eager(eager_model, scripted_model, scaled_prices: "np.ndarray",
+                         atol: float = 1e-4, samples: int = 64) -> float:
+    """
+    Compare exported and eager outputs on real windows from the price series.
+
+    Returns the max absolute difference (in scaled units) and raises if it
+    exceeds `atol`.
+    """
+    series = torch.from_numpy(np.ascontiguousarray(scaled_prices, dtype=np.float32))
+    last_start = len(series) - WINDOW_SIZE
+    starts = np.linspace(0, last_start, num=min(samples, last_start + 1), dtype=int)
+    windows = torch.stack([series[i:i + WINDOW_SIZE] for i in starts])
+
+    with torch.no_grad():
+        eager_out = eager_model(windows)
+        scripted_out = scripted_model(windows)
+        # Single-sample batches are what the forecaster actually runs
+        single_out = scripted_model(windows[-1:])
+
+    max_diff = max(
+        float((eager_out - scripted_out).abs().max()),
+        float((eager_out[-1:] - single_out).abs().max())
+    )
+    if max_diff > atol:
+        raise ValueError(f"Exported model deviates from eager model by {max_diff:.2e} (atol={atol:.0e})")
+    return max_diff
+
+
+def export_crop(crop: str, atol: float = 1e-4) -> Dict[str, Any]:
+    paths = get_model_paths(crop)
+    device = torch.device("cpu")
+
+    eager_model = load_eager_model(paths["model"], device)
+    scripted_model = build_torchscript_model(eager_model)
+    scaled_prices = np.load(paths["data"])
+
+    max_diff = verify_against_eager(eager_model, scripted_model, scaled_prices, atol=atol)
+
+    source_version = hashlib.sha256(paths["model"].read_bytes()).hexdigest()[:12]
+    torch.jit.save(
+        scripted_model,
+        str(paths["torchscript"]),
+        _extra_files={"source_version": source_version}
+    )
+
+    logger.info(f"✅ Exported {crop} TorchScript model to {paths['torchscript'].name} (max diff {max_diff:.2e})")
+    return {
+        "crop": crop,
+        "path": str(paths["torchscript"]),
+        "source_version": source_version,
+        "max_abs_diff": max_diff
+    }
+
+
+def export_all(crops: List[str], atol: float = 1e-4) -> List[Dict[str, Any]]:
+    if not TORCH_AVAILABLE:
+        raise RuntimeError("PyTorch is required to export LSTM models")
+    return [export_crop(crop, atol=atol) for crop in crops]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export PriceLSTM crop models to TorchScript")
+    parser.add_argument("--crops", nargs="+", default=LSTMPriceTool().supported_crops, help="Crops to export")
+    parser.add_argument("--atol", type=float, default=1e-4, help="Max allowed deviation from the eager model")
+    args = parser.parse_args()
+
+    for result in export_all(args.crops, atol=args.atol):
+        print(f"{result['crop']}: {result['path']} (max diff {result['max_abs_diff']:.2e})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,15 @@
 import os
 import time
-from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
+import asyncio
+import hashlib
+import threading
+import importlib.util
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, date, timedelta
 from pathlib import Path
 import warnings
 
+from app.core.config import settings
 from app.utils.logger import get_logger
 
 # Suppress sklearn warnings about feature names
@@ -13,126 +18,284 @@ warnings.filterwarnings('ignore', category=UserWarning, module='sklearn')
 logger = get_logger(__name__)
 
 try:
-    import torch
-    import torch.nn as nn
     import numpy as np
     import joblib
-    PYTORCH_AVAILABLE = True
+    from app.services.tools.numpy_lstm import NumpyPriceLSTM
+    LSTM_AVAILABLE = True
 except ImportError:
-    logger.warning("PyTorch dependencies not available. LSTM functionality will be limited.")
-    PYTORCH_AVAILABLE = False
+    logger.warning("NumPy/joblib not available. LSTM functionality will be limited.")
+    LSTM_AVAILABLE = False
 
-# Global cached models
+# torch is optional: only imported when a torch engine is actually selected
+TORCH_AVAILABLE = importlib.util.find_spec("torch") is not None
+
+# Longest horizon served by the batch forecast endpoint
+MAX_FORECAST_HORIZON = 30
+
+MODELS_DIR = Path(__file__).parent.parent.parent / "models" / "lstm"
+
+# Inference engines selectable through settings.lstm_inference_backend
+INFERENCE_BACKENDS = ("numpy", "auto", "torchscript", "eager")
+
+# Global cached models (loads are serialized so concurrent first requests load once)
 _cached_models = {}
+_model_load_lock = threading.Lock()
 
+# Startup warm-up state reported by /mandi-price/health
+_warmup_status: Dict[str, Any] = {
+    "ready": False,
+    "warmed_crops": [],
+    "engines": {},
+    "failed": {},
+    "duration": None,
+    "error": None
+}
 
-class PriceLSTM(nn.Module):
-    def __init__(self, input_size=3, hidden_size=50, num_layers=2, output_size=3):
-        super(PriceLSTM, self).__init__()
-        
-        self.hidden_size = hidden_size
-        self.num_layers = num_layers
-        
-        self.lstm = nn.LSTM(input_size, hidden_size, num_layers, 
-                           batch_first=True, dropout=0.2 if num_layers > 1 else 0)
-        self.fc1 = nn.Linear(hidden_size, 25)
-        self.dropout = nn.Dropout(0.2)
-        self.fc2 = nn.Linear(25, output_size)
-        
-    def forward(self, x):
-        h0 = torch.zeros(self.num_layers, x.size(0), self.hidden_size).to(x.device)
-        c0 = torch.zeros(self.num_layers, x.size(0), self.hidden_size).to(x.device)
-        
-        out, _ = self.lstm(x, (h0, c0))
-        out = out[:, -1, :]
-        out = self.fc1(out)
-        out = self.dropout(out)
-        out = self.fc2(out)
-        return out
+# Daily forecast store: (crop, date, model_version) -> predictions + memoized analysis.
+# Forecasts only depend on the static scaled series, the weights and the calendar date.
+_forecast_store: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
 
 
 def get_cached_model(crop: str) -> tuple:
-    """Get cached model, scaler, and data for the specified crop."""
+    """Get cached inference engine, scaler, and data for the specified crop."""
     global _cached_models
     
     if crop not in _cached_models:
-        logger.info(f"Loading LSTM model for {crop}...")
-        
-        # Get model path
-        base_path = Path(__file__).parent.parent.parent / "models" / "lstm" / crop
-        model_path = base_path / f"mandi_lstm_{crop}_model.pth"
-        scaler_path = base_path / f"price_scaler_{crop}.pkl"
-        data_path = base_path / f"scaled_prices_{crop}.npy"
-        
-        if not all(path.exists() for path in [model_path, scaler_path, data_path]):
-            raise FileNotFoundError(f"Missing model files for crop: {crop}")
-        
-        # Set device
-        device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
-        
-        # Load model
-        model = PriceLSTM()
-        model.load_state_dict(torch.load(model_path, map_location=device))
-        model.to(device)
-        model.eval()
-        
-        # Load scaler
-        scaler = joblib.load(scaler_path)
-        
-        # Load scaled prices
-        scaled_prices = np.load(data_path)
-        
-        _cached_models[crop] = {
-            'model': model,
-            'scaler': scaler,
-            'scaled_prices': scaled_prices,
-            'device': device
-        }
-        
-        logger.info(f"✅ LSTM model for {crop} cached successfully")
+        with _model_load_lock:
+            if crop not in _cached_models:
+                _load_model(crop)
     
     return (
         _cached_models[crop]['model'],
         _cached_models[crop]['scaler'],
-        _cached_models[crop]['scaled_prices'],
-        _cached_models[crop]['device']
+        _cached_models[crop]['scaled_prices']
     )
 
 
-def predict_7_days(crop: str) -> List[Dict[str, Any]]:
-    """Generate 7-day price predictions for the specified crop."""
-    model, scaler, scaled_prices, device = get_cached_model(crop)
+def get_model_paths(crop: str) -> Dict[str, Path]:
+    """Paths of the trained artifacts (and optional TorchScript export) for a crop."""
+    base_path = MODELS_DIR / crop
+    return {
+        "model": base_path / f"mandi_lstm_{crop}_model.pth",
+        "scaler": base_path / f"price_scaler_{crop}.pkl",
+        "data": base_path / f"scaled_prices_{crop}.npy",
+        "torchscript": base_path / f"mandi_lstm_{crop}_model.torchscript.pt"
+    }
+
+
+def _load_torch_engine(crop: str, paths: Dict[str, Path], version: str, prefer_torchscript: bool):
+    """Load a torch-backed engine; returns (engine, engine_name)."""
+    from app.services.tools.lstm_torch_backend import (
+        TorchPriceEngine,
+        get_device,
+        load_eager_model,
+        load_torchscript_model
+    )
     
-    predictions = []
-    current_sequence = scaled_prices[-30:].copy()
-    today = datetime.now()
+    device = get_device()
     
-    for day in range(7):
-        # Make prediction
-        with torch.no_grad():
-            input_tensor = torch.FloatTensor(current_sequence).unsqueeze(0).to(device)
-            prediction = model(input_tensor)
-            pred_scaled = prediction.cpu().numpy()
-            pred_prices = scaler.inverse_transform(pred_scaled)[0]
-        
-        # Format prediction
-        prediction_date = today + timedelta(days=day + 1)
-        day_pred = {
+    if prefer_torchscript:
+        try:
+            model = load_torchscript_model(paths["torchscript"], version, device)
+            if model is not None:
+                return TorchPriceEngine(model, device), "torchscript"
+        except Exception as e:
+            logger.warning(f"TorchScript model for {crop} failed to load: {str(e)}")
+        logger.warning(f"No usable TorchScript export for {crop}, falling back to eager PyTorch")
+    
+    return TorchPriceEngine(load_eager_model(paths["model"], device), device), "eager"
+
+
+def _load_engine(crop: str, paths: Dict[str, Path], version: str):
+    """Pick the inference engine for a crop according to settings.lstm_inference_backend."""
+    backend = settings.lstm_inference_backend
+    if backend not in INFERENCE_BACKENDS:
+        logger.warning(f"Unknown LSTM inference backend '{backend}', using numpy")
+        backend = "numpy"
+    
+    if backend == "auto":
+        # Only pay for torch when an exported TorchScript model is there to use
+        if TORCH_AVAILABLE and paths["torchscript"].exists():
+            return _load_torch_engine(crop, paths, version, prefer_torchscript=True)
+        backend = "numpy"
+    
+    if backend in ("torchscript", "eager"):
+        if TORCH_AVAILABLE:
+            return _load_torch_engine(crop, paths, version, prefer_torchscript=backend == "torchscript")
+        logger.warning(f"PyTorch not installed, using NumPy engine for {crop}")
+    
+    return NumpyPriceLSTM.from_checkpoint(paths["model"]), "numpy"
+
+
+def _load_model(crop: str) -> None:
+    """Load model, scaler and data for a crop into the cache (caller holds the lock)."""
+    logger.info(f"Loading LSTM model for {crop}...")
+    
+    paths = get_model_paths(crop)
+    model_path, scaler_path, data_path = paths["model"], paths["scaler"], paths["data"]
+    
+    if not all(path.exists() for path in [model_path, scaler_path, data_path]):
+        raise FileNotFoundError(f"Missing model files for crop: {crop}")
+    
+    # Version the forecast store by the weights actually loaded
+    version = hashlib.sha256(model_path.read_bytes()).hexdigest()[:12]
+    
+    # Load model
+    model, engine = _load_engine(crop, paths, version)
+    
+    # Load scaler
+    scaler = joblib.load(scaler_path)
+    
+    # Load scaled prices
+    scaled_prices = np.load(data_path)
+    
+    _cached_models[crop] = {
+        'model': model,
+        'scaler': scaler,
+        'scaled_prices': scaled_prices,
+        'version': version,
+        'engine': engine
+    }
+    
+    logger.info(f"✅ LSTM model for {crop} cached successfully ({engine})")
+
+
+def _inverse_scale(scaler, values: "np.ndarray") -> "np.ndarray":
+    """Closed-form MinMaxScaler.inverse_transform (no per-call sklearn validation)."""
+    return (values - scaler.min_) / scaler.scale_
+
+
+def _rollout_scaled(model, scaled_prices: "np.ndarray", horizon: int) -> "np.ndarray":
+    """
+    Autoregressively roll the model forward `horizon` days in scaled space.
+
+    The 30-day window and the predictions live in one preallocated array, so
+    each step is a single forward pass on a view of it. Feeding the scaled
+    prediction straight back is equivalent to the old
+    inverse_transform -> transform round trip.
+    """
+    window_size = 30
+    buffer = np.empty((1, window_size + horizon, scaled_prices.shape[1]), dtype=np.float32)
+    buffer[0, :window_size] = scaled_prices[-window_size:]
+    
+    for step in range(horizon):
+        buffer[:, window_size + step] = model.predict(buffer[:, step:step + window_size])
+    
+    return buffer[0, window_size:].astype(np.float64)
+
+
+def _format_daily_predictions(prices: "np.ndarray", start_date: datetime) -> List[Dict[str, Any]]:
+    predictions = []
+    for day, (min_price, max_price, modal_price) in enumerate(prices.tolist()):
+        prediction_date = start_date + timedelta(days=day + 1)
+        predictions.append({
             'day': day + 1,
             'date': prediction_date.strftime('%Y-%m-%d'),
             'weekday': prediction_date.strftime('%A'),
-            'min_price': float(round(pred_prices[0], 2)),
-            'max_price': float(round(pred_prices[1], 2)),
-            'modal_price': float(round(pred_prices[2], 2)),
-            'price_range': float(round(pred_prices[1] - pred_prices[0], 2))
+            'min_price': float(round(min_price, 2)),
+            'max_price': float(round(max_price, 2)),
+            'modal_price': float(round(modal_price, 2)),
+            'price_range': float(round(max_price - min_price, 2))
+        })
+    return predictions
+
+
+def forecast_prices(crops: List[str], horizon: int = 7) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Generate `horizon`-day price predictions for several crops in one call.
+
+    Scaling is applied once per crop over the whole horizon in closed form;
+    shorter horizons are prefixes of the returned lists.
+    """
+    today = datetime.now()
+    forecasts = {}
+    
+    for crop in crops:
+        model, scaler, scaled_prices = get_cached_model(crop)
+        pred_scaled = _rollout_scaled(model, scaled_prices, horizon)
+        pred_prices = _inverse_scale(scaler, pred_scaled)
+        forecasts[crop] = _format_daily_predictions(pred_prices, today)
+    
+    return forecasts
+
+
+def predict_7_days(crop: str) -> List[Dict[str, Any]]:
+    """Generate 7-day price predictions for the specified crop."""
+    return forecast_prices([crop], horizon=7)[crop]
+
+
+def warm_up_models(crops: List[str]) -> Dict[str, Any]:
+    """
+    Preload every crop's model and run one dummy inference per model.
+
+    Runs at startup so the first farmer request pays neither model loading
+    nor the first-call initialization of the inference engine. A crop that
+    fails is reported under "failed" and does not stop the others.
+    """
+    start_time = time.time()
+    warmed = []
+    failed = {}
+    
+    for crop in crops:
+        try:
+            model, _, scaled_prices = get_cached_model(crop)
+            _rollout_scaled(model, scaled_prices, 1)
+            _warmup_status["engines"][crop] = _cached_models[crop]['engine']
+            warmed.append(crop)
+        except Exception as e:
+            logger.error(f"LSTM warm-up failed for {crop}: {str(e)}")
+            failed[crop] = str(e)
+    
+    _warmup_status["failed"] = failed
+    _warmup_status["error"] = f"Warm-up failed for: {', '.join(failed)}" if failed else None
+    _warmup_status["warmed_crops"] = warmed
+    _warmup_status["ready"] = len(warmed) == len(crops)
+    _warmup_status["duration"] = round(time.time() - start_time, 3)
+    
+    logger.info(f"LSTM warm-up finished in {_warmup_status['duration']}s for: {', '.join(warmed) or 'none'}")
+    return dict(_warmup_status)
+
+
+def get_daily_forecast(crop: str) -> Dict[str, Any]:
+    """
+    Get today's 7-day forecast for a crop from the forecast store.
+
+    Computed on a miss and shared by every caller for the rest of the day;
+    the returned entry must be treated as read-only.
+    """
+    get_cached_model(crop)
+    key = (crop, date.today().isoformat(), _cached_models[crop]['version'])
+    
+    entry = _forecast_store.get(key)
+    if entry is None:
+        entry = {
+            "predictions": forecast_prices([crop], horizon=7)[crop],
+            "analysis": None,
+            "generated_at": time.time()
         }
-        predictions.append(day_pred)
-        
-        # Update sequence for next prediction
-        next_pred_scaled = scaler.transform([pred_prices])[0]
-        current_sequence = np.vstack([current_sequence[1:], next_pred_scaled])
+        _forecast_store[key] = entry
     
-    return predictions
+    return entry
+
+
+def get_daily_analysis(crop: str) -> Dict[str, Any]:
+    """Get the memoized analyze_predictions() output for today's forecast."""
+    entry = get_daily_forecast(crop)
+    if entry["analysis"] is None:
+        entry["analysis"] = analyze_predictions(entry["predictions"])
+    return entry["analysis"]
+
+
+def refresh_forecast_store(crops: List[str]) -> int:
+    """Drop previous days' entries and precompute today's forecasts and analyses."""
+    today = date.today().isoformat()
+    for key in [key for key in _forecast_store if key[1] != today]:
+        _forecast_store.pop(key, None)
+    
+    for crop in crops:
+        get_daily_analysis(crop)
+    
+    return len(_forecast_store)
 
 
 def analyze_predictions(predictions: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -213,11 +376,11 @@ def analyze_predictions(predictions: List[Dict[str, Any]]) -> Dict[str, Any]:
 class LSTMPriceTool:
     
     def __init__(self):
-        self.pytorch_available = PYTORCH_AVAILABLE
+        self.lstm_available = LSTM_AVAILABLE
         self.supported_crops = ["rice", "ajwan", "sugarcane"]
         
-        if not self.pytorch_available:
-            logger.warning("PyTorch not available, using fallback mock responses")
+        if not self.lstm_available:
+            logger.warning("LSTM inference not available, using fallback mock responses")
     
     async def predict_weekly_prices(self, crop: str, location: Optional[str] = None) -> Dict[str, Any]:
         logger.info(f"======== Weekly Price Prediction for {crop} ========")
@@ -233,8 +396,9 @@ class LSTMPriceTool:
         try:
             start_time = time.time()
             
-            if self.pytorch_available:
-                predictions = predict_7_days(crop)
+            if self.lstm_available:
+                # A store miss loads the model and runs the rollout; keep it off the event loop
+                predictions = (await asyncio.to_thread(get_daily_forecast, crop))["predictions"]
             else:
                 predictions = self._fallback_predictions(crop)
             
@@ -251,7 +415,7 @@ class LSTMPriceTool:
                 "predictions": predictions,
                 "total_days": len(predictions),
                 "response_time": response_time,
-                "using_lstm": self.pytorch_available
+                "using_lstm": self.lstm_available
             }
         
         except Exception as e:
@@ -269,6 +433,61 @@ class LSTMPriceTool:
                 "using_lstm": False
             }
     
+    async def predict_batch(self, crops: List[str], horizons: List[int]) -> Dict[str, Any]:
+        logger.info(f"======== Batch Price Prediction for {', '.join(crops)} ========")
+        logger.info(f"Horizons: {horizons}")
+        
+        start_time = time.time()
+        max_horizon = max(horizons)
+        
+        supported = [crop for crop in crops if crop in self.supported_crops]
+        results: Dict[str, Any] = {
+            crop: {
+                "success": False,
+                "error": f"Unsupported crop: {crop}. Supported crops: {', '.join(self.supported_crops)}"
+            }
+            for crop in crops if crop not in self.supported_crops
+        }
+        
+        using_lstm = self.lstm_available
+        forecasts: Dict[str, List[Dict[str, Any]]] = {}
+        error = None
+        
+        if supported:
+            try:
+                if self.lstm_available:
+                    # Rollouts are CPU-bound; keep them off the event loop
+                    forecasts = await asyncio.to_thread(forecast_prices, supported, max_horizon)
+                else:
+                    forecasts = {crop: self._fallback_predictions(crop, days=max_horizon) for crop in supported}
+            except Exception as e:
+                logger.error(f"Batch price prediction failed: {str(e)}")
+                error = f"LSTM prediction failed, using fallback: {str(e)}"
+                using_lstm = False
+                forecasts = {crop: self._fallback_predictions(crop, days=max_horizon) for crop in supported}
+        
+        for crop, predictions in forecasts.items():
+            results[crop] = {
+                "success": True,
+                "predictions": predictions,
+                "horizons": {str(h): predictions[h - 1] for h in horizons}
+            }
+        
+        response_time = time.time() - start_time
+        logger.info(f"Batch price prediction completed in {response_time:.2f}s")
+        
+        result = {
+            "success": True,
+            "crops": crops,
+            "horizons": horizons,
+            "results": results,
+            "response_time": response_time,
+            "using_lstm": using_lstm
+        }
+        if error:
+            result["error"] = error
+        return result
+    
     async def analyze_market_trends(self, crop: str) -> Dict[str, Any]:
         logger.info(f"======== Market Analysis for {crop} ========")
         
@@ -287,8 +506,10 @@ class LSTMPriceTool:
                     "crop": crop
                 }
             
-            # Generate analysis
-            if self.pytorch_available:
+            # Generate analysis (memoized alongside today's forecast)
+            if prediction_result.get("using_lstm"):
+                analysis = await asyncio.to_thread(get_daily_analysis, crop)
+            elif self.lstm_available:
                 analysis = analyze_predictions(predictions)
             else:
                 analysis = self._fallback_analysis(predictions)
@@ -309,7 +530,7 @@ class LSTMPriceTool:
                 "crop": crop
             }
     
-    def _fallback_predictions(self, crop: str) -> List[Dict[str, Any]]:
+    def _fallback_predictions(self, crop: str, days: int = 7) -> List[Dict[str, Any]]:
         logger.info(f"Using fallback mock predictions for {crop}")
         
         # Mock price ranges based on crop
@@ -323,7 +544,7 @@ class LSTMPriceTool:
         predictions = []
         today = datetime.now()
         
-        for day in range(7):
+        for day in range(days):
             # Add some variation
             variation = (day - 3) * 50  # Slight trend
             prediction_date = today + timedelta(days=day + 1)
@@ -379,9 +600,47 @@ class LSTMPriceTool:
             }
         }
     
+    async def warm_up(self) -> Dict[str, Any]:
+        """Preload and warm all supported crop models off the event loop."""
+        if not self.lstm_available:
+            return self.get_readiness()
+        
+        return await asyncio.to_thread(warm_up_models, self.supported_crops)
+    
+    def get_readiness(self) -> Dict[str, Any]:
+        status = dict(_warmup_status)
+        status["warmed_crops"] = list(_warmup_status["warmed_crops"])
+        status["engines"] = dict(_warmup_status["engines"])
+        status["failed"] = dict(_warmup_status["failed"])
+        if not self.lstm_available:
+            # Fallback predictions need no model
+            status["ready"] = True
+        return status
+    
+    async def refresh_forecasts(self) -> None:
+        """Precompute today's forecasts for all supported crops off the event loop."""
+        if not self.lstm_available:
+            return
+        
+        start_time = time.time()
+        entries = await asyncio.to_thread(refresh_forecast_store, self.supported_crops)
+        logger.info(f"Forecast store refreshed in {time.time() - start_time:.2f}s ({entries} entries)")
+    
+    async def run_daily_refresh(self) -> None:
+        """Background loop refreshing the forecast store just after each midnight."""
+        while True:
+            now = datetime.now()
+            next_midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+            await asyncio.sleep((next_midnight - now).total_seconds() + 1)
+            
+            try:
+                await self.refresh_forecasts()
+            except Exception as e:
+                logger.error(f"Daily forecast refresh failed: {str(e)}")
+    
     async def get_supported_crops(self) -> Dict[str, Any]:
         return {
             "success": True,
             "supported_crops": self.supported_crops,
-            "lstm_available": self.pytorch_available
+            "lstm_available": self.lstm_available
         }
\ No newline at end of file
@@ -0,0 +1,88 @@
+"""
+Optional PyTorch inference engines for the PriceLSTM crop models.
+
+Only imported when settings.lstm_inference_backend selects torch (or a
+TorchScript export), so API workers on the default NumPy engine never pay
+torch's import time and memory.
+"""
+
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+from app.core.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class PriceLSTM(nn.Module):
+    def __init__(self, input_size=3, hidden_size=50, num_layers=2, output_size=3):
+        super(PriceLSTM, self).__init__()
+
+        self.hidden_size = hidden_size
+        self.num_layers = num_layers
+
+        self.lstm = nn.LSTM(input_size, hidden_size, num_layers,
+                           batch_first=True, dropout=0.2 if num_layers > 1 else 0)
+        self.fc1 = nn.Linear(hidden_size, 25)
+        self.dropout = nn.Dropout(0.2)
+        self.fc2 = nn.Linear(25, output_size)
+
+    def forward(self, x):
+        # nn.LSTM starts from zero h0/c0 when no state is passed
+        out, _ = self.lstm(x)
+        out = out[:, -1, :]
+        out = self.fc1(out)
+        out = self.dropout(out)
+        out = self.fc2(out)
+        return out
+
+
+class TorchPriceEngine:
+    """Adapts an eager or TorchScript PriceLSTM to the NumPy predict() interface."""
+
+    def __init__(self, model, device):
+        self.model = model
+        self.device = device
+
+    def predict(self, x: np.ndarray) -> np.ndarray:
+        with torch.no_grad():
+            input_tensor = torch.from_numpy(np.ascontiguousarray(x, dtype=np.float32)).to(self.device)
+            return self.model(input_tensor).cpu().numpy()
+
+
+def get_device():
+    if settings.lstm_torch_threads > 0:
+        torch.set_num_threads(settings.lstm_torch_threads)
+    return torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+
+
+def load_eager_model(model_path: Path, device) -> PriceLSTM:
+    model = PriceLSTM()
+    model.load_state_dict(torch.load(model_path, map_location=device))
+    model.to(device)
+    model.eval()
+    return model
+
+
+def load_torchscript_model(script_path: Path, source_version: str, device) -> Optional[torch.jit.ScriptModule]:
+    """Load an exported TorchScript model, or None if it is missing or stale."""
+    if not script_path.exists():
+        return None
+
+    extra_files = {"source_version": ""}
+    model = torch.jit.load(str(script_path), map_location=device, _extra_files=extra_files)
+    exported_from = extra_files["source_version"]
+    if isinstance(exported_from, bytes):
+        exported_from = exported_from.decode("utf-8")
+
+    if exported_from != source_version:
+        logger.warning(f"Ignoring stale TorchScript export {script_path.name} (exported from {exported_from or 'unknown'} weights)")
+        return None
+
+    model.eval()
+    return model
@@ -0,0 +1,154 @@
+"""
+Pure-NumPy inference for the PriceLSTM crop models.
+
+Reads the trained weights straight from the `.pth` state dict (PyTorch's zip
+checkpoint format) without importing torch, so API workers can serve price
+forecasts without paying torch's import time and memory.
+"""
+
+import collections
+import pickle
+import zipfile
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+# torch storage class name -> numpy dtype
+_STORAGE_DTYPES = {
+    "FloatStorage": np.float32,
+    "DoubleStorage": np.float64,
+    "HalfStorage": np.float16,
+    "LongStorage": np.int64,
+    "IntStorage": np.int32,
+    "ShortStorage": np.int16,
+    "CharStorage": np.int8,
+    "ByteStorage": np.uint8,
+    "BoolStorage": np.bool_
+}
+
+
+def _rebuild_tensor_v2(storage, storage_offset, size, stride, requires_grad=False,
+                       backward_hooks=None, metadata=None) -> np.ndarray:
+    itemsize = storage.dtype.itemsize
+    view = np.lib.stride_tricks.as_strided(
+        storage[storage_offset:],
+        shape=tuple(size),
+        strides=tuple(s * itemsize for s in stride)
+    )
+    return np.array(view)
+
+
+def _rebuild_parameter(data, requires_grad=False, backward_hooks=None) -> np.ndarray:
+    return data
+
+
+class _StateDictUnpickler(pickle.Unpickler):
+    """Unpickler mapping torch tensor reconstruction onto NumPy arrays."""
+
+    def __init__(self, file, archive: zipfile.ZipFile, prefix: str, byteorder: str):
+        super().__init__(file)
+        self.archive = archive
+        self.prefix = prefix
+        self.byteorder = "<" if byteorder == "little" else ">"
+
+    def find_class(self, module, name):
+        if module == "collections" and name == "OrderedDict":
+            return collections.OrderedDict
+        if module == "torch._utils" and name == "_rebuild_tensor_v2":
+            return _rebuild_tensor_v2
+        if module == "torch._utils" and name == "_rebuild_parameter":
+            return _rebuild_parameter
+        if module == "torch" and name in _STORAGE_DTYPES:
+            return name
+        raise pickle.UnpicklingError(f"Unsupported object in state dict: {module}.{name}")
+
+    def persistent_load(self, pid):
+        _, storage_type, key, _location, _numel = pid
+        dtype = np.dtype(_STORAGE_DTYPES[storage_type]).newbyteorder(self.byteorder)
+        data = self.archive.read(f"{self.prefix}/data/{key}")
+        return np.frombuffer(data, dtype=dtype).astype(dtype.newbyteorder("="))
+
+
+def load_state_dict(path: Path) -> Dict[str, np.ndarray]:
+    """Read a `torch.save`d state dict into NumPy arrays without importing torch."""
+    with zipfile.ZipFile(path) as archive:
+        pickle_name = next(name for name in archive.namelist() if name.endswith("/data.pkl"))
+        prefix = pickle_name[:-len("/data.pkl")]
+
+        byteorder = "little"
+        if f"{prefix}/byteorder" in archive.namelist():
+            byteorder = archive.read(f"{prefix}/byteorder").decode("ascii").strip()
+
+        with archive.open(pickle_name) as f:
+            state_dict = _StateDictUnpickler(f, archive, prefix, byteorder).load()
+
+    return {key: value for key, value in state_dict.items() if isinstance(value, np.ndarray)}
+
+
+def _gate_layout(weight: np.ndarray, hidden: int) -> np.ndarray:
+    """
+    Reorder PyTorch's (i, f, g, o) gate rows to (i, f, o, g) and halve the
+    sigmoid gates, so one tanh call covers all four gates per step:
+    sigmoid(x) == 0.5 * tanh(x / 2) + 0.5.
+    """
+    i, f, g, o = (weight[k * hidden:(k + 1) * hidden] for k in range(4))
+    return np.concatenate([0.5 * i, 0.5 * f, 0.5 * o, g]).astype(np.float32)
+
+
+class NumpyPriceLSTM:
+    """
+    NumPy re-implementation of PriceLSTM's inference path.
+
+    Multi-layer LSTM over the input window, then fc1 -> fc2 on the last
+    hidden state. Dropout is inactive at inference.
+    """
+
+    def __init__(self, state_dict: Dict[str, np.ndarray]):
+        self.hidden_size = state_dict["lstm.weight_hh_l0"].shape[1]
+        hidden = self.hidden_size
+
+        self.layers = []
+        layer = 0
+        while f"lstm.weight_ih_l{layer}" in state_dict:
+            bias = state_dict[f"lstm.bias_ih_l{layer}"] + state_dict[f"lstm.bias_hh_l{layer}"]
+            self.layers.append((
+                np.ascontiguousarray(_gate_layout(state_dict[f"lstm.weight_ih_l{layer}"], hidden).T),
+                np.ascontiguousarray(_gate_layout(state_dict[f"lstm.weight_hh_l{layer}"], hidden).T),
+                _gate_layout(bias, hidden)
+            ))
+            layer += 1
+
+        self.fc1_weight = np.ascontiguousarray(state_dict["fc1.weight"].T, dtype=np.float32)
+        self.fc1_bias = state_dict["fc1.bias"].astype(np.float32)
+        self.fc2_weight = np.ascontiguousarray(state_dict["fc2.weight"].T, dtype=np.float32)
+        self.fc2_bias = state_dict["fc2.bias"].astype(np.float32)
+
+    @classmethod
+    def from_checkpoint(cls, path: Path) -> "NumpyPriceLSTM":
+        return cls(load_state_dict(path))
+
+    def predict(self, x: np.ndarray) -> np.ndarray:
+        """Run a (batch, seq_len, features) window; returns (batch, outputs)."""
+        sequence = np.asarray(x, dtype=np.float32)
+        batch, seq_len, _ = sequence.shape
+        hidden = self.hidden_size
+
+        for w_ih, w_hh, bias in self.layers:
+            # Input projections for every timestep in one matmul
+            projected = sequence @ w_ih + bias
+            h = np.zeros((batch, hidden), dtype=np.float32)
+            c = np.zeros((batch, hidden), dtype=np.float32)
+            outputs = np.empty((batch, seq_len, hidden), dtype=np.float32)
+
+            for t in range(seq_len):
+                activated = np.tanh(projected[:, t] + h @ w_hh)
+                sig = activated[:, :3 * hidden] * 0.5 + 0.5
+                c = sig[:, hidden:2 * hidden] * c + sig[:, :hidden] * activated[:, 3 * hidden:]
+                h = sig[:, 2 * hidden:] * np.tanh(c)
+                outputs[:, t] = h
+
+            sequence = outputs
+
+        out = sequence[:, -1] @ self.fc1_weight + self.fc1_bias
+        return out @ self.fc2_weight + self.fc2_bias
@@ -0,0 +1,139 @@
+"""
+In-process BM25 index over scheme chunk text, plus reciprocal-rank fusion.
+
+Built at first use from the chunk text and metadata stored in the local
+vector index directory (see scheme_vector_store), so the lexical side needs
+no extra artifact. Search results use the same match interface as the vector
+stores (`.id`, `.score`, `.metadata`) so they can be fused with dense results
+or fed straight into aggregate_matches() when embeddings are unavailable.
+"""
+
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from app.utils.logger import get_logger
+from app.services.tools.scheme_vector_store import LocalVectorIndex, VectorMatch, get_local_index
+
+logger = get_logger(__name__)
+
+# Latin/digit words plus Devanagari runs (matras are combining marks, not \w)
+_TOKEN_RE = re.compile(r"[\w\u0900-\u097F]+")
+
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how", "i", "in", "is",
+    "it", "me", "my", "of", "on", "or", "the", "to", "what", "which", "with",
+    "hai", "hain", "ka", "ke", "ki", "ko", "kya", "mein", "se",
+    "का", "की", "के", "को", "में", "से", "है", "हैं", "क्या"
+})
+
+_cached_bm25 = None
+_bm25_lock = threading.Lock()
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in _TOKEN_RE.findall(text.casefold()) if token not in STOPWORDS]
+
+
+class BM25Index:
+    """
+    Okapi BM25 over a fixed chunk corpus.
+
+    Per-posting BM25 weights (idf and length normalisation included) are
+    precomputed at build time, so a query is a scatter-add of each query
+    term's postings into one score vector followed by a top-k partition.
+    """
+
+    def __init__(self, source: LocalVectorIndex, k1: float = 1.2, b: float = 0.75):
+        self.source = source
+        text_column = source.columns.get("text")
+        count = source.count
+        self.count = count
+
+        doc_lengths = np.zeros(count, dtype=np.float32)
+        term_docs: Dict[str, Dict[int, int]] = defaultdict(dict)
+        for row in range(count):
+            tokens = tokenize(text_column[row]) if text_column is not None else []
+            doc_lengths[row] = len(tokens)
+            for token in tokens:
+                postings = term_docs[token]
+                postings[row] = postings.get(row, 0) + 1
+
+        avg_length = float(doc_lengths.mean()) if count else 0.0
+        norm = k1 * (1.0 - b + b * doc_lengths / (avg_length or 1.0))
+
+        self.postings: Dict[str, tuple] = {}
+        for term, postings in term_docs.items():
+            rows = np.fromiter(postings.keys(), dtype=np.int32, count=len(postings))
+            tf = np.fromiter(postings.values(), dtype=np.float32, count=len(postings))
+            idf = np.log(1.0 + (count - len(rows) + 0.5) / (len(rows) + 0.5))
+            self.postings[term] = (rows, (idf * tf * (k1 + 1.0) / (tf + norm[rows])).astype(np.float32))
+
+        logger.info(f"✅ BM25 index built: {count} chunks, {len(self.postings)} terms")
+
+    def search(self, query: str, top_k: int = 30,
+               metadata_filter: Optional[Dict] = None) -> List[VectorMatch]:
+        terms = [term for term in dict.fromkeys(tokenize(query)) if term in self.postings]
+        if not terms or top_k <= 0:
+            return []
+
+        scores = np.zeros(self.count, dtype=np.float32)
+        for term in terms:
+            rows, weights = self.postings[term]
+            scores[rows] += weights
+
+        if metadata_filter:
+            scores[~self.source.filter_mask(metadata_filter)] = 0.0
+
+        hit_rows = np.flatnonzero(scores)
+        if len(hit_rows) > top_k:
+            hit_rows = hit_rows[np.argpartition(scores[hit_rows], -top_k)[-top_k:]]
+        ranked = hit_rows[np.argsort(scores[hit_rows])[::-1]]
+
+        return [
+            VectorMatch(self.source.ids[row], float(scores[row]), self.source.row_metadata(row))
+            for row in ranked
+        ]
+
+
+def get_bm25_index() -> Optional[BM25Index]:
+    """Process-wide BM25 index, or None when no local chunk corpus has been built."""
+    global _cached_bm25
+
+    # get_local_index caches the index and, for a short while, its absence, so this is cheap per request
+    source = get_local_index()
+    if source is None:
+        return None
+
+    if _cached_bm25 is None or _cached_bm25.source is not source:
+        with _bm25_lock:
+            if _cached_bm25 is None or _cached_bm25.source is not source:
+                # First use, or the local index was reloaded after a rebuild
+                _cached_bm25 = BM25Index(source)
+
+    return _cached_bm25
+
+
+def reciprocal_rank_fusion(result_lists: Sequence[Sequence], top_k: int, k: int = 60) -> List[VectorMatch]:
+    """
+    Fuse ranked match lists by reciprocal rank: sum of 1 / (k + rank).
+
+    Fused scores are scaled by the best achievable score (rank 1 in every
+    list), so they stay in 0..1 like the cosine scores they replace.
+    """
+    fused: Dict[str, float] = {}
+    metadata: Dict[str, Dict] = {}
+    for matches in result_lists:
+        for rank, match in enumerate(matches, start=1):
+            fused[match.id] = fused.get(match.id, 0.0) + 1.0 / (k + rank)
+            metadata.setdefault(match.id, match.metadata)
+
+    if not fused:
+        return []
+
+    best_possible = len(result_lists) / (k + 1.0)
+    ranked = sorted(fused.items(), key=lambda item: item[1], reverse=True)[:top_k]
+    return [VectorMatch(match_id, score / best_possible, metadata[match_id]) for match_id, score in ranked]
@@ -0,0 +1,214 @@
+"""
+Local scheme-detail store for the government schemes catalogue.
+
+One SQLite row per scheme_id holding the pre-serialized JSON detail payload
+(name, url, sections, full section_content) and its ETag, built from the same
+chunk records as the vector index snapshot. Lookups are a primary-key read,
+so /api/schemes/scheme/{scheme_id} never needs a vector search. A rebuild
+replaces the file atomically; readers notice the new file and reopen it.
+
+Usage (from the backend directory):
+    python -m app.services.tools.scheme_detail_store build --snapshot schemes.jsonl.gz
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from app.core.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent.parent / "models" / "scheme_details.sqlite3"
+
+_cached_store = None
+_store_lock = threading.Lock()
+
+
+class SchemeDetailStore:
+    """Read-only primary-key lookups of scheme detail payloads."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.file_id = _file_id(self.db_path)
+        self._conn = sqlite3.connect(
+            f"file:{self.db_path}?mode=ro",
+            uri=True,
+            check_same_thread=False
+        )
+        self._lock = threading.Lock()
+        self.count = self._conn.execute("SELECT COUNT(*) FROM schemes").fetchone()[0]
+        logger.info(f"✅ Scheme detail store loaded: {self.count} schemes from {self.db_path}")
+
+    def get_payload(self, scheme_id: str) -> Optional[Tuple[str, str]]:
+        """Return (json_payload, etag) for a scheme, or None if unknown."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, etag FROM schemes WHERE scheme_id = ?",
+                (scheme_id,)
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def get(self, scheme_id: str) -> Optional[Dict[str, Any]]:
+        found = self.get_payload(scheme_id)
+        return json.loads(found[0]) if found else None
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def configured_db_path() -> Path:
+    return Path(settings.scheme_detail_db_path) if settings.scheme_detail_db_path else DEFAULT_DB_PATH
+
+
+def _file_id(path: Path) -> Optional[Tuple[int, int]]:
+    """(inode, mtime_ns) of a file, or None if it does not exist."""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns
+
+
+def get_detail_store() -> Optional[SchemeDetailStore]:
+    """
+    Process-wide detail store, or None when it has not been built.
+
+    The open connection keeps reading the file it was opened on, so the store
+    is reopened when a rebuild has swapped a new file into place.
+    """
+    global _cached_store
+
+    db_path = configured_db_path()
+    file_id = _file_id(db_path)
+    if file_id is None:
+        return _cached_store
+    if _cached_store is not None and _cached_store.file_id == file_id:
+        return _cached_store
+
+    with _store_lock:
+        if _cached_store is None or _cached_store.file_id != _file_id(db_path):
+            # The previous store is left to the GC: in-flight lookups may still hold it
+            _cached_store = SchemeDetailStore(db_path)
+
+    return _cached_store
+
+
+def _collect_schemes(records: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Group chunk records into per-scheme details (section text joined in chunk order)."""
+    schemes: Dict[str, Dict[str, Any]] = {}
+    for record in records:
+        metadata = record.get("metadata") or {}
+        sid = metadata.get("scheme_id")
+        if not sid:
+            continue
+
+        scheme = schemes.get(sid)
+        if scheme is None:
+            scheme = schemes[sid] = {
+                "scheme_id": sid,
+                "name": metadata.get("scheme_name") or "",
+                "url": metadata.get("url") or "",
+                "section_chunks": {}
+            }
+
+        section = metadata.get("section")
+        content = (metadata.get("text") or "").strip()
+        if section and content:
+            chunks = scheme["section_chunks"].setdefault(section, [])
+            if content not in chunks:
+                chunks.append(content)
+
+    return schemes
+
+
+def build_detail_store(records: Iterable[Dict[str, Any]], db_path: Optional[Path] = None) -> Path:
+    """Write the detail store from snapshot records and swap it in atomically."""
+    db_path = Path(db_path) if db_path else configured_db_path()
+    schemes = _collect_schemes(records)
+    if not schemes:
+        raise ValueError("Snapshot contains no scheme chunks")
+
+    tmp_path = db_path.with_name(db_path.name + ".tmp")
+    tmp_path.unlink(missing_ok=True)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.execute(
+            "CREATE TABLE schemes ("
+            "scheme_id TEXT PRIMARY KEY, name TEXT, url TEXT, payload TEXT NOT NULL, etag TEXT NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        rows = []
+        for sid, scheme in schemes.items():
+            section_content = {
+                section: "\n\n".join(chunks)
+                for section, chunks in sorted(scheme["section_chunks"].items())
+            }
+            payload = json.dumps({
+                "success": True,
+                "scheme_id": sid,
+                "name": scheme["name"],
+                "url": scheme["url"],
+                "sections": list(section_content),
+                "section_content": section_content
+            }, ensure_ascii=False, sort_keys=True)
+            etag = '"' + hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32] + '"'
+            rows.append((sid, scheme["name"], scheme["url"], payload, etag))
+
+        conn.executemany("INSERT INTO schemes VALUES (?, ?, ?, ?, ?)", rows)
+        conn.execute(
+            "CREATE TABLE build_info (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        conn.execute("INSERT INTO build_info VALUES ('built_at', ?)", (time.strftime("%Y-%m-%dT%H:%M:%S"),))
+        conn.commit()
+    finally:
+        conn.close()
+
+    os.replace(tmp_path, db_path)
+    logger.info(f"✅ Built scheme detail store: {len(schemes)} schemes -> {db_path}")
+    return db_path
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """RFC 7232 weak comparison of an If-None-Match header against an ETag."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def main():
+    from app.services.tools.scheme_vector_store import read_snapshot
+
+    parser = argparse.ArgumentParser(description="Build the local scheme detail store")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build_parser = subparsers.add_parser("build", help="Build the detail store from a snapshot file")
+    build_parser.add_argument("--snapshot", type=Path, required=True, help="Snapshot path (.jsonl.gz)")
+    build_parser.add_argument("--db", type=Path, default=None,
+                              help="Output path (default: SCHEME_DETAIL_DB_PATH or models/scheme_details.sqlite3)")
+
+    args = parser.parse_args()
+    db_path = build_detail_store(read_snapshot(args.snapshot), args.db)
+    print(f"Built scheme detail store at {db_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Farmer context -> vector-store metadata filter for scheme recommendations.
+
+The filter targets these optional chunk metadata fields:
+    state             lowercase state name, or "all" for central schemes
+    farmer_types      list, e.g. ["small", "marginal"] or ["all"]
+    landholding_bands list of LANDHOLDING_BANDS names or ["all"]
+    crop_categories   list of CROP_CATEGORIES values or ["all"]
+
+No builder in this repo derives them: the scraped scheme records only carry
+scheme_id, name, url, section and text. The local index stores whatever
+metadata the snapshot records have, so a snapshot tagged with these fields
+(or a Pinecone index listed in SCHEME_CONTEXT_FILTER_FIELDS) enables
+filtering; the default index is searched unfiltered.
+
+Every condition also accepts "all", so nationwide / unrestricted schemes are
+never filtered out. The filter uses Pinecone syntax and is understood by the
+local index as well. Only fields the index actually carries are filtered on
+(see `available_fields`), and the state condition needs an explicit `state`
+in the farmer context: free-text `location` ("Indore", "near Bhopal") is
+never turned into an exact match.
+"""
+
+from typing import Any, Collection, Dict, List, Optional
+
+ALL = "all"
+
+# Agriculture census operational holding classes (hectares, upper bound exclusive)
+LANDHOLDING_BANDS = (
+    ("marginal", 1.0),
+    ("small", 2.0),
+    ("semi_medium", 4.0),
+    ("medium", 10.0),
+    ("large", float("inf"))
+)
+
+CROP_CATEGORIES = {
+    "rice": "cereals", "paddy": "cereals", "wheat": "cereals", "maize": "cereals",
+    "bajra": "cereals", "jowar": "cereals", "ragi": "cereals", "millet": "cereals",
+    "gram": "pulses", "chana": "pulses", "arhar": "pulses", "tur": "pulses",
+    "moong": "pulses", "urad": "pulses", "lentil": "pulses", "masoor": "pulses",
+    "mustard": "oilseeds", "groundnut": "oilseeds", "soybean": "oilseeds",
+    "sunflower": "oilseeds", "sesame": "oilseeds",
+    "sugarcane": "cash_crops", "cotton": "cash_crops", "jute": "cash_crops", "tobacco": "cash_crops",
+    "potato": "horticulture", "onion": "horticulture", "tomato": "horticulture",
+    "mango": "horticulture", "banana": "horticulture", "vegetables": "horticulture",
+    "fruits": "horticulture",
+    "ajwan": "spices", "turmeric": "spices", "chilli": "spices", "cumin": "spices",
+    "coriander": "spices"
+}
+
+FARMER_TYPES = ("marginal", "small", "medium", "large", "tenant", "landless", "women", "sc_st")
+
+FILTER_FIELDS = ("state", "farmer_types", "landholding_bands", "crop_categories")
+
+
+def landholding_band(hectares: Any) -> Optional[str]:
+    try:
+        hectares = float(hectares)
+    except (TypeError, ValueError):
+        return None
+    if hectares < 0:
+        return None
+    for band, upper in LANDHOLDING_BANDS:
+        if hectares < upper:
+            return band
+    return None
+
+
+def _normalize(value: Any) -> str:
+    return str(value).strip().lower().replace(" ", "_").replace("-", "_")
+
+
+def _with_all(values: List[str]) -> Dict[str, List[str]]:
+    return {"$in": sorted(set(values)) + [ALL]}
+
+
+def build_context_filter(farmer_context: Optional[Dict[str, Any]],
+                         available_fields: Optional[Collection[str]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Metadata filter for a farmer context, or None when nothing is filterable.
+
+    `available_fields` limits the conditions to metadata fields present in
+    the index; None means no restriction.
+    """
+    if not farmer_context:
+        return None
+
+    conditions: Dict[str, Any] = {}
+
+    state = farmer_context.get("state")
+    if state:
+        conditions["state"] = _with_all([str(state).strip().lower()])
+
+    farmer_type = farmer_context.get("farmer_type")
+    if farmer_type and _normalize(farmer_type) in FARMER_TYPES:
+        conditions["farmer_types"] = _with_all([_normalize(farmer_type)])
+
+    band = landholding_band(farmer_context.get("landholding"))
+    if band:
+        conditions["landholding_bands"] = _with_all([band])
+
+    categories = [
+        CROP_CATEGORIES[_normalize(crop)]
+        for crop in farmer_context.get("crops") or []
+        if _normalize(crop) in CROP_CATEGORIES
+    ]
+    if categories:
+        conditions["crop_categories"] = _with_all(categories)
+
+    if available_fields is not None:
+        conditions = {field: condition for field, condition in conditions.items() if field in available_fields}
+
+    return conditions or None
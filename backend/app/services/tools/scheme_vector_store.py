@@ -0,0 +1,444 @@
+"""
+Local in-process vector index for the government schemes corpus.
+
+A drop-in replacement for the Pinecone index behind recommend(): exposes the
+same `query(vector=, top_k=, include_metadata=, namespace=, filter=)` call and
+returns matches with `.id`, `.score` and `.metadata`.
+
+On-disk layout (one directory per index):
+    manifest.json   dimension, row count, column names, source info
+    vectors.f32     row-major float32 matrix of L2-normalised embeddings (memory-mapped)
+    metadata.npz    columnar metadata: each column is dictionary-encoded
+                    (unique values + int32 codes) or, for free text, UTF-8
+                    bytes + offsets
+
+Usage (from the backend directory):
+    python -m app.services.tools.scheme_vector_store snapshot --out schemes.jsonl.gz
+    python -m app.services.tools.scheme_vector_store build --snapshot schemes.jsonl.gz
+"""
+
+import argparse
+import gzip
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_INDEX_DIR = Path(__file__).parent.parent.parent / "models" / "scheme_index"
+
+MANIFEST_FILE = "manifest.json"
+VECTORS_FILE = "vectors.f32"
+METADATA_FILE = "metadata.npz"
+
+# Columns stored as raw UTF-8 blobs instead of dictionary codes (mostly unique values)
+TEXT_COLUMNS = ("text",)
+
+FETCH_BATCH_SIZE = 100
+
+# How long "no index on disk" is trusted before looking again (an index built by
+# the CLI in another process is picked up within this interval)
+MISSING_INDEX_RECHECK_SECONDS = 60.0
+
+_cached_local_index = None
+_local_index_missing_at: Optional[float] = None  # monotonic time absence was last seen
+_local_index_lock = threading.Lock()
+
+
+class VectorMatch:
+    __slots__ = ("id", "score", "metadata")
+
+    def __init__(self, id: str, score: float, metadata: Dict[str, Any]):
+        self.id = id
+        self.score = score
+        self.metadata = metadata
+
+
+class VectorQueryResponse:
+    __slots__ = ("matches", "namespace")
+
+    def __init__(self, matches: List[VectorMatch], namespace: str = ""):
+        self.matches = matches
+        self.namespace = namespace
+
+
+def _value_matches(value: Any, op: str, operand: Any) -> bool:
+    """Pinecone filter semantics for one stored value (list values match on any element)."""
+    values = value if isinstance(value, list) else [value]
+    if op == "$eq":
+        return operand in values
+    if op == "$ne":
+        return operand not in values
+    if op == "$in":
+        return any(item in operand for item in values)
+    if op == "$nin":
+        return not any(item in operand for item in values)
+    if op in ("$gt", "$gte", "$lt", "$lte"):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return False
+        return {
+            "$gt": value > operand,
+            "$gte": value >= operand,
+            "$lt": value < operand,
+            "$lte": value <= operand
+        }[op]
+    raise ValueError(f"Unsupported filter operator: {op}")
+
+
+# Operators that also match rows where the field is absent
+_NEGATIVE_OPS = ("$ne", "$nin")
+
+
+class _DictColumn:
+    """Dictionary-encoded metadata column (values are JSON-encoded on disk)."""
+
+    def __init__(self, values: np.ndarray, codes: np.ndarray):
+        self.values = [json.loads(value) for value in values.tolist()]
+        self.codes = codes
+
+    def __getitem__(self, row: int) -> Any:
+        code = int(self.codes[row])
+        return None if code < 0 else self.values[code]
+
+    def mask(self, op: str, operand: Any) -> np.ndarray:
+        """Row mask for one condition, evaluated once per distinct value."""
+        matches = np.array(
+            [_value_matches(value, op, operand) for value in self.values] + [op in _NEGATIVE_OPS],
+            dtype=bool
+        )
+        # code -1 (field absent) indexes the trailing entry
+        return matches[self.codes]
+
+
+class _TextColumn:
+    """UTF-8 blob + offsets column for free text."""
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray):
+        self.blob = blob.tobytes()
+        self.offsets = offsets
+
+    def __getitem__(self, row: int) -> str:
+        return self.blob[self.offsets[row]:self.offsets[row + 1]].decode("utf-8")
+
+
+class LocalVectorIndex:
+    """Brute-force cosine search over a memory-mapped embedding matrix."""
+
+    def __init__(self, index_dir: Path):
+        self.index_dir = Path(index_dir)
+        with open(self.index_dir / MANIFEST_FILE, encoding="utf-8") as f:
+            self.manifest = json.load(f)
+
+        self.dimension = int(self.manifest["dimension"])
+        self.count = int(self.manifest["count"])
+        self.namespace = self.manifest.get("namespace", "")
+
+        self.vectors = np.memmap(
+            self.index_dir / VECTORS_FILE,
+            dtype=np.float32,
+            mode="r",
+            shape=(self.count, self.dimension)
+        )
+
+        self.columns: Dict[str, Any] = {}
+        with np.load(self.index_dir / METADATA_FILE, allow_pickle=False) as data:
+            self.ids = data["__ids__"].tolist()
+            for name in self.manifest["columns"]:
+                if f"{name}.blob" in data:
+                    self.columns[name] = _TextColumn(data[f"{name}.blob"], data[f"{name}.offsets"])
+                else:
+                    self.columns[name] = _DictColumn(data[f"{name}.values"], data[f"{name}.codes"])
+
+        logger.info(f"✅ Local scheme index loaded: {self.count} vectors x {self.dimension} dims from {self.index_dir}")
+
+    def row_metadata(self, row: int) -> Dict[str, Any]:
+        metadata = {}
+        for name, column in self.columns.items():
+            value = column[row]
+            if value is not None:
+                metadata[name] = value
+        return metadata
+
+    def filter_mask(self, filter: Dict[str, Any]) -> np.ndarray:
+        """
+        Boolean row mask for a Pinecone-style metadata filter.
+
+        Supports field conditions ($eq, $ne, $in, $nin, $gt, $gte, $lt, $lte,
+        or a bare value for $eq) combined with $and / $or.
+        """
+        mask = np.ones(self.count, dtype=bool)
+        for key, condition in filter.items():
+            if key == "$and":
+                for clause in condition:
+                    mask &= self.filter_mask(clause)
+            elif key == "$or":
+                any_mask = np.zeros(self.count, dtype=bool)
+                for clause in condition:
+                    any_mask |= self.filter_mask(clause)
+                mask &= any_mask
+            else:
+                if not isinstance(condition, dict):
+                    condition = {"$eq": condition}
+                column = self.columns.get(key)
+                for op, operand in condition.items():
+                    if column is None:
+                        # Field absent from every row
+                        if op not in _NEGATIVE_OPS:
+                            mask[:] = False
+                    elif isinstance(column, _DictColumn):
+                        mask &= column.mask(op, operand)
+                    else:
+                        mask &= np.fromiter(
+                            (_value_matches(column[row], op, operand) for row in range(self.count)),
+                            dtype=bool,
+                            count=self.count
+                        )
+        return mask
+
+    def query(self, vector: List[float], top_k: int = 10, include_metadata: bool = True,
+              namespace: Optional[str] = None, filter: Optional[Dict[str, Any]] = None,
+              **kwargs) -> VectorQueryResponse:
+        """Pinecone-compatible top-k cosine query (metadata filter applied before ranking)."""
+        query = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(query))
+        if norm > 0:
+            query = query / norm
+
+        if filter:
+            candidates = np.flatnonzero(self.filter_mask(filter))
+            scores = np.full(self.count, -np.inf, dtype=np.float32)
+            scores[candidates] = self.vectors[candidates] @ query
+        else:
+            candidates = np.arange(self.count)
+            scores = self.vectors @ query
+
+        top_k = min(top_k, len(candidates))
+        if top_k <= 0:
+            return VectorQueryResponse([], namespace or self.namespace)
+
+        if top_k < len(candidates):
+            candidates = candidates[np.argpartition(scores[candidates], -top_k)[-top_k:]]
+        ranked = candidates[np.argsort(scores[candidates])[::-1]]
+
+        matches = [
+            VectorMatch(
+                self.ids[row],
+                float(scores[row]),
+                self.row_metadata(row) if include_metadata else {}
+            )
+            for row in ranked
+        ]
+        return VectorQueryResponse(matches, namespace or self.namespace)
+
+
+def configured_index_dir() -> Path:
+    return Path(settings.scheme_local_index_dir) if settings.scheme_local_index_dir else DEFAULT_INDEX_DIR
+
+
+def _missing_index_error(index_dir: Path) -> FileNotFoundError:
+    return FileNotFoundError(
+        f"No local scheme index at {index_dir}. Build one with "
+        f"`python -m app.services.tools.scheme_vector_store build --snapshot <file>`"
+    )
+
+
+def load_local_index(index_dir: Optional[Path] = None) -> LocalVectorIndex:
+    index_dir = Path(index_dir) if index_dir else configured_index_dir()
+    if not (index_dir / MANIFEST_FILE).exists():
+        raise _missing_index_error(index_dir)
+    return LocalVectorIndex(index_dir)
+
+
+def _absence_is_fresh() -> bool:
+    return (_local_index_missing_at is not None
+            and time.monotonic() - _local_index_missing_at < MISSING_INDEX_RECHECK_SECONDS)
+
+
+def get_local_index(index_dir: Optional[Path] = None) -> Optional[LocalVectorIndex]:
+    """
+    Process-wide local index (shared by vector search and BM25), or None if
+    not built. Absence is cached for MISSING_INDEX_RECHECK_SECONDS.
+    """
+    global _cached_local_index, _local_index_missing_at
+
+    if _cached_local_index is None and not _absence_is_fresh():
+        with _local_index_lock:
+            if _cached_local_index is None and not _absence_is_fresh():
+                index_dir = Path(index_dir) if index_dir else configured_index_dir()
+                if not (index_dir / MANIFEST_FILE).exists():
+                    if _local_index_missing_at is None:
+                        logger.info(f"No local scheme index at {index_dir}")
+                    _local_index_missing_at = time.monotonic()
+                    return None
+                _cached_local_index = LocalVectorIndex(index_dir)
+                _local_index_missing_at = None
+
+    return _cached_local_index
+
+
+def require_local_index() -> LocalVectorIndex:
+    """The shared local index, raising with build instructions when it is missing."""
+    local_index = get_local_index()
+    if local_index is None:
+        raise _missing_index_error(configured_index_dir())
+    return local_index
+
+
+def reset_local_index() -> None:
+    """Forget the cached index (or its absence) so the next lookup reloads from disk."""
+    global _cached_local_index, _local_index_missing_at
+
+    with _local_index_lock:
+        _cached_local_index = None
+        _local_index_missing_at = None
+
+
+def _encode_columns(ids: List[str], metadatas: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    names = sorted({key for metadata in metadatas for key in metadata})
+    arrays: Dict[str, np.ndarray] = {"__ids__": np.array(ids, dtype=str)}
+
+    for name in names:
+        column = [metadata.get(name) for metadata in metadatas]
+        if name in TEXT_COLUMNS:
+            encoded = [("" if value is None else str(value)).encode("utf-8") for value in column]
+            offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            np.cumsum([len(value) for value in encoded], out=offsets[1:])
+            arrays[f"{name}.blob"] = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+            arrays[f"{name}.offsets"] = offsets
+        else:
+            # JSON-encode values so numbers, bools and lists round-trip through one str column
+            serialized = [None if value is None else json.dumps(value, ensure_ascii=False) for value in column]
+            uniques = sorted({value for value in serialized if value is not None})
+            lookup = {value: code for code, value in enumerate(uniques)}
+            arrays[f"{name}.values"] = np.array(uniques, dtype=str)
+            arrays[f"{name}.codes"] = np.array(
+                [-1 if value is None else lookup[value] for value in serialized],
+                dtype=np.int32
+            )
+
+    return arrays
+
+
+def build_local_index(records: Iterable[Dict[str, Any]], index_dir: Optional[Path] = None,
+                      namespace: str = "default", source: str = "") -> Path:
+    """
+    Write a local index from snapshot records ({"id", "values", "metadata"}).
+
+    The new index is written next to the old one and swapped in with a
+    rename, so a running process never sees a half-written directory.
+    """
+    index_dir = Path(index_dir) if index_dir else configured_index_dir()
+    ids, vectors, metadatas = [], [], []
+    for record in records:
+        ids.append(str(record["id"]))
+        vectors.append(np.asarray(record["values"], dtype=np.float32))
+        metadatas.append(record.get("metadata") or {})
+
+    if not vectors:
+        raise ValueError("Snapshot contains no vectors")
+
+    matrix = np.vstack(vectors)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix /= np.where(norms > 0, norms, 1.0)
+
+    columns = _encode_columns(ids, metadatas)
+
+    tmp_dir = index_dir.with_name(index_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+
+    matrix.tofile(tmp_dir / VECTORS_FILE)
+    np.savez_compressed(tmp_dir / METADATA_FILE, **columns)
+    manifest = {
+        "dimension": int(matrix.shape[1]),
+        "count": int(matrix.shape[0]),
+        "namespace": namespace,
+        "columns": sorted({key for metadata in metadatas for key in metadata}),
+        "source": source,
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%S")
+    }
+    with open(tmp_dir / MANIFEST_FILE, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    old_dir = index_dir.with_name(index_dir.name + ".old")
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if index_dir.exists():
+        os.replace(index_dir, old_dir)
+    os.replace(tmp_dir, index_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    reset_local_index()
+
+    logger.info(f"✅ Built local scheme index: {manifest['count']} vectors -> {index_dir}")
+    return index_dir
+
+
+def iter_pinecone_records(index, namespace: str = "default") -> Iterator[Dict[str, Any]]:
+    """Stream every vector (values + metadata) out of a Pinecone index namespace."""
+    for id_batch in index.list(namespace=namespace, limit=FETCH_BATCH_SIZE):
+        fetched = index.fetch(ids=list(id_batch), namespace=namespace)
+        for vector_id, vector in fetched.vectors.items():
+            yield {
+                "id": vector_id,
+                "values": list(vector.values),
+                "metadata": dict(vector.metadata or {})
+            }
+
+
+def write_snapshot(records: Iterable[Dict[str, Any]], path: Path) -> int:
+    """Write records as gzipped JSON lines; returns the number written."""
+    count = 0
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def read_snapshot(path: Path) -> Iterator[Dict[str, Any]]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def main():
+    from app.services.tools.govt_scheme_rag_tool import INDEX_NAME, get_pinecone_index
+
+    parser = argparse.ArgumentParser(description="Snapshot and build the local government schemes vector index")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    snapshot_parser = subparsers.add_parser("snapshot", help="Export the Pinecone index to a snapshot file")
+    snapshot_parser.add_argument("--out", type=Path, required=True, help="Snapshot path (.jsonl.gz)")
+    snapshot_parser.add_argument("--namespace", default="default")
+
+    build_parser = subparsers.add_parser("build", help="Build the local index from a snapshot file")
+    build_parser.add_argument("--snapshot", type=Path, required=True, help="Snapshot path (.jsonl.gz)")
+    build_parser.add_argument("--index-dir", type=Path, default=None, help="Defaults to SCHEME_LOCAL_INDEX_DIR or models/scheme_index")
+    build_parser.add_argument("--namespace", default="default")
+
+    args = parser.parse_args()
+
+    if args.command == "snapshot":
+        count = write_snapshot(iter_pinecone_records(get_pinecone_index(), args.namespace), args.out)
+        print(f"Exported {count} vectors from {INDEX_NAME}/{args.namespace} to {args.out}")
+    else:
+        index_dir = build_local_index(
+            read_snapshot(args.snapshot),
+            args.index_dir,
+            namespace=args.namespace,
+            source=f"{INDEX_NAME}:{args.snapshot.name}"
+        )
+        print(f"Built local index at {index_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,68 @@
 import os
 import time
+import uuid
 import base64
-import requests
-from typing import Optional, Dict, Any
-from openai import OpenAI
+import asyncio
+import httpx
+from typing import Optional, Dict, Any, AsyncIterator, Tuple
 from app.core.config import settings
 from app.utils.logger import get_logger
+from app.utils.latency import LatencyHistogram
+from app.services.gpu_client import get_gpu_client, gpu_request
+from app.services.openai_client import chat_completion
 
 logger = get_logger(__name__)
 
+# Read size for streaming image uploads to the GPU server
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Per-backend latency histograms (process-wide) driving the hedge delay
+_backend_latency = {
+    "vllm": LatencyHistogram(),
+    "gpt4_vision": LatencyHistogram()
+}
+
+
+def _encode_image_base64(image_path: str) -> str:
+    with open(image_path, "rb") as image_file:
+        return base64.b64encode(image_file.read()).decode('utf-8')
+
+
+def _build_multipart_upload(image_path: str, question: str) -> Tuple[str, int, AsyncIterator[bytes]]:
+    """
+    Build a streamed multipart/form-data body for the vLLM generate endpoint.
+
+    Returns the content type, the exact content length and an async iterator
+    that reads the image from disk chunk by chunk off the event loop, so the
+    upload never holds the whole image in memory.
+    """
+    boundary = uuid.uuid4().hex
+    filename = os.path.basename(image_path).replace('"', '%22')
+    file_size = os.path.getsize(image_path)
+
+    head = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="question"\r\n\r\n'
+        f"{question}\r\n"
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="image"; filename="{filename}"\r\n'
+        f"Content-Type: image/jpeg\r\n\r\n"
+    ).encode("utf-8")
+    tail = f"\r\n--{boundary}--\r\n".encode("utf-8")
+
+    async def body() -> AsyncIterator[bytes]:
+        yield head
+        with open(image_path, "rb") as image_file:
+            while True:
+                chunk = await asyncio.to_thread(image_file.read, UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+        yield tail
+
+    content_type = f"multipart/form-data; boundary={boundary}"
+    return content_type, len(head) + file_size + len(tail), body()
+
 
 class VLMTool:
     
@@ -17,7 +71,6 @@ class VLMTool:
         self.health_endpoint = settings.gpu_health_endpoint
         self.generate_endpoint = settings.vllm_generate_endpoint
         self.timeout = settings.gpu_timeout_seconds
-        self.openai_client = OpenAI(api_key=settings.openai_api_key)
     
     async def check_health(self) -> Dict[str, Any]:
         logger.info("======== VLM Health Check ========")
@@ -26,7 +79,8 @@ class VLMTool:
         try:
             start_time = time.time()
             
-            response = requests.get(
+            response = await gpu_request(
+                "GET",
                 f"{self.base_url}{self.health_endpoint}",
                 timeout=10
             )
@@ -48,6 +102,7 @@ class VLMTool:
                     "cuda_available": health_data.get("cuda", {}).get("available", False),
                     "vllm_status": health_data.get("services", {}).get("vllm", "unknown"),
                     "response_time": response_time,
+                    "backend_latency": self.get_latency_stats(),
                     "data": health_data
                 }
             else:
@@ -58,7 +113,7 @@ class VLMTool:
                     "response_time": response_time
                 }
         
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             logger.error("Health check timed out")
             return {
                 "success": False,
@@ -78,9 +133,8 @@ class VLMTool:
         try:
             start_time = time.time()
             
-            # Encode image to base64
-            with open(image_path, "rb") as image_file:
-                base64_image = base64.b64encode(image_file.read()).decode('utf-8')
+            # Encode image to base64 off the event loop
+            base64_image = await asyncio.to_thread(_encode_image_base64, image_path)
             
             # Agricultural-focused system prompt
             agricultural_prompt = f"""You are an agricultural advisor. Analyze the image and answer: "{question}"
@@ -91,7 +145,7 @@ class VLMTool:
 
             Keep the advice practical but concise."""
 
-            response = self.openai_client.chat.completions.create(
+            response = await chat_completion(
                 model="gpt-4o",
                 messages=[
                     {
@@ -122,6 +176,7 @@ class VLMTool:
             response_time = end_time - start_time
             
             analysis_response = response.choices[0].message.content
+            _backend_latency["gpt4_vision"].record(response_time)
             
             logger.info(f"GPT-4 Vision response time: {response_time:.2f}s")
             logger.info(f"GPT-4 Vision analysis: {analysis_response[:100]}...")
@@ -148,39 +203,26 @@ class VLMTool:
                 "fallback_method": "gpt-4-vision"
             }
     
-    async def analyze_image(self, image_path: str, question: str) -> Dict[str, Any]:
-        logger.info("======== VLM Image Analysis ========")
-        logger.info(f"Analyzing image: {image_path}")
-        logger.info(f"Question: {question}")
-        
+    async def _analyze_with_vllm(self, image_path: str, question: str) -> Dict[str, Any]:
+        """Run the primary vLLM analysis; failures are returned, not raised."""
+        start_time = time.time()
         try:
-            if not os.path.exists(image_path):
-                logger.error(f"Image file not found: {image_path}")
-                return {
-                    "success": False,
-                    "error": f"Image file not found: {image_path}"
-                }
+            # Stream the image as multipart form data instead of buffering it.
+            # The body is a one-shot stream, so this call is not retried.
+            content_type, content_length, body = _build_multipart_upload(image_path, question)
             
-            start_time = time.time()
+            logger.info(f"Sending request to: {self.base_url}{self.generate_endpoint}")
+            logger.info(f"Timeout set to: {self.timeout}s")
             
-            # Prepare multipart form data
-            with open(image_path, 'rb') as image_file:
-                files = {
-                    'image': (os.path.basename(image_path), image_file, 'image/jpeg')
-                }
-                data = {
-                    'question': question
-                }
-                
-                logger.info(f"Sending request to: {self.base_url}{self.generate_endpoint}")
-                logger.info(f"Timeout set to: {self.timeout}s")
-                
-                response = requests.post(
-                    f"{self.base_url}{self.generate_endpoint}",
-                    files=files,
-                    data=data,
-                    timeout=self.timeout
-                )
+            response = await get_gpu_client().post(
+                f"{self.base_url}{self.generate_endpoint}",
+                content=body,
+                headers={
+                    "Content-Type": content_type,
+                    "Content-Length": str(content_length)
+                },
+                timeout=self.timeout
+            )
             
             end_time = time.time()
             response_time = end_time - start_time
@@ -195,6 +237,7 @@ class VLMTool:
                 if result.get('success'):
                     analysis_response = result.get('response', '')
                     logger.info(f"Analysis result: {analysis_response[:100]}...")
+                    _backend_latency["vllm"].record(response_time)
                     
                     return {
                         "success": True,
@@ -209,12 +252,7 @@ class VLMTool:
                 else:
                     error_msg = result.get('error', 'Unknown error from VLLM')
                     logger.error(f"VLLM analysis failed: {error_msg}")
-                    logger.info("Attempting GPT-4 Vision fallback...")
-                    
-                    # Try GPT-4 Vision fallback
-                    fallback_result = await self._analyze_with_gpt4_vision(image_path, question)
-                    fallback_result["vllm_error"] = error_msg
-                    return fallback_result
+                    return {"success": False, "error": error_msg}
             else:
                 logger.error(f"Request failed with status: {response.status_code}")
                 try:
@@ -222,31 +260,124 @@ class VLMTool:
                     error_msg = error_data.get('detail', f'HTTP {response.status_code}')
                 except:
                     error_msg = f'HTTP {response.status_code}'
+                return {"success": False, "error": error_msg}
+        
+        except httpx.TimeoutException:
+            logger.error(f"VLLM request timed out after {self.timeout}s")
+            # The true latency is at least the budget; recording it keeps slow
+            # periods in the percentile that sets the hedge delay
+            _backend_latency["vllm"].record(max(time.time() - start_time, self.timeout))
+            return {"success": False, "error": f"Request timeout ({self.timeout}s)"}
+        
+        except asyncio.CancelledError:
+            # A hedge loser was slower than the hedge delay; only that lower bound is known.
+            # Earlier cancellations (caller went away) say nothing about vLLM and are skipped
+            elapsed = time.time() - start_time
+            hedge_delay = self.get_hedge_delay()
+            if elapsed >= hedge_delay:
+                _backend_latency["vllm"].record(elapsed)
+            raise
+            
+        except Exception as e:
+            # Fast failures (connection refused during an outage) are not latency samples
+            logger.error(f"VLLM analysis failed: {str(e)}")
+            return {"success": False, "error": str(e)}
+    
+    def get_hedge_delay(self) -> float:
+        """
+        Seconds to wait for vLLM before launching the GPT-4 Vision hedge.
+
+        Tracks the observed vLLM latency percentile once enough samples exist,
+        capped by the configured budget.
+        """
+        budget = settings.vlm_hedge_delay_seconds
+        histogram = _backend_latency["vllm"]
+        
+        if histogram.count < settings.vlm_hedge_min_samples:
+            return budget
+        
+        observed = histogram.percentile(settings.vlm_hedge_percentile)
+        return min(observed, budget)
+    
+    def get_latency_stats(self) -> Dict[str, Any]:
+        return {
+            backend: histogram.summary()
+            for backend, histogram in _backend_latency.items()
+        }
+    
+    async def _analyze_hedged(self, image_path: str, question: str) -> Dict[str, Any]:
+        """Race vLLM against GPT-4 Vision once vLLM exceeds the hedge delay."""
+        hedge_delay = self.get_hedge_delay()
+        primary = asyncio.create_task(self._analyze_with_vllm(image_path, question))
+        pending = {primary}
+        vllm_error = None
+        
+        try:
+            done, pending = await asyncio.wait(pending, timeout=hedge_delay)
+            if primary in done:
+                vllm_result = primary.result()
+                if vllm_result.get("success"):
+                    return vllm_result
                 
                 logger.info("Attempting GPT-4 Vision fallback...")
-                
-                # Try GPT-4 Vision fallback
                 fallback_result = await self._analyze_with_gpt4_vision(image_path, question)
-                fallback_result["vllm_error"] = error_msg
+                fallback_result["vllm_error"] = vllm_result.get("error")
                 return fallback_result
-        
-        except requests.exceptions.Timeout:
-            logger.error(f"VLLM request timed out after {self.timeout}s")
-            logger.info("Attempting GPT-4 Vision fallback...")
             
-            # Try GPT-4 Vision fallback
-            fallback_result = await self._analyze_with_gpt4_vision(image_path, question)
-            fallback_result["vllm_error"] = f"Request timeout ({self.timeout}s)"
-            return fallback_result
+            logger.info(f"VLLM has not answered in {hedge_delay:.1f}s, hedging with GPT-4 Vision...")
+            backup = asyncio.create_task(self._analyze_with_gpt4_vision(image_path, question))
+            pending = {primary, backup}
             
-        except Exception as e:
-            logger.error(f"VLLM analysis failed: {str(e)}")
-            logger.info("Attempting GPT-4 Vision fallback...")
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    if task is primary and not result.get("success"):
+                        vllm_error = result.get("error")
+                        continue
+                    if result.get("success"):
+                        result["hedged"] = True
+                        result["hedge_delay"] = hedge_delay
+                        if vllm_error:
+                            result["vllm_error"] = vllm_error
+                        logger.info(f"Hedged analysis won by: {'gpt-4-vision' if task is backup else 'vllm'}")
+                        return result
             
-            # Try GPT-4 Vision fallback
-            fallback_result = await self._analyze_with_gpt4_vision(image_path, question)
-            fallback_result["vllm_error"] = str(e)
+            # Both backends failed
+            fallback_result = backup.result()
+            fallback_result["vllm_error"] = vllm_error
             return fallback_result
+        
+        finally:
+            # Cancel the losing request, or everything if our caller was cancelled
+            for task in pending:
+                task.cancel()
+    
+    async def analyze_image(self, image_path: str, question: str) -> Dict[str, Any]:
+        logger.info("======== VLM Image Analysis ========")
+        logger.info(f"Analyzing image: {image_path}")
+        logger.info(f"Question: {question}")
+        
+        if not os.path.exists(image_path):
+            logger.error(f"Image file not found: {image_path}")
+            return {
+                "success": False,
+                "error": f"Image file not found: {image_path}"
+            }
+        
+        if settings.vlm_hedge_enabled:
+            return await self._analyze_hedged(image_path, question)
+        
+        vllm_result = await self._analyze_with_vllm(image_path, question)
+        if vllm_result.get("success"):
+            return vllm_result
+        
+        logger.info("Attempting GPT-4 Vision fallback...")
+        
+        # Try GPT-4 Vision fallback
+        fallback_result = await self._analyze_with_gpt4_vision(image_path, question)
+        fallback_result["vllm_error"] = vllm_result.get("error")
+        return fallback_result
     
     async def test_connection(self) -> Dict[str, Any]:
         logger.info("======== Testing VLM Connection ========")
@@ -1,7 +1,7 @@
 import os
 from twilio.rest import Client
-from openai import OpenAI
 from app.core.config import settings
+from app.services.openai_client import chat_completion
 from app.services.agents.translation_agent import TranslationAgent
 from app.services.agents.dharti_main_agent import MainAgent
 from app.utils.logger import get_logger
@@ -12,11 +12,10 @@ logger = get_logger(__name__)
 class TwilioService:
     """Twilio service that integrates with existing TranslationAgent and MainAgent."""
     
-    def __init__(self):
+    def __init__(self, translation_agent: TranslationAgent, main_agent: MainAgent):
         self.client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
-        self.openai_client = OpenAI(api_key=settings.openai_api_key)
-        self.translation_agent = TranslationAgent()
-        self.main_agent = MainAgent()
+        self.translation_agent = translation_agent
+        self.main_agent = main_agent
     
     async def process_audio_with_model(self, audio_file_path: str) -> str:
         """Process audio with TranslationAgent and MainAgent."""
@@ -65,7 +64,7 @@ Original: "{text}"
 
 Summarized advice:"""
 
-            response = self.openai_client.chat.completions.create(
+            response = await chat_completion(
                 model="gpt-4o-mini",
                 messages=[
                     {"role": "system", "content": "Summarize agricultural advice precisely. Return ONLY the summarized advice, no labels or prefixes."},
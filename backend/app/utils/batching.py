@@ -0,0 +1,102 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+
+class MicroBatcher:
+    """
+    Coalesce concurrent single-item requests into batched calls.
+
+    Items submitted within `max_wait_seconds` of the first pending item are
+    sent together through `batch_fn` (an async callable taking a list of
+    items and returning results in the same order); a batch is flushed early
+    once it reaches `max_batch_size`. Identical items already waiting or in
+    flight share one slot, so they cost a single batch entry.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[Hashable]], Awaitable[List[Any]]],
+                 max_batch_size: int = 32, max_wait_seconds: float = 0.005):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+
+        self.submitted = 0
+        self.deduplicated = 0
+        self.batches = 0
+        self.batched_items = 0
+
+    async def submit(self, item: Hashable) -> Any:
+        self.submitted += 1
+        future = self._pending.get(item) or self._in_flight.get(item)
+        if future is not None:
+            self.deduplicated += 1
+        else:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[item] = future
+
+            if len(self._pending) >= self.max_batch_size:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = loop.call_later(self.max_wait_seconds, self._flush)
+
+        # Shield so one cancelled waiter does not cancel the shared result
+        return await asyncio.shield(future)
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+
+        batch = self._pending
+        self._pending = {}
+        self._in_flight.update(batch)
+
+        task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: Dict[Hashable, asyncio.Future]) -> None:
+        items = list(batch)
+        self.batches += 1
+        self.batched_items += len(items)
+        try:
+            results = await self.batch_fn(items)
+            if len(results) != len(items):
+                raise RuntimeError(f"Batch function returned {len(results)} results for {len(items)} items")
+        except BaseException as e:
+            # Waiters must always be released, including when the batch task is
+            # cancelled at shutdown (they are cancelled in turn)
+            for future in batch.values():
+                if future.done():
+                    continue
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+                    # Mark retrieved so unawaited futures don't log "exception never retrieved"
+                    future.exception()
+            if not isinstance(e, Exception):
+                raise
+        else:
+            for future, result in zip(batch.values(), results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            for item in items:
+                if self._in_flight.get(item) is batch[item]:
+                    del self._in_flight[item]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "submitted": self.submitted,
+            "deduplicated": self.deduplicated,
+            "batches": self.batches,
+            "avg_batch_size": round(self.batched_items / self.batches, 2) if self.batches else None
+        }
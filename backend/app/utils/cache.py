@@ -0,0 +1,172 @@
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_query_text(text: str) -> str:
+    """Canonical form of a user query for exact-match caching (case, punctuation, spacing)."""
+    text = unicodedata.normalize("NFKC", str(text)).casefold()
+    text = _PUNCTUATION_RE.sub(" ", text)
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries also expire after `ttl_seconds`.
+
+    Expired entries are dropped lazily on access; the least recently used
+    entry is evicted once `max_size` is reached.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 3600.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None
+        }
+
+
+class SemanticCache:
+    """
+    Similarity cache over recent query embeddings.
+
+    Embeddings are L2-normalised into one preallocated matrix, so a lookup is
+    a single matrix-vector product. A lookup hits when the best live entry in
+    the same `scope` has cosine similarity >= `threshold`. Entries expire
+    after `ttl_seconds`; when full, an expired slot is reused first, else the
+    least recently used one.
+    """
+
+    def __init__(self, max_size: int = 512, ttl_seconds: float = 3600.0, threshold: float = 0.95):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.threshold = threshold
+        self._vectors: Optional[np.ndarray] = None
+        self._expires = np.zeros(max_size, dtype=np.float64)
+        self._last_used = np.zeros(max_size, dtype=np.float64)
+        self._scopes = np.zeros(max_size, dtype=np.int64)
+        self._values: List[Any] = [None] * max_size
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else vector
+
+    def get(self, embedding: Sequence[float], scope: Hashable = None) -> Optional[Tuple[Any, float]]:
+        """Return (value, similarity) of the closest live entry, or None."""
+        vector = self._normalize(embedding)
+        now = time.monotonic()
+
+        with self._lock:
+            if self._size == 0 or self._vectors is None or self._vectors.shape[1] != vector.shape[0]:
+                self.misses += 1
+                return None
+
+            n = self._size
+            similarities = self._vectors[:n] @ vector
+            dead = (self._expires[:n] < now) | (self._scopes[:n] != hash(scope))
+            similarities[dead] = -np.inf
+
+            best = int(np.argmax(similarities))
+            similarity = float(similarities[best])
+            if similarity < self.threshold:
+                self.misses += 1
+                return None
+
+            self._last_used[best] = now
+            self.hits += 1
+            return self._values[best], similarity
+
+    def set(self, embedding: Sequence[float], value: Any, scope: Hashable = None) -> None:
+        vector = self._normalize(embedding)
+        now = time.monotonic()
+
+        with self._lock:
+            if self._vectors is None or self._vectors.shape[1] != vector.shape[0]:
+                # First insert (or embedding model changed): size the matrix to the dimension
+                self._vectors = np.zeros((self.max_size, vector.shape[0]), dtype=np.float32)
+                self._size = 0
+
+            if self._size < self.max_size:
+                slot = self._size
+                self._size += 1
+            else:
+                expired = np.flatnonzero(self._expires < now)
+                slot = int(expired[0]) if expired.size else int(np.argmin(self._last_used))
+
+            self._vectors[slot] = vector
+            self._expires[slot] = now + self.ttl_seconds
+            self._last_used[slot] = now
+            self._scopes[slot] = hash(scope)
+            self._values[slot] = value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values = [None] * self.max_size
+            self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": self._size,
+            "max_size": self.max_size,
+            "threshold": self.threshold,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None
+        }
@@ -0,0 +1,64 @@
+import bisect
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+
+def _default_bucket_bounds() -> List[float]:
+    # Log-spaced upper bounds from 50ms to ~2 minutes (25% steps)
+    bounds = []
+    bound = 0.05
+    while bound < 120.0:
+        bounds.append(round(bound, 4))
+        bound *= 1.25
+    bounds.append(float("inf"))
+    return bounds
+
+
+class LatencyHistogram:
+    """
+    Bucketed latency histogram over a sliding window of recent samples.
+
+    Only the last `window` samples are counted, so percentiles follow the
+    backend's current behaviour rather than its all-time history.
+    """
+
+    def __init__(self, window: int = 500, bounds: Optional[List[float]] = None):
+        self.bounds = bounds or _default_bucket_bounds()
+        self.counts = [0] * len(self.bounds)
+        self._recent = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        if len(self._recent) == self._recent.maxlen:
+            self.counts[self._recent[0]] -= 1
+        bucket = bisect.bisect_left(self.bounds, seconds)
+        self._recent.append(bucket)
+        self.counts[bucket] += 1
+
+    @property
+    def count(self) -> int:
+        return len(self._recent)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket containing the q-th quantile (0.0-1.0)."""
+        total = self.count
+        if total == 0:
+            return None
+
+        rank = q * total
+        seen = 0
+        for bound, bucket_count in zip(self.bounds, self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return bound
+        return self.bounds[-1]
+
+    def summary(self) -> Dict[str, Any]:
+        def finite(value: Optional[float]) -> Optional[float]:
+            return value if value is not None and value != float("inf") else None
+
+        return {
+            "samples": self.count,
+            "p50": finite(self.percentile(0.50)),
+            "p95": finite(self.percentile(0.95)),
+            "p99": finite(self.percentile(0.99))
+        }
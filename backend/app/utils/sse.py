@@ -0,0 +1,17 @@
+import json
+from typing import Any
+
+# Disable proxy buffering / caching so events reach the client as they are sent
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no"
+}
+
+SSE_MEDIA_TYPE = "text/event-stream"
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Encode one server-sent event with a JSON payload."""
+    payload = json.dumps(data, ensure_ascii=False, default=str)
+    return f"event: {event}\ndata: {payload}\n\n"
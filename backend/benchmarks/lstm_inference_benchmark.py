@@ -0,0 +1,82 @@
+"""
+Benchmark PriceLSTM inference engines on CPU.
+
+Usage (from the backend directory):
+    python -m benchmarks.lstm_inference_benchmark [--iterations 500] [--threads 1]
+
+Times full 7-day rollouts for the eager PyTorch model, the frozen
+TorchScript export of the same weights and the torch-free NumPy engine, and
+reports throughput, p50 / p99 latency and the max output deviation from eager.
+"""
+
+import argparse
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+import torch
+
+from app.services.tools.lstm_export import build_torchscript_model
+from app.services.tools.lstm_price_tool import (
+    LSTMPriceTool,
+    _rollout_scaled,
+    get_model_paths
+)
+from app.services.tools.lstm_torch_backend import TorchPriceEngine, load_eager_model
+from app.services.tools.numpy_lstm import NumpyPriceLSTM
+
+HORIZON = 7
+
+
+def time_rollouts(rollout: Callable[[], np.ndarray], iterations: int, warmup: int = 20) -> Dict[str, float]:
+    for _ in range(warmup):
+        rollout()
+
+    latencies: List[float] = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        rollout()
+        latencies.append(time.perf_counter() - t0)
+    total = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "throughput": iterations / total,
+        "p50_ms": float(np.percentile(latencies_ms, 50)),
+        "p99_ms": float(np.percentile(latencies_ms, 99))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark eager, TorchScript and NumPy PriceLSTM inference")
+    parser.add_argument("--crops", nargs="+", default=LSTMPriceTool().supported_crops)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--threads", type=int, default=1, help="torch intra-op threads (0 = torch default)")
+    args = parser.parse_args()
+
+    if args.threads > 0:
+        torch.set_num_threads(args.threads)
+    device = torch.device("cpu")
+
+    print(f"{'crop':<10} {'engine':<12} {'rollouts/s':>11} {'p50 ms':>8} {'p99 ms':>8} {'max diff':>10}")
+    for crop in args.crops:
+        paths = get_model_paths(crop)
+        scaled_prices = np.load(paths["data"])
+        eager_model = load_eager_model(paths["model"], device)
+        engines = (
+            ("eager", TorchPriceEngine(eager_model, device)),
+            ("torchscript", TorchPriceEngine(build_torchscript_model(eager_model), device)),
+            ("numpy", NumpyPriceLSTM.from_checkpoint(paths["model"]))
+        )
+
+        reference = _rollout_scaled(engines[0][1], scaled_prices, HORIZON)
+        for engine, model in engines:
+            max_diff = float(np.abs(_rollout_scaled(model, scaled_prices, HORIZON) - reference).max())
+            stats = time_rollouts(lambda: _rollout_scaled(model, scaled_prices, HORIZON), args.iterations)
+            print(f"{crop:<10} {engine:<12} {stats['throughput']:>11.1f} {stats['p50_ms']:>8.2f} "
+                  f"{stats['p99_ms']:>8.2f} {max_diff:>10.2e}")
+
+
+if __name__ == "__main__":
+    main()
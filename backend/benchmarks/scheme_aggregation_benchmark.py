@@ -0,0 +1,144 @@
+"""
+Microbenchmark for aggregate_matches() in the schemes RAG pipeline.
+
+Usage (from the backend directory):
+    python -m benchmarks.scheme_aggregation_benchmark [--iterations 2000] [--top-n 3]
+
+Aggregates synthetic vector matches for top_k in 30..500 with the current
+single-pass reducer and with the previous implementation (kept here for
+reference), checks they pick the same schemes and reports per-call latency.
+"""
+
+import argparse
+import random
+import time
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List
+
+from app.services.tools.govt_scheme_rag_tool import MAX_WHY_MATCH, aggregate_matches
+
+TOP_K_VALUES = (30, 100, 250, 500)
+SECTIONS = ("details", "benefits", "eligibility", "application_process", "documents_required")
+
+
+def legacy_aggregate_matches(matches, top_n_schemes: int) -> List[Dict[str, Any]]:
+    """recommend()'s aggregation before the reducer rewrite."""
+    hits = []
+    for match in matches:
+        class MockDoc:
+            def __init__(self, content, metadata):
+                self.page_content = content
+                self.metadata = metadata
+
+        content = match.metadata.get('text', '') or ''
+        doc = MockDoc(content, match.metadata)
+        score = float(match.score)
+        hits.append((doc, score))
+
+    by_scheme: Dict[str, Dict[str, Any]] = {}
+    for doc, score in hits:
+        sid = doc.metadata.get("scheme_id") or ""
+        if not sid:
+            continue
+        if sid not in by_scheme:
+            by_scheme[sid] = {
+                "id": sid,
+                "name": doc.metadata.get("scheme_name") or "",
+                "url": doc.metadata.get("url") or "",
+                "score": score,
+                "sections": set(),
+                "section_content": {},
+                "why_match": [],
+            }
+        entry = by_scheme[sid]
+        try:
+            entry["score"] = max(entry["score"], score)
+        except Exception:
+            entry["score"] = score
+        section = doc.metadata.get("section")
+        if section:
+            entry["sections"].add(section)
+            content = (doc.page_content or "").strip()
+            if content:
+                entry["section_content"][section] = content
+        content = (doc.page_content or "").strip().replace("\n", " ")
+        if content:
+            entry["why_match"].append(content[:240])
+
+    results = []
+    for v in by_scheme.values():
+        v["sections"] = sorted(list(v["sections"]))
+        results.append(v)
+
+    try:
+        results.sort(key=lambda x: x.get("score", 0.0), reverse=True)
+    except Exception:
+        pass
+
+    return results[:top_n_schemes]
+
+
+def synthetic_matches(top_k: int, rng: random.Random) -> List[SimpleNamespace]:
+    """Score-ordered chunk matches spread over ~top_k/4 schemes."""
+    scheme_count = max(3, top_k // 4)
+    matches = []
+    for rank in range(top_k):
+        scheme = rng.randrange(scheme_count)
+        section = rng.choice(SECTIONS)
+        text = f"  Scheme {scheme} {section}: " + " ".join(
+            rng.choice(("subsidy", "farmer", "drip", "irrigation", "loan", "\n", "insurance")) for _ in range(120)
+        )
+        matches.append(SimpleNamespace(
+            score=1.0 - rank / (top_k * 2),
+            metadata={
+                "scheme_id": f"scheme-{scheme}",
+                "scheme_name": f"Scheme {scheme}",
+                "url": f"https://example.gov.in/{scheme}",
+                "section": section,
+                "text": text
+            }
+        ))
+    return matches
+
+
+def time_calls(func: Callable[[], Any], iterations: int) -> float:
+    """Mean seconds per call."""
+    for _ in range(min(50, iterations)):
+        func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations
+
+
+def check_parity(matches, top_n: int) -> None:
+    current = aggregate_matches(matches, top_n)
+    legacy = legacy_aggregate_matches(matches, top_n)
+    assert [r["id"] for r in current] == [r["id"] for r in legacy]
+    for new, old in zip(current, legacy):
+        assert new["score"] == old["score"]
+        assert new["sections"] == old["sections"]
+        assert new["section_content"] == old["section_content"]
+        assert new["why_match"] == list(dict.fromkeys(old["why_match"]))[:MAX_WHY_MATCH]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scheme match aggregation")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--top-n", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'top_k':>6} {'legacy us':>10} {'reducer us':>11} {'speedup':>8}")
+    for top_k in TOP_K_VALUES:
+        matches = synthetic_matches(top_k, rng)
+        check_parity(matches, args.top_n)
+
+        legacy = time_calls(lambda: legacy_aggregate_matches(matches, args.top_n), args.iterations)
+        current = time_calls(lambda: aggregate_matches(matches, args.top_n), args.iterations)
+        print(f"{top_k:>6} {legacy * 1e6:>10.1f} {current * 1e6:>11.1f} {legacy / current:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,28 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 import uvicorn
 from app.api.router import api_router
 from app.core.config import settings
+from app.services.container import ServiceContainer
 from app.utils.logger import setup_logging
 
 setup_logging()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the agent/tool graph once per worker and share it across requests
+    app.state.services = ServiceContainer()
+    await app.state.services.start()
+    yield
+    await app.state.services.aclose()
+
+
 app = FastAPI(
     title=settings.app_name,
     description="Backend API for Krishi Saarthi agricultural services",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 @app.get("/")